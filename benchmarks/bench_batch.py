@@ -0,0 +1,73 @@
+"""
+Benchmark instantiating a config with many value dicts, in a loop and with Hypster.batch.
+
+Runs are recorded into an in-memory history and into a SQLite history with batch_size=1.
+With SQLite, a loop writes the records of each run separately, while a batch writes them
+all at once.
+
+Usage:
+    python benchmarks/bench_batch.py [--rows N] [--repeats N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.run_history import InMemoryHistory
+from hypster.sqlite_history import SQLiteHistory
+
+SOURCE = """
+def experiment(hp: HP):
+    model = hp.select(["cnn", "rnn", "mlp"], default="cnn")
+    lr = hp.number(0.001, min=0)
+    layers = hp.int(2, min=1)
+    optimizer = hp.select({"adam": "Adam", "sgd": "SGD"}, default="adam")
+    use_dropout = hp.bool(True)
+"""
+
+
+def make_history(kind: str, directory: str):
+    if kind == "memory":
+        return InMemoryHistory()
+    return SQLiteHistory(os.path.join(directory, f"history_{time.perf_counter_ns()}.db"), batch_size=1)
+
+
+def measure(kind: str, mode: str, values_list, repeats: int, directory: str) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        config = Hypster("experiment", SOURCE, {"HP": HP}, run_history=make_history(kind, directory))
+        start = time.perf_counter()
+        if mode == "loop":
+            for values in values_list:
+                config(values=values)
+        else:
+            config.batch(values_list)
+        if kind == "sqlite":
+            config.run_history.flush()
+        best = min(best, time.perf_counter() - start)
+    return best / len(values_list) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    values_list = [
+        {"model": ["cnn", "rnn", "mlp"][i % 3], "lr": 1e-4 * (i % 50 + 1), "layers": i % 8 + 1}
+        for i in range(args.rows)
+    ]
+    directory = tempfile.mkdtemp()
+    print(f"{args.rows} value dicts, best of {args.repeats}")
+    print(f"{'history':<10}{'mode':<8}{'us/item':>10}")
+    for kind in ("memory", "sqlite"):
+        for mode in ("loop", "batch"):
+            print(f"{kind:<10}{mode:<8}{measure(kind, mode, values_list, args.repeats, directory):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark the throughput of ``Hypster.__call__``.
+
+Compares the precompiled code object that ``Hypster`` builds at construction time
+against the previous behavior of re-compiling the function body on every call.
+
+Usage:
+    python benchmarks/bench_call.py [--calls N]
+"""
+
+import argparse
+import textwrap
+import time
+
+from hypster import HP, config
+from hypster.run_history import InMemoryHistory
+from hypster.utils import remove_function_signature
+
+
+@config
+def sweep_config(hp: HP):
+    model_type = hp.select(["cnn", "rnn", "transformer"], default="cnn")
+    learning_rate = hp.number(0.001, min=1e-5, max=1.0)
+    epochs = hp.int(10, min=1, max=100)
+    batch_size = hp.select([16, 32, 64, 128], default=32)
+    use_dropout = hp.bool(True)
+    if use_dropout:
+        dropout = hp.number(0.1, min=0.0, max=0.9)
+    optimizer = hp.select({"adam": "Adam", "sgd": "SGD"}, default="adam")
+    tags = hp.multi_text(["baseline"])
+
+
+def recompile_call(hypster_config, values):
+    """Emulate the previous behavior: re-dedent and re-compile the source on every call."""
+    original_code = hypster_config._code
+    try:
+        body = textwrap.dedent(remove_function_signature(hypster_config.modified_source))
+        hypster_config._code = compile(body, "<string>", "exec")
+        return hypster_config(values=values)
+    finally:
+        hypster_config._code = original_code
+
+
+def measure(func, calls: int) -> float:
+    # Start from an empty history so both modes pay the same recording cost
+    sweep_config.run_history = InMemoryHistory()
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    values = {"model_type": "rnn", "epochs": 20}
+
+    recompiled = measure(lambda: recompile_call(sweep_config, values), args.calls)
+    precompiled = measure(lambda: sweep_config(values=values), args.calls)
+
+    print(f"{'mode':<15}{'calls/s':>12}")
+    print(f"{'recompile':<15}{recompiled:>12.0f}")
+    print(f"{'precompiled':<15}{precompiled:>12.0f}")
+    print(f"speedup: {precompiled / recompiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
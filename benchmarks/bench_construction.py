@@ -0,0 +1,69 @@
+"""
+Benchmark creating Hypster instances for many config functions.
+
+Writes ``--configs`` config files with ``--params`` hp calls each, then loads all of them.
+"cold" clears the in-process analysis cache first, "cached" loads the same files again.
+
+Usage:
+    python benchmarks/bench_construction.py [--configs N] [--params N] [--repeats N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from hypster import load
+from hypster.ast_analyzer import _analysis_cache
+
+
+def build_source(index: int, num_params: int) -> str:
+    lines = ["from hypster import HP", "", "", f"def config_{index}(hp: HP):"]
+    for i in range(num_params):
+        if i % 3 == 0:
+            lines.append(f"    select_{i} = hp.select(['a', 'b', 'c'], default='a')")
+        elif i % 3 == 1:
+            lines.append(f"    settings_{i} = dict(size=hp.int(10, min=0), rate=hp.number(0.5))")
+        else:
+            lines.append(f"    text_{i} = hp.text('value')")
+    return "\n".join(lines) + "\n"
+
+
+def write_configs(directory: str, num_configs: int, num_params: int):
+    paths = []
+    for index in range(num_configs):
+        path = os.path.join(directory, f"config_{index}.py")
+        with open(path, "w") as f:
+            f.write(build_source(index, num_params))
+        paths.append(path)
+    return paths
+
+
+def measure(paths, repeats: int, clear_cache: bool) -> float:
+    total = 0.0
+    for _ in range(repeats):
+        if clear_cache:
+            _analysis_cache.clear()
+        start = time.perf_counter()
+        for path in paths:
+            load(path)
+        total += time.perf_counter() - start
+    return total / repeats * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", type=int, default=100)
+    parser.add_argument("--params", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = write_configs(tempfile.mkdtemp(), args.configs, args.params)
+    print(f"{args.configs} configs with {args.params} hp calls each")
+    print(f"{'mode':<10}{'ms total':>12}")
+    print(f"{'cold':<10}{measure(paths, args.repeats, clear_cache=True):>12.1f}")
+    print(f"{'cached':<10}{measure(paths, args.repeats, clear_cache=False):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
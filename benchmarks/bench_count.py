@@ -0,0 +1,57 @@
+"""
+Benchmark counting the combinations of a config with Hypster.count_combinations.
+
+The config has ``--params`` selects with ``--options`` options each, and half of them only
+exist in one branch of a top-level select, as in bench_grid.py. Counting multiplies the
+options of parameters that cannot change the structure of the space, so its time should
+stay flat while the number of combinations grows exponentially. Enumerating with
+iter_grid is timed for comparison up to ``--max-enumerate`` combinations.
+
+Usage:
+    python benchmarks/bench_count.py [--params N [N ...]] [--options N] [--max-enumerate N]
+"""
+
+import argparse
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+
+
+def build_source(num_params: int, num_options: int) -> str:
+    options = list(range(num_options))
+    lines = ["def grid(hp: HP):", "    branch = hp.select(['a', 'b'], default='a')"]
+    for i in range(num_params):
+        indent = "    "
+        if i % 2 == 1:
+            lines.append("    if branch == 'b':")
+            indent = "        "
+        lines.append(f"{indent}param_{i} = hp.select({options}, default=0)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    parser.add_argument("--options", type=int, default=3)
+    parser.add_argument("--max-enumerate", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{args.options} options per select")
+    print(f"{'params':<8}{'combinations':>32}{'count ms':>10}{'enumerate ms':>14}")
+    for num_params in args.params:
+        config = Hypster("grid", build_source(num_params, args.options), {"HP": HP})
+        start = time.perf_counter()
+        count = config.count_combinations()
+        count_ms = (time.perf_counter() - start) * 1e3
+
+        enumerate_ms = "-"
+        if count <= args.max_enumerate:
+            start = time.perf_counter()
+            assert sum(1 for _ in config.iter_grid()) == count
+            enumerate_ms = f"{(time.perf_counter() - start) * 1e3:.1f}"
+        print(f"{num_params:<8}{count:>32}{count_ms:>10.2f}{enumerate_ms:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark per-call latency of ``Hypster.__call__`` with and without run-history recording.
+
+Usage:
+    python benchmarks/bench_fast_path.py [--calls N]
+"""
+
+import argparse
+import time
+
+from hypster import HP, config
+from hypster.run_history import InMemoryHistory
+
+
+@config
+def serving_config(hp: HP):
+    model_type = hp.select(["cnn", "rnn", "transformer"], default="cnn")
+    learning_rate = hp.number(0.001, min=1e-5, max=1.0)
+    epochs = hp.int(10, min=1, max=100)
+    batch_size = hp.select([16, 32, 64, 128], default=32)
+    use_dropout = hp.bool(True)
+    if use_dropout:
+        dropout = hp.number(0.1, min=0.0, max=0.9)
+    optimizer = hp.select({"adam": "Adam", "sgd": "SGD"}, default="adam")
+    tags = hp.multi_text(["baseline"])
+
+
+def measure(calls: int, record_history: bool) -> float:
+    serving_config.run_history = InMemoryHistory()
+    values = {"model_type": "rnn", "epochs": 20}
+    start = time.perf_counter()
+    for _ in range(calls):
+        serving_config(values=values, record_history=record_history)
+    elapsed = time.perf_counter() - start
+    return elapsed / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    with_history = measure(args.calls, record_history=True)
+    without_history = measure(args.calls, record_history=False)
+
+    print(f"{'record_history':<17}{'us/call':>10}")
+    print(f"{'True':<17}{with_history:>10.1f}")
+    print(f"{'False':<17}{without_history:>10.1f}")
+    print(f"speedup: {with_history / without_history:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark fingerprinting a config with its values, next to instantiating it.
+
+The config has ``--params`` hp calls and nests a config with as many. Fingerprinting
+should cost a small fraction of a call, so it can be computed for every run.
+
+Usage:
+    python benchmarks/bench_fingerprint.py [--params N] [--repeats N]
+"""
+
+import argparse
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+
+
+def build_source(name: str, num_params: int, nested: bool) -> str:
+    lines = [f"def {name}(hp: HP):"]
+    for i in range(num_params):
+        if i % 2 == 0:
+            lines.append(f"    select_{i} = hp.select(['a', 'b', 'c'], default='a')")
+        else:
+            lines.append(f"    number_{i} = hp.number({i}.5)")
+    if nested:
+        lines.append("    nested = hp.nest(inner)")
+    return "\n".join(lines)
+
+
+def measure(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    inner = Hypster("inner", build_source("inner", args.params, nested=False), {"HP": HP})
+    outer = Hypster("outer", build_source("outer", args.params, nested=True), {"HP": HP, "inner": inner})
+    values = {"select_0": "b", "number_1": 0.25, "nested": {"select_2": "c"}}
+    outer(values=values)
+    snapshot = outer.get_last_snapshot()
+
+    print(f"{args.params} hp calls in the config and in its nested config")
+    print(f"{'operation':<24}{'us':>10}")
+    print(f"{'call':<24}{measure(lambda: outer(values=values), args.repeats):>10.1f}")
+    print(f"{'fingerprint(values)':<24}{measure(lambda: outer.fingerprint(values), args.repeats):>10.1f}")
+    print(f"{'snapshot.fingerprint':<24}{measure(lambda: snapshot.fingerprint, args.repeats):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark enumerating the grid of a config with Hypster.iter_grid.
+
+The config has ``--params`` selects with ``--options`` options each, and half of them only
+exist in one branch of a top-level select. Reports the number of combinations, the time per
+combination and the peak memory allocated while enumerating, which should not grow with the
+size of the grid.
+
+Usage:
+    python benchmarks/bench_grid.py [--params N [N ...]] [--options N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from hypster import HP
+from hypster.core import Hypster
+
+
+def build_source(num_params: int, num_options: int) -> str:
+    options = list(range(num_options))
+    lines = ["def grid(hp: HP):", "    branch = hp.select(['a', 'b'], default='a')"]
+    for i in range(num_params):
+        indent = "    "
+        if i % 2 == 1:
+            lines.append("    if branch == 'b':")
+            indent = "        "
+        lines.append(f"{indent}param_{i} = hp.select({options}, default=0)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", type=int, nargs="+", default=[4, 6, 8])
+    parser.add_argument("--options", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.options} options per select")
+    print(f"{'params':<8}{'combinations':>14}{'us/combination':>16}{'peak KiB':>10}")
+    for num_params in args.params:
+        config = Hypster("grid", build_source(num_params, args.options), {"HP": HP})
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = sum(1 for _ in config.iter_grid())
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{num_params:<8}{count:>14}{elapsed / count * 1e6:>16.1f}{peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark how InMemoryHistory scales with the number of recorded runs.
+
+For every history size, the history is first filled with runs of ``--params`` records
+each, then the cost of adding one more run and of looking up parameters is measured.
+The fill uses light stand-in records (the history only reads ``name`` and ``run_id``
+when adding) so that a million runs fit in memory; measured operations use real
+``ParameterRecord`` objects.
+
+The previous list-based implementation is included for sizes up to ``--legacy-max``.
+
+Usage:
+    python benchmarks/bench_history.py [--max-runs N] [--params N] [--legacy-max N]
+"""
+
+import argparse
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from types import SimpleNamespace
+
+from hypster.run_history import InMemoryHistory, ParameterRecord, ParameterSource
+
+
+class ListHistory(InMemoryHistory):
+    """The previous implementation: a list of run ids and scans over all runs."""
+
+    def __init__(self):
+        self._records = defaultdict(OrderedDict)
+        self._run_ids = []
+
+    def add_record(self, record):
+        if record.run_id not in self._run_ids:
+            self._run_ids.append(record.run_id)
+        self._records[record.run_id][record.name] = record
+
+    def get_latest_run_records(self, flattened=False):
+        return self._records.get(self._run_ids[-1], {})
+
+    def get_param_records(self, param_name, run_ids=None):
+        if run_ids is None:
+            run_ids = self._run_ids
+        return {run_id: self._records[run_id][param_name] for run_id in run_ids if param_name in self._records[run_id]}
+
+    def get_latest_param_record(self, param_name):
+        for run_id in reversed(self._run_ids):
+            if param_name in self._records[run_id]:
+                return self._records[run_id][param_name]
+        return None
+
+
+def make_record(name: str, run_id: uuid.UUID) -> ParameterRecord:
+    return ParameterRecord(
+        name=name,
+        parameter_type="int",
+        single_value=True,
+        default=0,
+        value=1,
+        is_reproducible=True,
+        run_id=run_id,
+        source=ParameterSource.USER,
+    )
+
+
+def fill(history, num_runs: int, param_names):
+    for _ in range(num_runs):
+        run_id = uuid.uuid4()
+        for name in param_names:
+            history.add_record(SimpleNamespace(name=name, run_id=run_id))
+
+
+def timed(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def bench(history_cls, num_runs: int, param_names):
+    history = history_cls()
+    fill(history, num_runs, param_names)
+
+    def add_run():
+        run_id = uuid.uuid4()
+        for record in [make_record(name, run_id) for name in param_names]:
+            history.add_record(record)
+
+    add_us = timed(add_run, 20)
+    latest_us = timed(lambda: history.get_latest_param_record(param_names[0]), 20)
+    param_us = timed(lambda: history.get_param_records(param_names[0]), 3)
+    return add_us, latest_us, param_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-runs", type=int, default=1_000_000)
+    parser.add_argument("--params", type=int, default=5)
+    parser.add_argument("--legacy-max", type=int, default=10_000)
+    args = parser.parse_args()
+
+    param_names = [f"param_{i}" for i in range(args.params)]
+    sizes = []
+    size = 10
+    while size <= args.max_runs:
+        sizes.append(size)
+        size *= 10
+
+    header = f"{'impl':<8}{'runs':>10}{'add run (us)':>16}{'latest param (us)':>20}{'param records (us)':>21}"
+    print(header)
+    for size in sizes:
+        for name, history_cls in (("indexed", InMemoryHistory), ("list", ListHistory)):
+            if history_cls is ListHistory and size > args.legacy_max:
+                continue
+            add_us, latest_us, param_us = bench(history_cls, size, param_names)
+            print(f"{name:<8}{size:>10}{add_us:>16.1f}{latest_us:>20.2f}{param_us:>21.1f}")
+
+
+if __name__ == "__main__":
+    main()
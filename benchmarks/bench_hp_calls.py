@@ -0,0 +1,131 @@
+"""
+Benchmark instantiation of a config with many hp calls.
+
+Compares the pydantic models in ``hypster.hp_calls`` (one validated model per call plus a
+validated ``ParameterRecord``) against the slotted validators that ``HP`` uses.
+
+Usage:
+    python benchmarks/bench_hp_calls.py [--params N] [--repeats N]
+"""
+
+import argparse
+import time
+import uuid
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.hp_calls import IntInputCall, NumberInputCall, NumericBounds, SelectCall
+from hypster.run_history import InMemoryHistory, ParameterRecord, ParameterSource
+from hypster.validators import IntValidator, NumberValidator, SelectValidator
+
+
+def build_source(num_params: int) -> str:
+    lines = ["def many_params(hp: HP):"]
+    for i in range(num_params):
+        if i % 3 == 0:
+            lines.append(f"    select_{i} = hp.select(['a', 'b', 'c'], default='a')")
+        elif i % 3 == 1:
+            lines.append(f"    int_{i} = hp.int(10, min=0, max=100)")
+        else:
+            lines.append(f"    number_{i} = hp.number(0.5, min=0.0, max=1.0)")
+    return "\n".join(lines)
+
+
+def pydantic_instantiation(num_params: int) -> None:
+    """Emulate the previous HP implementation: pydantic models for calls, bounds and records."""
+    run_id = uuid.uuid4()
+    for i in range(num_params):
+        if i % 3 == 0:
+            call = SelectCall(name=f"select_{i}", options=["a", "b", "c"], default="a")
+            result = call.execute({}, [], False)
+            options = list(call.processed_options.keys())
+            bounds = None
+            value = call.stored_value.value
+        else:
+            bounds = NumericBounds(min_val=0, max_val=100) if i % 3 == 1 else NumericBounds(min_val=0.0, max_val=1.0)
+            call_cls = IntInputCall if i % 3 == 1 else NumberInputCall
+            call = call_cls(name=f"param_{i}", default=10 if i % 3 == 1 else 0.5, bounds=bounds)
+            result = call.execute({}, [], False)
+            options = None
+            value = result
+        ParameterRecord(
+            name=call.name,
+            parameter_type="select",
+            single_value=True,
+            default=call.default,
+            value=value,
+            is_reproducible=True,
+            options=options,
+            numeric_bounds=bounds,
+            run_id=run_id,
+            source=ParameterSource.USER,
+        )
+
+
+def validators_instantiation(num_params: int) -> None:
+    """The same calls through the slotted validators that HP uses."""
+    run_id = uuid.uuid4()
+    for i in range(num_params):
+        if i % 3 == 0:
+            call = SelectValidator(f"select_{i}", ["a", "b", "c"], "a", False)
+            result = call.execute({}, [], False)
+            options = list(call.processed_options.keys())
+            bounds = None
+            value = call.stored_value
+        else:
+            if i % 3 == 1:
+                call = IntValidator(f"param_{i}", 10, min_val=0, max_val=100)
+            else:
+                call = NumberValidator(f"param_{i}", 0.5, min_val=0.0, max_val=1.0)
+            result = call.execute({}, [], False)
+            options = None
+            bounds = call.bounds
+            value = result
+        ParameterRecord(
+            name=call.name,
+            parameter_type="select",
+            single_value=True,
+            default=call.default,
+            value=value,
+            is_reproducible=True,
+            options=options,
+            numeric_bounds=bounds,
+            run_id=run_id,
+            source=ParameterSource.USER,
+        )
+
+
+def measure(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    config = Hypster("many_params", build_source(args.params), {"HP": HP})
+
+    def full_instantiation():
+        config.run_history = InMemoryHistory()
+        config()
+
+    pydantic_ms = measure(lambda: pydantic_instantiation(args.params), args.repeats)
+    validators_ms = measure(lambda: validators_instantiation(args.params), args.repeats)
+    full_ms = measure(full_instantiation, args.repeats)
+    fast_path_ms = measure(lambda: config(record_history=False), args.repeats)
+
+    print(f"{args.params} hp calls per instantiation")
+    print(f"{'engine':<34}{'ms/instantiation':>18}")
+    print(f"{'pydantic models (calls only)':<34}{pydantic_ms:>18.2f}")
+    print(f"{'validators (calls only)':<34}{validators_ms:>18.2f}")
+    print(f"{'Hypster.__call__':<34}{full_ms:>18.2f}")
+    print(f"{'Hypster.__call__, no history':<34}{fast_path_ms:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
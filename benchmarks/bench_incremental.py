@@ -0,0 +1,65 @@
+"""
+Benchmark updating the interactive UI after a parameter at the bottom of a config changes.
+
+The config loads a model that takes ``--cost`` milliseconds at the top, then defines ``--params``
+parameters. "full" runs the whole config again, as the UI did, "incremental" runs only the
+statements affected by the changed parameter.
+
+Usage:
+    python benchmarks/bench_incremental.py [--params N] [--cost MS] [--repeats N]
+"""
+
+import argparse
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.incremental import IncrementalRun
+
+
+class Model:
+    cost_ms = 200.0
+
+    def __init__(self, name: str):
+        self.name = name
+        time.sleep(self.cost_ms / 1e3)
+
+
+def build_source(num_params: int) -> str:
+    lines = ["def ui_config(hp: HP):", "    model = Model(hp.select(['small', 'large'], default='small'))"]
+    for i in range(num_params):
+        lines.append(f"    param_{i} = hp.number({i}.5, min=0)")
+    lines.append(f"    settings = dict(model=model, last=param_{num_params - 1})")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", type=int, default=20)
+    parser.add_argument("--cost", type=float, default=200.0)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    Model.cost_ms = args.cost
+    config = Hypster("ui_config", build_source(args.params), {"HP": HP, "Model": Model})
+    changed = f"param_{args.params - 1}"
+    run = IncrementalRun(config)
+    run.run({})
+
+    def update_full(i):
+        config(values={changed: float(i)}, explore_mode=True)
+
+    def update_incremental(i):
+        run.run({changed: float(i)}, changed=changed)
+
+    print(f"{args.params} parameters, {args.cost:.0f} ms model load")
+    print(f"{'mode':<14}{'ms/update':>12}")
+    for mode, update in (("full", update_full), ("incremental", update_incremental)):
+        start = time.perf_counter()
+        for i in range(args.repeats):
+            update(i)
+        print(f"{mode:<14}{(time.perf_counter() - start) / args.repeats * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark a select over expensive option values, with and without lazy options.
+
+Each option builds an object that takes ``--cost`` milliseconds to construct, standing in
+for loading a model or creating a client. Eager options build every object on each call,
+lazy options build the selected one only.
+
+Usage:
+    python benchmarks/bench_lazy_options.py [--options N] [--cost MS] [--repeats N]
+"""
+
+import argparse
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+
+
+class ExpensiveModel:
+    cost_ms = 10.0
+
+    def __init__(self, name: str):
+        self.name = name
+        time.sleep(self.cost_ms / 1e3)
+
+
+def build_source(num_options: int) -> str:
+    options = ", ".join(f"'model_{i}': ExpensiveModel('model_{i}')" for i in range(num_options))
+    return f"def models(hp: HP):\n    model = hp.select({{{options}}}, default='model_0')\n"
+
+
+def measure(config: Hypster, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        config(values={"model": "model_1"})
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--options", type=int, default=5)
+    parser.add_argument("--cost", type=float, default=10.0)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    ExpensiveModel.cost_ms = args.cost
+    source = build_source(args.options)
+    namespace = {"HP": HP, "ExpensiveModel": ExpensiveModel}
+
+    print(f"{args.options} options, {args.cost:.0f} ms per option")
+    print(f"{'mode':<10}{'ms/call':>10}")
+    for mode, lazy_options in (("eager", False), ("lazy", True)):
+        config = Hypster("models", source, namespace, lazy_options=lazy_options)
+        print(f"{mode:<10}{measure(config, args.repeats):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
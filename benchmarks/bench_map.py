@@ -0,0 +1,74 @@
+"""
+Benchmark instantiating a CPU-bound config many times, in a loop and with Hypster.map.
+
+Each run builds an object that takes about ``--cost`` milliseconds of CPU time, standing in
+for building a model or tokenizer. Hypster.map spreads the runs over ``--workers`` processes.
+
+Usage:
+    python benchmarks/bench_map.py [--runs N] [--cost MS] [--workers N] [--chunksize N]
+"""
+
+import argparse
+import os
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+
+SOURCE = """
+def heavy(hp: HP):
+    size = hp.int(1000, min=1)
+    seed = hp.int(0)
+    model = build_model(size, seed)
+"""
+
+
+def build_model(size: int, seed: int) -> int:
+    # Busy loop, calibrated to the requested cost in main()
+    total = seed
+    for i in range(size * build_model.iterations_per_unit):
+        total = (total * 31 + i) % 1_000_003
+    return total
+
+
+build_model.iterations_per_unit = 1
+
+
+def calibrate(cost_ms: float) -> int:
+    start = time.perf_counter()
+    build_model.iterations_per_unit = 100
+    build_model(1000, 0)
+    per_iteration = (time.perf_counter() - start) / 100_000
+    return max(1, int(cost_ms / 1e3 / per_iteration / 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--cost", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunksize", type=int, default=1)
+    args = parser.parse_args()
+
+    build_model.iterations_per_unit = calibrate(args.cost)
+    config = Hypster("heavy", SOURCE, {"HP": HP, "build_model": build_model})
+    values_list = [{"seed": i} for i in range(args.runs)]
+
+    start = time.perf_counter()
+    for values in values_list:
+        config(values=values)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in config.map(values_list, workers=args.workers, chunksize=args.chunksize):
+        pass
+    map_s = time.perf_counter() - start
+
+    print(f"{args.runs} runs, {args.cost:g} ms per run, {args.workers} workers, chunksize {args.chunksize}")
+    print(f"{'mode':<8}{'s total':>10}")
+    print(f"{'loop':<8}{loop_s:>10.2f}")
+    print(f"{'map':<8}{map_s:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark a config that nests three config files by path.
+
+Each call of the parent config nests the same three files. Without a registry of loaded
+configs, every nest reads the file, executes the module and analyzes it again.
+
+Usage:
+    python benchmarks/bench_nest_path.py [--params N] [--calls N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bench_construction import build_source
+
+from hypster import HP
+from hypster.core import Hypster
+
+PARENT_SOURCE = """
+def parent_config(hp: HP):
+    first = hp.nest({paths[0]!r})
+    second = hp.nest({paths[1]!r})
+    third = hp.nest({paths[2]!r})
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", type=int, default=30)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    paths = []
+    for index in range(3):
+        path = os.path.join(directory, f"config_{index}.py")
+        with open(path, "w") as f:
+            f.write(build_source(index, args.params))
+        paths.append(path)
+    parent = Hypster("parent_config", PARENT_SOURCE.format(paths=paths), {"HP": HP})
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        parent()
+    ms = (time.perf_counter() - start) / args.calls * 1e3
+    print(f"3 nested files with {args.params} hp calls each, {args.calls} calls")
+    print(f"{'ms/call':>10}")
+    print(f"{ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
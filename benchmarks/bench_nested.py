@@ -0,0 +1,71 @@
+"""
+Benchmark repeated calls to a config with three levels of nesting.
+
+The outer config nests a middle config which nests an inner config, each with a few
+parameters. The time per call is reported for consecutive blocks of calls, so a cost that
+grows with the number of previous runs shows up as increasing numbers.
+
+Usage:
+    python benchmarks/bench_nested.py [--calls N] [--block N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+
+INNER_SOURCE = """
+def inner_config(hp: HP):
+    activation = hp.select(["relu", "tanh"], default="relu")
+    dropout = hp.number(0.1, min=0, max=1)
+"""
+
+MIDDLE_SOURCE = """
+def middle_config(hp: HP):
+    layers = hp.int(2, min=1)
+    inner = hp.nest({inner_path!r})
+"""
+
+OUTER_SOURCE = """
+def outer_config(hp: HP):
+    model = hp.select(["cnn", "rnn"], default="cnn")
+    middle = hp.nest({middle_path!r})
+"""
+
+
+def build_config(directory: str) -> Hypster:
+    inner_path = os.path.join(directory, "inner_config.py")
+    middle_path = os.path.join(directory, "middle_config.py")
+    with open(inner_path, "w") as f:
+        f.write(INNER_SOURCE)
+    with open(middle_path, "w") as f:
+        f.write(MIDDLE_SOURCE.format(inner_path=inner_path))
+    return Hypster("outer_config", OUTER_SOURCE.format(middle_path=middle_path), {"HP": HP})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=10_000)
+    parser.add_argument("--block", type=int, default=1000)
+    args = parser.parse_args()
+
+    outer_config = build_config(tempfile.mkdtemp())
+    values = [{"middle.layers": 3}, {"middle.inner.activation": "tanh"}]
+
+    print(f"{'calls':>12}{'ms/call':>12}")
+    total_start = time.perf_counter()
+    for block_start in range(0, args.calls, args.block):
+        start = time.perf_counter()
+        for i in range(block_start, min(block_start + args.block, args.calls)):
+            outer_config(values=values[i % 2])
+        elapsed = time.perf_counter() - start
+        calls = min(args.block, args.calls - block_start)
+        print(f"{block_start + calls:>12}{elapsed / calls * 1e3:>12.3f}")
+    print(f"total: {time.perf_counter() - total_start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark calling a config that builds an expensive artifact, with and without a result cache.
+
+The artifact takes ``--cost`` milliseconds to build. "memory" hits the in-memory LRU of the
+cache, "disk" uses a new cache on the same directory for each call, as another process would.
+
+Usage:
+    python benchmarks/bench_result_cache.py [--cost MS] [--size N] [--repeats N]
+"""
+
+import argparse
+import tempfile
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.result_cache import ResultCache
+
+SOURCE = """
+def artifacts(hp: HP):
+    vocab_size = hp.int(1000)
+    index = build_index(vocab_size)
+"""
+
+
+class Index:
+    cost_ms = 100.0
+
+    def __init__(self, size: int):
+        self.tokens = [f"token_{i}" for i in range(size)]
+        time.sleep(self.cost_ms / 1e3)
+
+
+def measure(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cost", type=float, default=100.0)
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    Index.cost_ms = args.cost
+    namespace = {"HP": HP, "build_index": Index}
+    values = {"vocab_size": args.size}
+    directory = tempfile.mkdtemp()
+
+    uncached = Hypster("artifacts", SOURCE, namespace)
+    cached = Hypster("artifacts", SOURCE, namespace, result_cache=ResultCache(directory))
+    cached(values=values)
+
+    def call_with_new_cache():
+        cached.result_cache = ResultCache(directory)
+        cached(values=values)
+
+    print(f"{args.cost:.0f} ms per build, {args.size} tokens")
+    print(f"{'mode':<10}{'ms/call':>12}")
+    print(f"{'uncached':<10}{measure(lambda: uncached(values=values), args.repeats):>12.3f}")
+    print(f"{'memory':<10}{measure(lambda: cached(values=values), args.repeats):>12.3f}")
+    print(f"{'disk':<10}{measure(call_with_new_cache, args.repeats):>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
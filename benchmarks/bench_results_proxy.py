@@ -0,0 +1,50 @@
+"""
+Benchmark reading the results of the interactive UI in a tight loop.
+
+Reads ``--reads`` values from the results proxy, and counts the reads right after an update
+that still returned the results of the previous run.
+
+Usage:
+    python benchmarks/bench_results_proxy.py [--reads N]
+"""
+
+import argparse
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.ui.handler import UIHandler
+from hypster.ui.ipywidgets import ResultsProxy
+
+SOURCE = """
+def proxy_config(hp: HP):
+    size = hp.int(8)
+    model = f"model-{size}"
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reads", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    handler = UIHandler(Hypster("proxy_config", SOURCE, {"HP": HP}))
+    results = ResultsProxy(handler.get_latest_results(), handler)
+
+    start = time.perf_counter()
+    for _ in range(args.reads):
+        results["model"]
+    ns_per_read = (time.perf_counter() - start) / args.reads * 1e9
+
+    stale_reads = 0
+    for size in range(1, 101):
+        handler.update_components("size", size)
+        if results["size"] != size:
+            stale_reads += 1
+
+    print(f"{'ns/read':>10}{'stale reads after 100 updates':>32}")
+    print(f"{ns_per_read:>10.0f}{stale_reads:>32}")
+
+
+if __name__ == "__main__":
+    main()
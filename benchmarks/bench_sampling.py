@@ -0,0 +1,52 @@
+"""
+Benchmark generating value dicts with Hypster.sample.
+
+The config has ``--params`` bounded number and int calls, alternating. Reports the time to
+generate ``--samples`` value dicts with each sampling method, and the time to instantiate
+the config with the first thousand of them.
+
+Usage:
+    python benchmarks/bench_sampling.py [--samples N] [--params N]
+"""
+
+import argparse
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+
+
+def build_source(num_params: int) -> str:
+    lines = ["def sampled(hp: HP):"]
+    for i in range(num_params):
+        if i % 2 == 0:
+            lines.append(f"    number_{i} = hp.number(0.5, min=0.001, max=1.0)")
+        else:
+            lines.append(f"    int_{i} = hp.int(10, min=1, max=100)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--params", type=int, default=6)
+    args = parser.parse_args()
+
+    config = Hypster("sampled", build_source(args.params), {"HP": HP})
+    log = [f"number_{i}" for i in range(0, args.params, 2)]
+
+    print(f"{args.samples} samples of {args.params} parameters")
+    print(f"{'method':<10}{'s total':>10}{'us/dict':>10}")
+    for method in ("uniform", "sobol", "lhs"):
+        start = time.perf_counter()
+        samples = config.sample(args.samples, method=method, seed=0, log=log)
+        elapsed = time.perf_counter() - start
+        print(f"{method:<10}{elapsed:>10.2f}{elapsed / args.samples * 1e6:>10.2f}")
+
+    start = time.perf_counter()
+    config.batch(samples[:1000], record_history=False)
+    print(f"batch of 1000 runs: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
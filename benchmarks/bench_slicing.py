@@ -0,0 +1,59 @@
+"""
+Benchmark requesting one variable from a config that builds several expensive objects.
+
+Each expensive object takes ``--cost`` milliseconds to build. With dependency slicing, a call
+with ``final_vars`` only runs the statements the requested variables depend on.
+
+Usage:
+    python benchmarks/bench_slicing.py [--objects N] [--cost MS] [--repeats N]
+"""
+
+import argparse
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+
+
+class ExpensiveObject:
+    cost_ms = 10.0
+
+    def __init__(self, name: str):
+        self.name = name
+        time.sleep(self.cost_ms / 1e3)
+
+
+def build_source(num_objects: int) -> str:
+    lines = ["def objects(hp: HP):", "    lr = hp.number(0.001)"]
+    for i in range(num_objects):
+        lines.append(f"    name_{i} = hp.select(['a', 'b'], default='a')")
+        lines.append(f"    object_{i} = ExpensiveObject(name_{i})")
+    return "\n".join(lines)
+
+
+def measure(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=5)
+    parser.add_argument("--cost", type=float, default=10.0)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    ExpensiveObject.cost_ms = args.cost
+    config = Hypster("objects", build_source(args.objects), {"HP": HP, "ExpensiveObject": ExpensiveObject})
+
+    print(f"{args.objects} objects, {args.cost:.0f} ms per object")
+    print(f"{'final_vars':<26}{'ms/call':>10}")
+    for final_vars in ([], ["lr"], ["object_0"]):
+        ms = measure(lambda: config(final_vars=final_vars), args.repeats)
+        print(f"{str(final_vars):<26}{ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
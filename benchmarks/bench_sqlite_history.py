@@ -0,0 +1,100 @@
+"""
+Benchmark SQLiteHistory with a large number of stored rows.
+
+Every run holds ``--params`` top-level records and a nested config with ``--params`` records
+of its own. The history is filled through ``add_record`` (batched writes), then the queries
+used by snapshots, explore mode and the UI are timed.
+
+Usage:
+    python benchmarks/bench_sqlite_history.py [--runs N] [--params N] [--batch-size N] [--path PATH]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+from hypster.run_history import InMemoryHistory, NestedHistoryRecord, ParameterRecord, ParameterSource
+from hypster.sqlite_history import SQLiteHistory
+
+
+def make_record(name: str, value: int, run_id: uuid.UUID) -> ParameterRecord:
+    return ParameterRecord(
+        name=name,
+        parameter_type="int",
+        single_value=True,
+        default=0,
+        value=value,
+        is_reproducible=True,
+        run_id=run_id,
+        source=ParameterSource.USER,
+    )
+
+
+def fill(history: SQLiteHistory, num_runs: int, param_names) -> list:
+    run_ids = []
+    for i in range(num_runs):
+        run_id = uuid.uuid4()
+        run_ids.append(run_id)
+        nested_history = InMemoryHistory()
+        for name in param_names:
+            history.add_record(make_record(name, i, run_id))
+            nested_history.add_record(make_record(name, i, run_id))
+        history.add_record(
+            NestedHistoryRecord(
+                name="nested",
+                parameter_type="nest",
+                run_id=run_id,
+                source=ParameterSource.USER,
+                run_history=nested_history,
+            )
+        )
+    history.flush()
+    return run_ids
+
+
+def timed(func, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200_000)
+    parser.add_argument("--params", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--path", default=None, help="database file (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "history.db")
+    param_names = [f"param_{i}" for i in range(args.params)]
+    history = SQLiteHistory(path, batch_size=args.batch_size)
+
+    start = time.perf_counter()
+    run_ids = fill(history, args.runs, param_names)
+    fill_s = time.perf_counter() - start
+    num_rows = args.runs * (2 * args.params + 1)
+    print(f"{num_rows} rows in {fill_s:.1f}s ({num_rows / fill_s:,.0f} rows/s) at {path}")
+
+    nested_history = history.get_latest_param_record("nested").run_history
+    sample_run_ids = run_ids[:: max(1, len(run_ids) // 10)]
+    measurements = [
+        ("get_latest_run_records(flattened=True)", lambda: history.get_latest_run_records(flattened=True), 200),
+        ("get_latest_param_record", lambda: history.get_latest_param_record(param_names[0]), 200),
+        ("nested get_latest_param_record", lambda: nested_history.get_latest_param_record(param_names[0]), 200),
+        ("get_param_records(run_ids=10 runs)", lambda: history.get_param_records(param_names[0], sample_run_ids), 200),
+        ("get_run_records(run_id)", lambda: history.get_run_records(run_ids[len(run_ids) // 2]), 200),
+        ("get_param_records (all runs)", lambda: history.get_param_records(param_names[0]), 1),
+    ]
+
+    print(f"{'query':<42}{'us/query':>14}")
+    for name, func, repeats in measurements:
+        print(f"{name:<42}{timed(func, repeats):>14.1f}")
+    history.close()
+
+
+if __name__ == "__main__":
+    main()
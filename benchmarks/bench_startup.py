@@ -0,0 +1,61 @@
+"""
+Benchmark loading many config files in a fresh worker process.
+
+Writes ``--configs`` config files with ``--params`` hp calls each, then loads all of them in
+a new Python process, the way a worker would on startup. "disabled" turns the on-disk
+analysis cache off, "cold" starts from an empty cache directory and fills it, "warm" reuses
+the cache written by the cold run.
+
+Usage:
+    python benchmarks/bench_startup.py [--configs N] [--params N] [--repeats N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_construction import write_configs
+
+WORKER = """
+import sys, time
+start = time.perf_counter()
+from hypster import load
+for path in sys.argv[1:]:
+    load(path)
+print((time.perf_counter() - start) * 1e3)
+"""
+
+
+def run_worker(paths, cache_dir: str) -> float:
+    env = dict(os.environ, HYPSTER_CACHE_DIR=cache_dir)
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER, *paths], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", type=int, default=500)
+    parser.add_argument("--params", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = write_configs(tempfile.mkdtemp(), args.configs, args.params)
+    results = {"disabled": [], "cold": [], "warm": []}
+    for _ in range(args.repeats):
+        cache_dir = tempfile.mkdtemp()
+        results["disabled"].append(run_worker(paths, ""))
+        results["cold"].append(run_worker(paths, cache_dir))
+        results["warm"].append(run_worker(paths, cache_dir))
+
+    print(f"{args.configs} configs with {args.params} hp calls each, best of {args.repeats}")
+    print(f"{'cache':<10}{'ms startup':>12}")
+    for mode, times in results.items():
+        print(f"{mode:<10}{min(times):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
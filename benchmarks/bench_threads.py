@@ -0,0 +1,61 @@
+"""
+Benchmark calls to one Hypster instance from several threads sharing its run history.
+
+Every thread calls the same config and reads back its own last snapshot. The throughput of
+all threads together is reported for each number of threads.
+
+Usage:
+    python benchmarks/bench_threads.py [--calls N] [--threads N [N ...]]
+"""
+
+import argparse
+import threading
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+
+SOURCE = """
+def service(hp: HP):
+    model = hp.select(["cnn", "rnn", "mlp"], default="cnn")
+    lr = hp.number(0.001, min=0)
+    layers = hp.int(2, min=1)
+    request = hp.int(0)
+"""
+
+
+def measure(num_threads: int, calls_per_thread: int) -> float:
+    config = Hypster("service", SOURCE, {"HP": HP})
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker(thread_index: int) -> None:
+        barrier.wait()
+        for call in range(calls_per_thread):
+            request = thread_index * calls_per_thread + call
+            config(values={"request": request})
+            assert config.get_last_snapshot()["request"] == request
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return num_threads * calls_per_thread / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000, help="Calls per thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{args.calls} calls per thread")
+    print(f"{'threads':<10}{'calls/s':>10}")
+    for num_threads in args.threads:
+        print(f"{num_threads:<10}{measure(num_threads, args.calls):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
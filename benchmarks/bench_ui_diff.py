@@ -0,0 +1,59 @@
+"""
+Benchmark building UI components after a change in a config with many parameters.
+
+"recreate" creates a component for every parameter, as the UI did after each change. "diff"
+compares the latest records with the existing components and only creates the changed ones.
+Both start from the records of the same run. Requires the ``jupyter`` extra.
+
+Usage:
+    python benchmarks/bench_ui_diff.py [--params N] [--repeats N]
+"""
+
+import argparse
+import time
+from collections import OrderedDict
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.ui.handler import UIHandler
+
+
+def build_source(num_params: int) -> str:
+    lines = ["def many_params(hp: HP):"]
+    for i in range(num_params):
+        if i % 3 == 0:
+            lines.append(f"    select_{i} = hp.select(['a', 'b', 'c'], default='a')")
+        elif i % 3 == 1:
+            lines.append(f"    int_{i} = hp.int({i}, min=0, max=10000)")
+        else:
+            lines.append(f"    text_{i} = hp.text('value')")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    handler = UIHandler(Hypster("many_params", build_source(args.params), {"HP": HP}))
+    handler.update_components("int_1", 2)
+    records = handler.config_func.run_history.get_latest_run_records()
+
+    def recreate():
+        return OrderedDict((name, handler._create_component(name, record)) for name, record in records.items())
+
+    def diff():
+        return handler._diff_components(handler.components, records)
+
+    print(f"{args.params} parameters")
+    print(f"{'mode':<10}{'ms/update':>12}")
+    for mode, func in (("recreate", recreate), ("diff", diff)):
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            func()
+        print(f"{mode:<10}{(time.perf_counter() - start) / args.repeats * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
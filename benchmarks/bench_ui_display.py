@@ -0,0 +1,73 @@
+"""
+Benchmark displaying the interactive UI of a config with many parameters.
+
+The config has ``--params`` parameters and a nested config with ``--nested`` parameters. "all"
+creates a widget for every parameter, as the UI did, "paged" creates widgets for the first page
+of ``--page-size`` parameters, with large nested sections collapsed. Requires the ``jupyter`` extra.
+
+Usage:
+    python benchmarks/bench_ui_display.py [--params N] [--nested N] [--page-size N]
+"""
+
+import argparse
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.ui.handler import UIHandler
+from hypster.ui.ipywidgets import IPyWidgetsUI
+
+
+def build_source(name: str, num_params: int) -> str:
+    lines = [f"def {name}(hp: HP):"]
+    for i in range(num_params):
+        if i % 3 == 0:
+            lines.append(f"    select_{i} = hp.select(['a', 'b', 'c'], default='a')")
+        elif i % 3 == 1:
+            lines.append(f"    int_{i} = hp.int({i}, min=0, max=10000)")
+        else:
+            lines.append(f"    text_{i} = hp.text('value')")
+    return "\n".join(lines)
+
+
+def count_widgets(ui: IPyWidgetsUI) -> int:
+    stack = [ui.container]
+    count = 0
+    while stack:
+        widget = stack.pop()
+        count += 1
+        stack.extend(getattr(widget, "children", ()))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", type=int, default=500)
+    parser.add_argument("--nested", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    inner = Hypster("inner", build_source("inner", args.nested), {"HP": HP})
+    source = build_source("outer", args.params) + "\n    head = hp.nest(_inner)\n"
+    config = Hypster("outer", source, {"HP": HP, "_inner": inner})
+    handler = UIHandler(config)
+
+    print(f"{args.params} parameters, {args.nested} nested parameters")
+    print(f"{'mode':<8}{'ms to display':>15}{'widgets':>10}")
+    for mode, page_size in (("all", args.params + args.nested + 1), ("paged", args.page_size)):
+        start = time.perf_counter()
+        ui = IPyWidgetsUI(handler, page_size=page_size)
+        if mode == "all":
+            # Expand every nested section, as the UI used to
+            for component in handler.components.values():
+                component_ui = ui._create_ui_component(component)
+                ui.ui_components[component.id] = component_ui
+                if hasattr(component_ui, "expanded") and not component_ui.expanded:
+                    component_ui.widget.selected_index = 0
+        ui._update_display()
+        elapsed = (time.perf_counter() - start) * 1e3
+        print(f"{mode:<8}{elapsed:>15.0f}{count_widgets(ui):>10}")
+
+
+if __name__ == "__main__":
+    main()
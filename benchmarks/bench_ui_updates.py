@@ -0,0 +1,64 @@
+"""
+Benchmark scrubbing a slider in the interactive UI.
+
+Sends ``--changes`` changes of one parameter, ``--interval`` milliseconds apart, to a config that
+takes ``--cost`` milliseconds to run. "sync" updates the components on the calling thread, as
+the UI did, "background" submits the updates to the handler's background thread, where changes
+that are superseded before they start are skipped. Requires the ``jupyter`` extra.
+
+Usage:
+    python benchmarks/bench_ui_updates.py [--changes N] [--interval MS] [--cost MS]
+"""
+
+import argparse
+import time
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.ui.handler import UIHandler
+
+SOURCE = """
+def slider_config(hp: HP):
+    size = hp.int(1, min=0)
+    model = build(size)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--changes", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=10.0)
+    parser.add_argument("--cost", type=float, default=100.0)
+    args = parser.parse_args()
+
+    runs = []
+
+    def build(size):
+        runs.append(size)
+        time.sleep(args.cost / 1e3)
+        return size
+
+    print(f"{args.changes} changes every {args.interval:.0f} ms, {args.cost:.0f} ms per run")
+    print(f"{'mode':<12}{'ms blocked':>12}{'runs':>8}{'ms to latest':>14}")
+    for mode in ("sync", "background"):
+        handler = UIHandler(Hypster("slider_config", SOURCE, {"HP": HP, "build": build}))
+        runs.clear()
+        blocked = 0.0
+        start = time.perf_counter()
+        for value in range(args.changes):
+            change_start = time.perf_counter()
+            if mode == "sync":
+                handler.update_components("size", value)
+            else:
+                future = handler.submit_update("size", value)
+            blocked += time.perf_counter() - change_start
+            time.sleep(args.interval / 1e3)
+        if mode == "background":
+            future.result()
+        total = time.perf_counter() - start
+        handler.close()
+        print(f"{mode:<12}{blocked * 1e3:>12.0f}{len(runs):>8}{total * 1e3:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
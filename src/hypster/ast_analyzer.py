@@ -1,6 +1,17 @@
 import ast
+import hashlib
 import logging
-from typing import Dict, List, Optional, Set
+import marshal
+import os
+import sys
+import tempfile
+import textwrap
+import threading
+import types
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .utils import get_hp_function_node
 
 logger = logging.getLogger(__name__)
 
@@ -54,15 +65,29 @@ def build_parent_map(node: ast.AST) -> Dict[ast.AST, ast.AST]:
 
 
 class HPCallVisitor(ast.NodeVisitor):
-    def __init__(self, parent_map: Dict[ast.AST, ast.AST]):
+    def __init__(self, parent_map: Optional[Dict[ast.AST, ast.AST]] = None):
+        # Without a parent map, parents are taken from the chain of nodes being visited
         self.parent_map = parent_map
+        self.ancestors: List[ast.AST] = []
         self.hp_calls: List[HPCall] = []
+        # The call node of each hp call, in the same order as hp_calls
+        self.call_nodes: List[ast.Call] = []
         logger.debug("Initialized HPCallVisitor")
 
+    def visit(self, node: ast.AST):
+        self.ancestors.append(node)
+        try:
+            return super().visit(node)
+        finally:
+            self.ancestors.pop()
+
     def visit_Call(self, node: ast.Call):
         if self.is_hp_call(node):
             logger.debug(f"Detected hp call at line {node.lineno}, column {node.col_offset}")
-            implicit_name = self.infer_implicit_name(node)
+            parent_map = self.parent_map
+            if parent_map is None:
+                parent_map = dict(zip(self.ancestors[1:], self.ancestors[:-1]))
+            implicit_name = self.infer_implicit_name(node, parent_map)
             has_explicit_name = self.has_explicit_name(node)
             method_name = node.func.attr
 
@@ -75,6 +100,7 @@ class HPCallVisitor(ast.NodeVisitor):
             )
             logger.debug(f"Created HPCall instance: {hp_call}")
             self.hp_calls.append(hp_call)
+            self.call_nodes.append(node)
 
         self.generic_visit(node)
 
@@ -95,21 +121,25 @@ class HPCallVisitor(ast.NodeVisitor):
         logger.debug(f"HP call at line {node.lineno} does not have an explicit name")
         return False
 
-    def infer_implicit_name(self, node: ast.Call) -> Optional[str]:
+    def infer_implicit_name(self, node: ast.Call, parent_map: Optional[Dict[ast.AST, ast.AST]] = None) -> Optional[str]:
         """
         Infer the implicit name for an HP call by traversing its context.
 
         Args:
             node (ast.Call): The HP call node.
+            parent_map (Optional[Dict[ast.AST, ast.AST]]): Parents of the nodes above the call.
+                Defaults to the parent map of the visitor.
 
         Returns:
             Optional[str]: The inferred implicit name or None if unsupported.
         """
+        if parent_map is None:
+            parent_map = self.parent_map
         context = []
         current_node = node
 
         while True:
-            parent = self.parent_map.get(current_node)
+            parent = parent_map.get(current_node)
             if parent is None:
                 logger.debug(f"No parent found for node at line {current_node.lineno}")
                 break
@@ -126,7 +156,7 @@ class HPCallVisitor(ast.NodeVisitor):
                 arg_name = parent.arg
                 context.append(("keyword", arg_name))
                 logger.debug(f"Found keyword argument '{arg_name}'")
-                current_node = self.parent_map.get(parent)
+                current_node = parent_map.get(parent)
 
             elif isinstance(parent, ast.Call):
                 if self.is_method_call(parent):
@@ -334,11 +364,7 @@ def collect_hp_calls(code: str) -> List[HPCall]:
         logger.error(f"Syntax error while parsing code: {e}")
         return []
 
-    # Build parent map
-    parent_map = build_parent_map(tree)
-
-    # Initialize visitor with parent map
-    visitor = HPCallVisitor(parent_map)
+    visitor = HPCallVisitor()
     visitor.visit(tree)
 
     logger.info(f"Collected {len(visitor.hp_calls)} HP calls")
@@ -377,6 +403,18 @@ def inject_names_to_source_code(code: str, hp_calls: List[HPCall]) -> str:
     return modified_code
 
 
+def inject_name(node: ast.Call, hp_call: HPCall) -> None:
+    """Add the implicit name of an hp call to its call node, unless it has an explicit name"""
+    if hp_call.implicit_name and not hp_call.has_explicit_name:
+        logger.debug(f"Injecting name '{hp_call.implicit_name}' into hp call on line {hp_call.lineno}")
+        # Avoid duplicate 'name' arguments
+        if not any(kw.arg == "name" for kw in node.keywords):
+            value = ast.copy_location(ast.Constant(value=hp_call.implicit_name), node)
+            node.keywords.append(ast.copy_location(ast.keyword(arg="name", value=value), node))
+    else:
+        logger.debug(f"No injection needed for hp call on line {hp_call.lineno}")
+
+
 class NameInjector(ast.NodeTransformer):
     def __init__(self, hp_calls: List[HPCall]):
         self.hp_calls = hp_calls
@@ -390,25 +428,89 @@ class NameInjector(ast.NodeTransformer):
             and node.func.value.id == "hp"
         ):
             if self.call_index < len(self.hp_calls):
-                hp_call = self.hp_calls[self.call_index]
-                if hp_call.implicit_name and not hp_call.has_explicit_name:
-                    logger.debug(f"Injecting name '{hp_call.implicit_name}' into hp call on line {hp_call.lineno}")
-                    # Avoid duplicate 'name' arguments
-                    if not any(kw.arg == "name" for kw in node.keywords):
-                        node.keywords.append(
-                            ast.keyword(
-                                arg="name",
-                                value=ast.Constant(value=hp_call.implicit_name),
-                            )
-                        )
-                else:
-                    logger.debug(f"No injection needed for hp call on line {hp_call.lineno}")
+                inject_name(node, self.hp_calls[self.call_index])
                 self.call_index += 1
             else:
                 logger.warning("More hp_calls than hp.Call nodes encountered")
         return self.generic_visit(node)
 
 
+# Name under which `LazyOption` is available to configs with lazy options
+LAZY_OPTION_NAME = "__hypster_lazy_option__"
+LAZY_OPTION_METHODS = ("select", "multi_select")
+
+
+def make_options_lazy(code: str) -> str:
+    """
+    Wrap the values of dict-literal options of select and multi_select calls in thunks.
+
+    `hp.select({"a": A(), "b": B()})` becomes
+    `hp.select({"a": __hypster_lazy_option__(lambda: A()), "b": ...})`, so that only the
+    selected option is evaluated. Constants, plain names and values that contain hp calls,
+    assignment expressions, yield or await are left as they are.
+
+    Args:
+        code (str): The source code, usually after name injection.
+
+    Returns:
+        str: The modified source code.
+    """
+    logger.info("Starting lazy options rewrite")
+    tree = ast.parse(code)
+    modified_tree = LazyOptionsTransformer().visit(tree)
+    ast.fix_missing_locations(modified_tree)
+    return ast.unparse(modified_tree)
+
+
+class LazyOptionsTransformer(ast.NodeTransformer):
+    UNSAFE_NODES = (ast.NamedExpr, ast.Yield, ast.YieldFrom, ast.Await)
+
+    def visit_Call(self, node: ast.Call):
+        self.generic_visit(node)
+        if not (
+            isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "hp"
+            and node.func.attr in LAZY_OPTION_METHODS
+        ):
+            return node
+
+        options = node.args[0] if node.args else next((kw.value for kw in node.keywords if kw.arg == "options"), None)
+        if isinstance(options, ast.Dict):
+            options.values = [
+                self.make_lazy(value) if key is not None and self.can_defer(value) else value
+                for key, value in zip(options.keys, options.values)
+            ]
+        return node
+
+    def can_defer(self, node: ast.AST) -> bool:
+        """Whether evaluating the node later, inside a lambda, has the same meaning"""
+        if isinstance(node, (ast.Constant, ast.Name)):
+            return False
+        for child in ast.walk(node):
+            if isinstance(child, self.UNSAFE_NODES):
+                return False
+            # Keep hp calls in the order they appear, so history records are not reordered
+            if (
+                isinstance(child, ast.Call)
+                and isinstance(child.func, ast.Attribute)
+                and isinstance(child.func.value, ast.Name)
+                and child.func.value.id == "hp"
+            ):
+                return False
+        return True
+
+    def make_lazy(self, node: ast.AST) -> ast.Call:
+        logger.debug(f"Deferring option value on line {node.lineno}")
+        thunk = ast.Lambda(
+            args=ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=node,
+        )
+        func = ast.Name(id=LAZY_OPTION_NAME, ctx=ast.Load())
+        call = ast.Call(func=ast.copy_location(func, node), args=[ast.copy_location(thunk, node)], keywords=[])
+        return ast.copy_location(call, node)
+
+
 def find_referenced_vars(code: str) -> Set[str]:
     """
     Find all variables that are referenced (read) in the given source code.
@@ -447,3 +549,852 @@ def find_independent_select_calls(referenced_vars: Set[str], hp_calls: List[HPCa
     }
     logger.debug(f"Independent select calls identified: {independent_vars}")
     return list(independent_vars)
+
+
+# Calls that read or write variables by name, which the dependency analysis cannot follow
+DYNAMIC_SCOPE_FUNCTIONS = {"exec", "eval", "locals", "globals", "vars", "setattr", "delattr", "__import__"}
+NESTED_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+
+
+class UnanalyzableStatementError(Exception):
+    """Raised when a statement has effects that the dependency analysis cannot track"""
+
+
+class StatementInfo:
+    """Names that a top-level statement of a config body binds, reads and may mutate"""
+
+    def __init__(self):
+        self.defs: Set[str] = set()
+        self.uses: Set[str] = set()
+        # Names read inside functions, lambdas and classes, which may run after later statements
+        self.late_uses: Set[str] = set()
+        self.is_import = False
+        # Root names of attribute / subscript assignments, of method calls and of call arguments,
+        # e.g. `x` in `x.a = 1` or `f(x)`
+        self.store_roots: Set[str] = set()
+        self.call_roots: Set[str] = set()
+        self.expr_call_roots: Set[str] = set()
+        # The same for free names inside functions, lambdas and classes
+        self.late_store_roots: Set[str] = set()
+        self.late_call_roots: Set[str] = set()
+        # Groups of names that may refer to the same objects afterwards, e.g. `x` and `y` in `x = y.a`
+        self.aliases: List[Set[str]] = []
+
+    def __repr__(self):
+        return f"StatementInfo(defs={self.defs}, uses={self.uses}, late_uses={self.late_uses})"
+
+
+def get_root_name(node: ast.AST) -> Optional[str]:
+    """Return `x` for `x`, `x.a`, `x[0].b` or `x.a().b`, and None otherwise"""
+    while isinstance(node, (ast.Attribute, ast.Subscript, ast.Call)):
+        node = node.func if isinstance(node, ast.Call) else node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def argument_roots(node: ast.Call) -> Set[str]:
+    """Return the root names of the arguments of a call, e.g. `x` and `y` for `f(x.a, key=y[0])`"""
+    arguments = [*node.args, *(keyword.value for keyword in node.keywords)]
+    roots = (get_root_name(arg.value if isinstance(arg, ast.Starred) else arg) for arg in arguments)
+    return {root for root in roots if root is not None}
+
+
+def check_dynamic_scope(node: ast.AST) -> None:
+    if isinstance(node, (ast.Global, ast.Nonlocal)):
+        raise UnanalyzableStatementError(f"'{type(node).__name__.lower()}' statement on line {node.lineno}")
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in DYNAMIC_SCOPE_FUNCTIONS:
+        raise UnanalyzableStatementError(f"call to '{node.func.id}' on line {node.lineno}")
+
+
+def bound_names(node: ast.AST) -> List[str]:
+    """Names bound by nodes that do not use `ast.Name`: imports, except clauses and match patterns"""
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        names = []
+        for alias in node.names:
+            if alias.name == "*":
+                raise UnanalyzableStatementError(f"star import on line {node.lineno}")
+            names.append(alias.asname or alias.name.split(".")[0])
+        return names
+    if isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name:
+        return [node.name]
+    if isinstance(node, ast.MatchMapping) and node.rest:
+        return [node.rest]
+    return []
+
+
+def alias_group(node: ast.AST) -> Set[str]:
+    """
+    Return the names that may share objects after `node` runs: the names bound or mutated by an
+    assignment and the names read by its value, or the receiver and the arguments of a call
+    """
+    if isinstance(node, ast.Assign):
+        parts = [*node.targets, node.value]
+    elif isinstance(node, (ast.AugAssign, ast.AnnAssign, ast.NamedExpr)):
+        parts = [node.target, node.value]
+    elif isinstance(node, (ast.For, ast.AsyncFor, ast.comprehension)):
+        parts = [node.target, node.iter]
+    elif isinstance(node, ast.withitem):
+        parts = [node.optional_vars, node.context_expr]
+    elif isinstance(node, ast.Match):
+        parts = [node.subject, *(case.pattern for case in node.cases)]
+    elif isinstance(node, ast.Call):
+        parts = [*node.args, *(keyword.value for keyword in node.keywords)]
+        if isinstance(node.func, ast.Attribute):
+            parts.append(node.func.value)
+    else:
+        return set()
+
+    names: Set[str] = set()
+    for part in parts:
+        if part is None:
+            continue
+        for child in ast.walk(part):
+            if isinstance(child, ast.Name):
+                names.add(child.id)
+            else:
+                names.update(bound_names(child))
+    return names
+
+
+def analyze_nested_scope(node: ast.AST, info: StatementInfo) -> None:
+    """Add the free names read and mutated by a function, lambda or class to `info`"""
+    local_names: Set[str] = set()
+    loads: Set[str] = set()
+    store_roots: Set[str] = set()
+    call_roots: Set[str] = set()
+
+    for child in ast.walk(node):
+        check_dynamic_scope(child)
+        if isinstance(child, ast.Name):
+            if isinstance(child.ctx, ast.Load):
+                loads.add(child.id)
+            else:
+                local_names.add(child.id)
+        elif isinstance(child, ast.arg):
+            local_names.add(child.arg)
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and child is not node:
+            local_names.add(child.name)
+        elif isinstance(child, (ast.Attribute, ast.Subscript)) and not isinstance(child.ctx, ast.Load):
+            store_roots.add(get_root_name(child))
+        elif isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute):
+            call_roots.add(get_root_name(child.func))
+        local_names.update(bound_names(child))
+
+    info.late_uses |= loads
+    if not isinstance(node, ast.Lambda):
+        # Calling the function may return the objects of the free names it reads
+        info.aliases.append({node.name} | loads)
+    info.late_store_roots |= store_roots - local_names
+    info.late_call_roots |= call_roots - local_names - {None}
+
+
+def analyze_statement(statement: ast.stmt) -> StatementInfo:
+    """
+    Collect the names that a top-level statement binds, reads and may mutate.
+
+    Compound statements (if, for, with, try, ...) are analyzed as a single unit.
+
+    Raises:
+        UnanalyzableStatementError: If the statement reads or writes variables in ways that
+            cannot be tracked statically.
+    """
+    info = StatementInfo()
+    info.is_import = isinstance(statement, (ast.Import, ast.ImportFrom))
+    stack: List[ast.AST] = [statement]
+
+    while stack:
+        node = stack.pop()
+        check_dynamic_scope(node)
+
+        if isinstance(node, NESTED_SCOPE_NODES):
+            if not isinstance(node, ast.Lambda):
+                info.defs.add(node.name)
+            analyze_nested_scope(node, info)
+            continue
+
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                info.uses.add(node.id)
+            else:
+                info.defs.add(node.id)
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
+            info.uses.add(node.target.id)
+        elif isinstance(node, (ast.Attribute, ast.Subscript)) and not isinstance(node.ctx, ast.Load):
+            root = get_root_name(node)
+            if root is None:
+                raise UnanalyzableStatementError(f"assignment to an expression on line {node.lineno}")
+            info.store_roots.add(root)
+        elif isinstance(node, ast.Call):
+            root = get_root_name(node.func)
+            if root is not None and isinstance(node.func, ast.Attribute):
+                info.call_roots.add(root)
+            if root != "hp":
+                # Any call other than an hp call may mutate the objects passed to it, e.g. `Scheduler(optimizer)`
+                info.call_roots.update(argument_roots(node))
+        elif isinstance(node, ast.Expr):
+            # Expression statements only run for their side effects. Method calls are tracked as
+            # mutations of their receiver, anything else (e.g. `print(x)`) cannot be tracked.
+            value = node.value
+            if not isinstance(value, ast.Constant):
+                root = get_root_name(value.func) if isinstance(value, ast.Call) else None
+                if root is None or not isinstance(value.func, ast.Attribute):
+                    raise UnanalyzableStatementError(f"expression statement on line {node.lineno}")
+                info.expr_call_roots.add(root)
+
+        group = alias_group(node)
+        if len(group) > 1:
+            info.aliases.append(group)
+        info.defs.update(bound_names(node))
+        stack.extend(ast.iter_child_nodes(node))
+
+    return info
+
+
+def find_aliases(infos: List[StatementInfo], names: Set[str]) -> Dict[str, Set[str]]:
+    """Map each of `names` that may share objects with others to all of them, through any chain of statements"""
+    aliases: Dict[str, Set[str]] = {}
+    for info in infos:
+        for group in info.aliases:
+            merged = group & names
+            for name in list(merged):
+                merged |= aliases.get(name, set())
+            for name in merged:
+                aliases[name] = merged
+    return aliases
+
+
+class DependencyGraph:
+    """
+    Statement-level dependency graph of a config body.
+
+    Every top-level statement is a node. A statement depends on the earlier statements that
+    bind or may mutate the names it reads; names read inside functions, lambdas and classes
+    may be resolved when they are called, so they depend on every statement binding them.
+    """
+
+    def __init__(self, statements: List[ast.stmt], infos: List[StatementInfo]):
+        self.statements = statements
+        self.defs = [info.defs for info in infos]
+        self.uses = [info.uses for info in infos]
+        self.late_uses = [info.late_uses for info in infos]
+        self.definers: Dict[str, List[int]] = {}
+        self.users: Dict[str, List[int]] = {}
+        self.late_users: Dict[str, List[int]] = {}
+        for index, info in enumerate(infos):
+            for name in info.defs:
+                self.definers.setdefault(name, []).append(index)
+            for name in info.uses:
+                self.users.setdefault(name, []).append(index)
+            for name in info.late_uses:
+                self.late_users.setdefault(name, []).append(index)
+
+    def slice(self, names: Iterable[str]) -> Optional[List[int]]:
+        """
+        Return the indices of the statements needed to compute `names`, in execution order.
+
+        Returns None if one of the names is not bound by any statement.
+        """
+        stack = []
+        for name in names:
+            if name not in self.definers:
+                return None
+            stack.extend(self.definers[name])
+        return sorted(self._closure(stack))
+
+    def dependencies(self, index: int) -> Set[int]:
+        """Return the indices of the statements that statement `index` depends on, directly or not"""
+        stack = []
+        for name in self.uses[index]:
+            stack.extend(i for i in self.definers.get(name, []) if i < index)
+        for name in self.late_uses[index]:
+            stack.extend(self.definers.get(name, []))
+        return self._closure(stack) - {index}
+
+    def affected(self, index: int) -> Set[int]:
+        """
+        Return the indices of the statements to run again when the outcome of statement `index` changes.
+
+        These are the statements that read what it binds or mutates, directly or not, and every
+        other statement binding or mutating the same names, so that running them again in order
+        leaves no stale value or repeated mutation behind.
+        """
+        affected: Set[int] = set()
+        stack = [index]
+        while stack:
+            current = stack.pop()
+            if current in affected:
+                continue
+            affected.add(current)
+            for name in self.defs[current]:
+                first_definer = self.definers[name][0]
+                stack.extend(self.definers[name])
+                stack.extend(i for i in self.users.get(name, []) if i > first_definer)
+                stack.extend(self.late_users.get(name, []))
+        return affected
+
+    def _closure(self, stack: List[int]) -> Set[int]:
+        needed: Set[int] = set()
+        while stack:
+            index = stack.pop()
+            if index in needed:
+                continue
+            needed.add(index)
+            for name in self.uses[index]:
+                stack.extend(i for i in self.definers.get(name, []) if i < index)
+            for name in self.late_uses[index]:
+                stack.extend(self.definers.get(name, []))
+        return needed
+
+
+def build_dependency_graph(tree: ast.Module, outer_defs: Set[str] = frozenset()) -> Optional[DependencyGraph]:
+    """
+    Build the statement-level dependency graph of a config body.
+
+    Args:
+        tree (ast.Module): The parsed body of the config function, without its signature.
+        outer_defs (Set[str], optional): Names bound outside of `tree` that it may mutate, when
+            `tree` is a block nested in the body, e.g. the body of an if statement.
+
+    Returns:
+        Optional[DependencyGraph]: The graph, or None if the body has side effects that cannot
+            be analyzed, in which case the body must always be executed as a whole.
+    """
+    try:
+        infos = [analyze_statement(statement) for statement in tree.body]
+    except UnanalyzableStatementError as e:
+        logger.debug(f"Config body cannot be sliced: {e}")
+        return None
+
+    # Mutating objects that the body did not create (modules, namespace objects) is a side
+    # effect on state that the graph does not track.
+    body_defs = set(outer_defs).union(*(info.defs for info in infos if not info.is_import))
+    # Mutating an object through one name changes it for every name that may refer to it,
+    # e.g. `alias.append(x)` after `alias = items` or `trainer.fit()` after `trainer = Trainer(model)`
+    aliases = find_aliases(infos, body_defs)
+    for info in infos:
+        if info.store_roots - body_defs or info.expr_call_roots - body_defs:
+            logger.debug("Config body cannot be sliced: it mutates objects defined outside of it")
+            return None
+        if info.late_store_roots or info.late_call_roots & body_defs:
+            logger.debug("Config body cannot be sliced: a function or class mutates variables of the body")
+            return None
+        for root in (info.store_roots | info.call_roots) & body_defs:
+            info.defs |= aliases.get(root, {root})
+
+    return DependencyGraph(tree.body, infos)
+
+
+# Nodes whose parts are evaluated conditionally, repeatedly or later
+CONDITIONAL_NODES = (
+    ast.IfExp,
+    ast.BoolOp,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+    *NESTED_SCOPE_NODES,
+)
+SIMPLE_STATEMENTS = (ast.Assign, ast.AnnAssign, ast.AugAssign, ast.Expr)
+
+
+def is_hp_call_node(node: ast.AST) -> bool:
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "hp"
+    )
+
+
+def get_hp_call_name(node: ast.Call) -> Optional[str]:
+    """Return the name of an hp call if it is a string constant, e.g. after name injection"""
+    for kw in node.keywords:
+        if kw.arg == "name" and isinstance(kw.value, ast.Constant) and isinstance(kw.value.value, str):
+            return kw.value.value
+    return None
+
+
+def find_free_parameters(function_node: ast.FunctionDef) -> FrozenSet[str]:
+    """
+    Find the parameters whose values cannot change which hp calls run, or with which arguments.
+
+    A parameter is free when none of the statements that run hp calls depend on the statement
+    that defines it, and its call is not evaluated conditionally (ternaries, `and` / `or`,
+    comprehensions, loops, try statements, nested functions) or as an argument of another hp
+    call. The bodies of if and with statements are analyzed as blocks of their own. Calls
+    whose names are not string constants, and bodies that cannot be analyzed, are never free.
+
+    Args:
+        function_node (ast.FunctionDef): The config function, after name injection.
+
+    Returns:
+        FrozenSet[str]: The names of the free parameters.
+    """
+    free: Set[str] = set()
+    structural: Set[str] = set()
+    _classify_block(function_node.body, frozenset(), free, structural)
+    return frozenset(free - structural)
+
+
+def _classify_block(body: List[ast.stmt], outer_defs: Set[str], free: Set[str], structural: Set[str]) -> None:
+    graph = build_dependency_graph(ast.Module(body=body, type_ignores=[]), outer_defs)
+    if graph is None:
+        for statement in body:
+            _classify_calls(statement, True, free, structural)
+        return
+
+    # Statements that run hp calls, including by passing `hp` to a function
+    hp_statements = [i for i in range(len(body)) if "hp" in graph.uses[i] or "hp" in graph.late_uses[i]]
+    influential = set().union(*(graph.dependencies(i) for i in hp_statements))
+    block_defs = set(outer_defs) | set(graph.definers)
+
+    for index, statement in enumerate(body):
+        if index in influential:
+            _classify_calls(statement, True, free, structural)
+        elif isinstance(statement, ast.If):
+            _classify_calls(statement.test, True, free, structural)
+            _classify_block(statement.body, block_defs, free, structural)
+            _classify_block(statement.orelse, block_defs, free, structural)
+        elif isinstance(statement, (ast.With, ast.AsyncWith)):
+            for item in statement.items:
+                _classify_calls(item, True, free, structural)
+            _classify_block(statement.body, block_defs, free, structural)
+        elif isinstance(statement, SIMPLE_STATEMENTS):
+            _classify_calls(statement, False, free, structural)
+        else:
+            _classify_calls(statement, True, free, structural)
+
+
+def _classify_calls(node: ast.AST, conditional: bool, free: Set[str], structural: Set[str]) -> None:
+    if is_hp_call_node(node):
+        name = get_hp_call_name(node)
+        if name is not None:
+            (structural if conditional else free).add(name)
+        # Calls in the arguments of an hp call can change its options
+        conditional = True
+    elif isinstance(node, CONDITIONAL_NODES):
+        conditional = True
+    for child in ast.iter_child_nodes(node):
+        _classify_calls(child, conditional, free, structural)
+
+
+class NestTarget(NamedTuple):
+    """The config passed to an hp.nest call: a path or a variable, when either is a plain literal or name"""
+
+    name: Optional[str]
+    path: Optional[str] = None
+    variable: Optional[str] = None
+
+
+def find_nest_targets(function_node: ast.FunctionDef) -> List[NestTarget]:
+    """Find the configs passed to the hp.nest calls of a config function"""
+    targets = []
+    for node in ast.walk(function_node):
+        if not (is_hp_call_node(node) and node.func.attr == "nest"):
+            continue
+        config_node = (
+            node.args[0] if node.args else next((kw.value for kw in node.keywords if kw.arg == "config_func"), None)
+        )
+        target = NestTarget(get_hp_call_name(node))
+        if isinstance(config_node, ast.Constant) and isinstance(config_node.value, str):
+            target = target._replace(path=config_node.value)
+        elif isinstance(config_node, ast.Name):
+            target = target._replace(variable=config_node.id)
+        targets.append(target)
+    return targets
+
+
+class ConfigAnalysis:
+    """
+    Everything derived from the source code of a config function.
+
+    The result is shared by all Hypster instances created from the same source, so it must
+    be treated as read-only, except for `sliced_code` which caches compiled slices of the body.
+    The syntax tree is not stored in the disk cache; it is rebuilt from the source when needed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source_code: str,
+        hp_calls: List[HPCall],
+        code: types.CodeType,
+        inject_names: bool,
+        lazy_options: bool,
+        function_node: Optional[ast.FunctionDef] = None,
+        modified_source: Optional[str] = None,
+    ):
+        self.name = name
+        self.source_code = source_code
+        self.hp_calls = hp_calls
+        self.code = code
+        self.inject_names = inject_names
+        self.lazy_options = lazy_options
+        self.sliced_code: Dict[FrozenSet[str], Optional[types.CodeType]] = {}
+        self._statement_code: Optional[List[types.CodeType]] = None
+        self._function_node = function_node
+        self._modified_source = modified_source
+        self._dependency_graph: Optional[DependencyGraph] = None
+        self._dependency_graph_built = False
+        self._free_parameters: Optional[FrozenSet[str]] = None
+        self._nest_targets: Optional[List[NestTarget]] = None
+        self._source_hash: Optional[str] = None
+
+    @property
+    def rewritten(self) -> bool:
+        return self.inject_names or self.lazy_options
+
+    @property
+    def function_node(self) -> ast.FunctionDef:
+        """The rewritten syntax tree of the function, with line numbers relative to its source"""
+        if self._function_node is None:
+            function_node = get_hp_function_node(ast.parse(self.source_code))
+            rewrite_config_function(function_node, self.inject_names, self.lazy_options)
+            self._function_node = function_node
+        return self._function_node
+
+    @property
+    def dependency_graph(self) -> Optional[DependencyGraph]:
+        """The dependency graph of the body, built when final_vars are first requested"""
+        if not self._dependency_graph_built:
+            self._dependency_graph = build_dependency_graph(ast.Module(body=self.function_node.body, type_ignores=[]))
+            self._dependency_graph_built = True
+        return self._dependency_graph
+
+    @property
+    def statement_code(self) -> Optional[List[types.CodeType]]:
+        """Each statement of the body compiled on its own, or None if the body cannot be analyzed"""
+        if self._statement_code is None and self.dependency_graph is not None:
+            self._statement_code = [
+                compile(ast.Module(body=[statement], type_ignores=[]), f"<hypster:{self.name}>", "exec")
+                for statement in self.dependency_graph.statements
+            ]
+        return self._statement_code
+
+    @property
+    def free_parameters(self) -> FrozenSet[str]:
+        """The names of the parameters that cannot change the structure of the search space"""
+        if self._free_parameters is None:
+            self._free_parameters = find_free_parameters(self.function_node)
+        return self._free_parameters
+
+    @property
+    def nest_targets(self) -> List[NestTarget]:
+        """The configs passed to the hp.nest calls of the body"""
+        if self._nest_targets is None:
+            self._nest_targets = find_nest_targets(self.function_node)
+        return self._nest_targets
+
+    @property
+    def source_hash(self) -> str:
+        """The hash of the source code of the function"""
+        if self._source_hash is None:
+            self._source_hash = source_hash(self.source_code)
+        return self._source_hash
+
+    @property
+    def modified_source(self) -> str:
+        """The source code after name injection and other rewrites, generated on first access"""
+        if self._modified_source is None:
+            self._modified_source = ast.unparse(self.function_node) if self.rewritten else self.source_code
+        return self._modified_source
+
+
+MAX_CACHED_ANALYSES = 1024
+_analysis_cache: "OrderedDict[Tuple[str, bool, bool], ConfigAnalysis]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+# Bump when a change to the analysis makes cached results on disk invalid
+DISK_CACHE_FORMAT = 1
+CACHE_DIR_ENV = "HYPSTER_CACHE_DIR"
+# The least recently used files are deleted once the cache directory holds more files
+MAX_DISK_CACHE_FILES = 1024
+
+
+def source_hash(source_code: str) -> str:
+    return hashlib.sha256(source_code.encode()).hexdigest()
+
+
+def get_cache_dir() -> Optional[str]:
+    """
+    Return the directory of the on-disk analysis cache, or None if it is disabled.
+
+    The location is taken from the HYPSTER_CACHE_DIR environment variable, and defaults to
+    `hypster` under the user cache directory. Setting HYPSTER_CACHE_DIR to an empty string
+    disables the cache. Each hypster and Python version gets its own subdirectory, which keeps
+    at most MAX_DISK_CACHE_FILES files, so edited configs do not grow it forever.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir is None:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(base_dir, "hypster")
+    elif not cache_dir:
+        return None
+    return os.path.join(cache_dir, f"{_hypster_version()}-{sys.implementation.cache_tag}-{DISK_CACHE_FORMAT}")
+
+
+def _hypster_version() -> str:
+    from . import __version__
+
+    return __version__
+
+
+def _read_cache_file(file_name: str):
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    path = os.path.join(cache_dir, file_name)
+    try:
+        with open(path, "rb") as f:
+            data = marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logger.debug(f"Ignoring unreadable analysis cache file {path}: {e}")
+        return None
+    try:
+        # Reading a file makes it the most recently used, see _prune_cache_dir
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+def _write_cache_file(file_name: str, data) -> None:
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return
+    path = os.path.join(cache_dir, file_name)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump(data, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write analysis cache file {path}: {e}")
+        return
+    _prune_cache_dir(cache_dir)
+
+
+def _prune_cache_dir(cache_dir: str) -> None:
+    """Delete the least recently used cache files beyond MAX_DISK_CACHE_FILES"""
+    try:
+        entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(".bin")]
+    except OSError:
+        return
+    if len(entries) <= MAX_DISK_CACHE_FILES:
+        return
+
+    def last_used(entry: os.DirEntry) -> int:
+        try:
+            return entry.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    entries.sort(key=last_used)
+    for entry in entries[: len(entries) - MAX_DISK_CACHE_FILES]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            # Deleted by another process in the meantime
+            pass
+
+
+def _analysis_file_name(key: Tuple[str, bool, bool]) -> str:
+    digest, inject_names, lazy_options = key
+    return f"{digest}-{int(inject_names)}{int(lazy_options)}.bin"
+
+
+def _analysis_to_data(analysis: ConfigAnalysis, modified_source: Optional[str]) -> Tuple:
+    hp_calls = tuple(
+        (call.lineno, call.col_offset, call.method_name, call.implicit_name, call.has_explicit_name)
+        for call in analysis.hp_calls
+    )
+    return (analysis.name, analysis.source_code, modified_source, hp_calls, analysis.code)
+
+
+def _analysis_from_data(data: Tuple, inject_names: bool, lazy_options: bool) -> ConfigAnalysis:
+    name, source_code, modified_source, hp_calls, code = data
+    if not isinstance(code, types.CodeType):
+        raise TypeError(f"expected compiled code, got {type(code).__name__}")
+    return ConfigAnalysis(
+        name=name,
+        source_code=source_code,
+        hp_calls=[HPCall(*fields) for fields in hp_calls],
+        code=code,
+        inject_names=inject_names,
+        lazy_options=lazy_options,
+        modified_source=modified_source,
+    )
+
+
+def _read_disk_cache(key: Tuple[str, bool, bool]) -> Optional[ConfigAnalysis]:
+    data = _read_cache_file(_analysis_file_name(key))
+    if data is None:
+        return None
+    _, inject_names, lazy_options = key
+    try:
+        return _analysis_from_data(data, inject_names, lazy_options)
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Ignoring invalid analysis cache file {_analysis_file_name(key)}: {e}")
+        return None
+
+
+def _write_disk_cache(key: Tuple[str, bool, bool], analysis: ConfigAnalysis) -> None:
+    if get_cache_dir() is None:
+        return
+    _write_cache_file(_analysis_file_name(key), _analysis_to_data(analysis, analysis.modified_source))
+
+
+def dump_analysis(analysis: ConfigAnalysis) -> bytes:
+    """Serialize an analysis, including its compiled code, e.g. to send it to another process"""
+    return marshal.dumps(_analysis_to_data(analysis, analysis._modified_source))
+
+
+def restore_analysis(data: bytes, inject_names: bool, lazy_options: bool) -> ConfigAnalysis:
+    """
+    Restore an analysis serialized by dump_analysis and register it in the in-memory cache.
+
+    A Hypster created afterwards from the same function source reuses the restored analysis
+    instead of analyzing the source again.
+    """
+    analysis = _analysis_from_data(marshal.loads(data), inject_names, lazy_options)
+    key = (source_hash(analysis.source_code), inject_names, lazy_options)
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+    if cached is not None:
+        return cached
+    _remember(key, analysis)
+    return analysis
+
+
+def compile_module(source_code: str, filename: str) -> types.CodeType:
+    """
+    Compile the source code of a config module, using the on-disk cache like analyze_config.
+
+    Args:
+        source_code (str): The source code of the module.
+        filename (str): The file name shown in tracebacks.
+
+    Returns:
+        types.CodeType: The compiled module.
+    """
+    file_name = f"{source_hash(filename + chr(0) + source_code)}-module.bin"
+    code = _read_cache_file(file_name)
+    if isinstance(code, types.CodeType):
+        return code
+    code = compile(source_code, filename, "exec")
+    _write_cache_file(file_name, code)
+    return code
+
+
+def _remember(key: Tuple[str, bool, bool], analysis: ConfigAnalysis) -> None:
+    with _analysis_cache_lock:
+        _analysis_cache[key] = analysis
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > MAX_CACHED_ANALYSES:
+            _analysis_cache.popitem(last=False)
+
+
+def rewrite_config_function(
+    function_node: ast.FunctionDef, inject_names: bool = True, lazy_options: bool = False
+) -> List[HPCall]:
+    """
+    Rewrite a config function node in place the way analyze_config does, and collect its hp calls.
+
+    Decorators are dropped and line numbers are made relative to the function source.
+    """
+    function_node.decorator_list = []
+    ast.increment_lineno(function_node, 1 - function_node.lineno)
+
+    visitor = HPCallVisitor()
+    visitor.visit(function_node)
+    if inject_names:
+        # Inject into the call nodes found above instead of traversing the tree again
+        for node, hp_call in zip(visitor.call_nodes, visitor.hp_calls):
+            inject_name(node, hp_call)
+    if lazy_options:
+        LazyOptionsTransformer().visit(function_node)
+    return visitor.hp_calls
+
+
+def analyze_config(source_code: str, inject_names: bool = True, lazy_options: bool = False) -> ConfigAnalysis:
+    """
+    Analyze the source code of a config function in a single pass.
+
+    The source is parsed once. The config function is located, its hp calls are collected,
+    names are injected and lazy options are applied on the same tree, and its body is
+    compiled. The dependency graph is built when it is first needed.
+
+    Results are memoized in memory by source hash, and also registered under the source of
+    the function alone, so creating a Hypster from the function source found here does not
+    analyze it again. They are also stored on disk (see `get_cache_dir`), keyed by source hash,
+    so a new process loading the same source skips the analysis entirely.
+
+    Args:
+        source_code (str): Source code containing a single config function, e.g. a module,
+            a decorated function or the function itself.
+        inject_names (bool, optional): Whether to inject implicit names into hp calls. Defaults to True.
+        lazy_options (bool, optional): Whether to make dict-literal options lazy. Defaults to False.
+
+    Returns:
+        ConfigAnalysis: The analysis of the config function. Line numbers are relative to the
+            function source.
+
+    Raises:
+        ValueError: If the source does not contain exactly one config function.
+    """
+    key = (source_hash(source_code), inject_names, lazy_options)
+    with _analysis_cache_lock:
+        analysis = _analysis_cache.get(key)
+        if analysis is not None:
+            _analysis_cache.move_to_end(key)
+            return analysis
+
+    analysis = _read_disk_cache(key)
+    if analysis is not None:
+        logger.debug("Loaded config analysis from the disk cache")
+        _remember(key, analysis)
+        _remember((source_hash(analysis.source_code), inject_names, lazy_options), analysis)
+        return analysis
+
+    logger.info("Analyzing config source")
+    dedented_source = textwrap.dedent(source_code)
+    tree = ast.parse(dedented_source)
+    function_node = get_hp_function_node(tree)
+    function_source = ast.get_source_segment(dedented_source, function_node)
+    if function_source is None:
+        raise ValueError("No configuration function found in the module")
+
+    function_key = (source_hash(function_source), inject_names, lazy_options)
+    with _analysis_cache_lock:
+        analysis = _analysis_cache.get(function_key)
+    if analysis is not None:
+        # The same function was already analyzed from another source, e.g. before it was saved
+        _remember(key, analysis)
+        _write_disk_cache(key, analysis)
+        return analysis
+
+    hp_calls = rewrite_config_function(function_node, inject_names, lazy_options)
+    body = ast.Module(body=function_node.body, type_ignores=[])
+    analysis = ConfigAnalysis(
+        name=function_node.name,
+        source_code=function_source,
+        hp_calls=hp_calls,
+        code=compile(body, f"<hypster:{function_node.name}>", "exec"),
+        inject_names=inject_names,
+        lazy_options=lazy_options,
+        function_node=function_node,
+    )
+
+    _remember(key, analysis)
+    _remember(function_key, analysis)
+    _write_disk_cache(key, analysis)
+    if function_key != key:
+        _write_disk_cache(function_key, analysis)
+    return analysis
@@ -1,20 +1,33 @@
 import inspect
-from typing import Callable, Union, overload
+from typing import Callable, List, Optional, Union, overload
 
+from .ast_analyzer import analyze_config
 from .core import Hypster
 from .hp import HP
-from .utils import find_hp_function_body_and_name
+from .result_cache import ResultCache
+from .run_history import HistoryDatabase
 
 HPFunc = Callable[[HP], None]
 
 
-def create_hypster_instance(func: HPFunc, inject_names: bool) -> Hypster:
+def create_hypster_instance(
+    func: HPFunc,
+    inject_names: bool,
+    run_history: Optional[HistoryDatabase] = None,
+    lazy_options: bool = False,
+    result_cache: Optional[ResultCache] = None,
+    uncached_vars: List[str] = [],
+) -> Hypster:
     """
     Create a Hypster instance from a configuration function.
 
     Args:
         func (HPFunc): The configuration function.
         inject_names (bool): Whether to inject names into the source code.
+        run_history (Optional[HistoryDatabase]): Where runs are recorded. Defaults to a new `InMemoryHistory`.
+        lazy_options (bool): Whether to evaluate only the selected value of dict-literal options.
+        result_cache (Optional[ResultCache]): Where instantiated results are cached. Defaults to no caching.
+        uncached_vars (List[str]): Variables that are computed on every call instead of cached.
 
     Returns:
         Hypster: An instance of the Hypster class.
@@ -23,12 +36,19 @@ def create_hypster_instance(func: HPFunc, inject_names: bool) -> Hypster:
         ValueError: If no configuration function is found in the module.
     """
     source_code = inspect.getsource(func)
-    result = find_hp_function_body_and_name(source_code)
-    if result is None:
-        raise ValueError("No configuration function found in the module")
-    config_name, config_body = result
+    # The analysis is cached, so the Hypster instance below reuses it
+    analysis = analyze_config(source_code, inject_names, lazy_options)
     namespace = {"HP": HP}
-    return Hypster(config_name, config_body, namespace, inject_names=inject_names)
+    return Hypster(
+        analysis.name,
+        analysis.source_code,
+        namespace,
+        inject_names=inject_names,
+        run_history=run_history,
+        lazy_options=lazy_options,
+        result_cache=result_cache,
+        uncached_vars=uncached_vars,
+    )
 
 
 @overload
@@ -36,11 +56,24 @@ def config(func: HPFunc) -> Hypster: ...
 
 
 @overload
-def config(*, inject_names: bool = True) -> Callable[[HPFunc], Hypster]: ...
+def config(
+    *,
+    inject_names: bool = True,
+    run_history: Optional[HistoryDatabase] = None,
+    lazy_options: bool = False,
+    result_cache: Optional[ResultCache] = None,
+    uncached_vars: List[str] = [],
+) -> Callable[[HPFunc], Hypster]: ...
 
 
 def config(
-    func: Union[HPFunc, None] = None, *, inject_names: bool = True
+    func: Union[HPFunc, None] = None,
+    *,
+    inject_names: bool = True,
+    run_history: Optional[HistoryDatabase] = None,
+    lazy_options: bool = False,
+    result_cache: Optional[ResultCache] = None,
+    uncached_vars: List[str] = [],
 ) -> Union[Hypster, Callable[[HPFunc], Hypster]]:
     """
     Decorator to create a Hypster instance from a configuration function.
@@ -54,6 +87,17 @@ def config(
               Users should not pass this argument directly.
         inject_names (bool, optional): Whether to automatically infer and inject
             parameter names into the source code. Defaults to True.
+        run_history (Optional[HistoryDatabase], optional): Where runs are recorded,
+            e.g. a `BoundedHistory` for long-running processes. Defaults to a new
+            `InMemoryHistory` per configuration.
+        lazy_options (bool, optional): Whether to evaluate only the selected value of
+            dict-literal options in select and multi_select calls, e.g. to avoid loading
+            every model in `hp.select({"a": load_a(), "b": load_b()})`. Defaults to False.
+        result_cache (Optional[ResultCache], optional): Where instantiated results are cached
+            by the fingerprint of the configuration and values, e.g. a `ResultCache` with a
+            directory to reuse expensive artifacts across processes. Defaults to no caching.
+        uncached_vars (List[str], optional): Variables that are computed on every call instead
+            of cached, e.g. objects that cannot be pickled.
 
     Returns:
         Hypster: An instance of the Hypster class.
@@ -65,7 +109,7 @@ def config(
     """
 
     def decorator(func: HPFunc) -> Hypster:
-        return create_hypster_instance(func, inject_names)
+        return create_hypster_instance(func, inject_names, run_history, lazy_options, result_cache, uncached_vars)
 
     if func is None:
         return decorator
@@ -1,17 +1,26 @@
+import ast
 import logging
 import os
-import textwrap
+import threading
 import types
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Collection, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
 from .ast_analyzer import (
-    collect_hp_calls,
-    inject_names_to_source_code,
+    LAZY_OPTION_NAME,
+    DependencyGraph,
+    analyze_config,
+    compile_module,
+    dump_analysis,
+    restore_analysis,
 )
-from .hp import HP
-from .run_history import HistoryDatabase, InMemoryHistory
-from .utils import find_hp_function_body_and_name, remove_function_signature
+from .fingerprint import Snapshot, fingerprint
+from .grid import count_combinations, iter_grid
+from .hp import HP, TraceFunction
+from .parallel import map_in_pool
+from .result_cache import ResultCache, run_cached
+from .run_history import HistoryDatabase, InMemoryHistory, NestedHistoryRecord, ParameterRecord
+from .validators import LazyOption
 
 # Correct logging configuration
 # logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -19,7 +28,17 @@ logger = logging.getLogger(__name__)
 
 
 class Hypster:
-    def __init__(self, name, source_code: str, namespace: Dict[str, Any], inject_names: bool = True):
+    def __init__(
+        self,
+        name,
+        source_code: str,
+        namespace: Dict[str, Any],
+        inject_names: bool = True,
+        run_history: Optional[HistoryDatabase] = None,
+        lazy_options: bool = False,
+        result_cache: Optional[ResultCache] = None,
+        uncached_vars: List[str] = [],
+    ):
         """
         Initialize a Hypster instance.
 
@@ -28,42 +47,326 @@ class Hypster:
             source_code (str): The source code to be executed.
             namespace (Dict[str, Any]): The namespace for execution.
             inject_names (bool, optional): Whether to inject names into the source code. Defaults to True.
+            run_history (Optional[HistoryDatabase], optional): Where runs are recorded, e.g. a `BoundedHistory`
+                for long-running processes. Defaults to a new `InMemoryHistory`.
+            lazy_options (bool, optional): Whether to evaluate only the selected value of dict-literal
+                options in select and multi_select calls. Defaults to False.
+            result_cache (Optional[ResultCache], optional): Where instantiated results are cached by the
+                fingerprint of the configuration and values. Defaults to no caching.
+            uncached_vars (List[str], optional): Variables that are computed on every call instead of
+                cached, e.g. objects that cannot be pickled.
         """
         self.name = name
         self.source_code = source_code
         self.namespace = namespace
-        self.run_history: HistoryDatabase = InMemoryHistory()
-        self.hp_calls = collect_hp_calls(self.source_code)
+        self.run_history: HistoryDatabase = run_history if run_history is not None else InMemoryHistory()
+        self.inject_names = inject_names
+        self.lazy_options = lazy_options
+        self.result_cache = result_cache
+        self.uncached_vars = list(uncached_vars)
+        # (path, source) of the file the configuration was loaded from, used for pickling
+        self._module: Optional[Tuple[str, str]] = None
+        # The id of the last run recorded by each thread, see get_last_snapshot
+        self._thread_state = threading.local()
+        if lazy_options:
+            self.namespace = {**namespace, LAZY_OPTION_NAME: LazyOption}
+
+        # Parsing, name injection, compilation and dependency analysis are shared by all
+        # instances created from the same source
+        self._analysis = analyze_config(source_code, inject_names, lazy_options)
+        self.hp_calls = self._analysis.hp_calls
+        self._code = self._analysis.code
+        # Compiled slices of the body by requested final_vars, None where the whole body must run
+        self._sliced_code: Dict[FrozenSet[str], Optional[types.CodeType]] = self._analysis.sliced_code
+
+    def __reduce__(self):
+        """
+        Pickle the source and compiled form of the configuration, without its run history and result cache.
 
-        self.modified_source = (
-            inject_names_to_source_code(self.source_code, self.hp_calls) if inject_names else self.source_code
+        Configurations loaded from a file ship the source of the file, whose module is executed
+        again when unpickled. Otherwise the namespace is pickled, so its values must be picklable.
+        """
+        if self._module is not None:
+            namespace = None
+        else:
+            namespace = {k: v for k, v in self.namespace.items() if k not in ("__builtins__", LAZY_OPTION_NAME)}
+        analysis_data = dump_analysis(self._analysis)
+        return (
+            _restore_hypster,
+            (self.name, self.source_code, namespace, self._module, self.inject_names, self.lazy_options, analysis_data),
         )
 
+    @property
+    def _dependency_graph(self) -> Optional[DependencyGraph]:
+        return self._analysis.dependency_graph
+
+    @property
+    def modified_source(self) -> str:
+        """The source code of the configuration function after name injection and other rewrites"""
+        return self._analysis.modified_source
+
     def __call__(
         self,
         final_vars: List[str] = [],
         exclude_vars: List[str] = [],
         values: Dict[str, Any] = {},
         explore_mode: bool = False,
+        record_history: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Instantiate the configuration.
+
+        Args:
+            final_vars (List[str], optional): Variables to include in the result. Defaults to all variables.
+            exclude_vars (List[str], optional): Variables to exclude from the result.
+            values (Dict[str, Any], optional): Values that override the defaults of the hp calls.
+            explore_mode (bool, optional): Whether to fall back to previously used or first available values.
+            record_history (bool, optional): Whether to record this run in `run_history`. Set to False on
+                serving paths that never read snapshots to skip record creation entirely. Defaults to True.
+
+        Returns:
+            Dict[str, Any]: The instantiated config.
+        """
+        if self.result_cache is not None and not explore_mode:
+            return run_cached(self, self.result_cache, final_vars, exclude_vars, values, record_history)
+        run_id = uuid.uuid4() if record_history else None
+        return self._run(final_vars, exclude_vars, values, explore_mode, record_history, run_id)
+
+    def map(
+        self,
+        values_iter: Iterable[Dict[str, Any]],
+        workers: Optional[int] = None,
+        final_vars: List[str] = [],
+        exclude_vars: List[str] = [],
+        ordered: bool = True,
+        chunksize: int = 1,
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Instantiate the configuration for each dict of values in a pool of worker processes.
+
+        Results stream back as they complete, and the records of each run are added to
+        `run_history` as its result is yielded. The configuration and the values are pickled
+        to the workers and the results are pickled back, so they must be picklable.
+
+        Args:
+            values_iter (Iterable[Dict[str, Any]]): The values of each run.
+            workers (Optional[int], optional): The number of worker processes. Defaults to the number of CPUs.
+            final_vars (List[str], optional): Variables to include in the results. Defaults to all variables.
+            exclude_vars (List[str], optional): Variables to exclude from the results.
+            ordered (bool, optional): Whether to yield results in the order of `values_iter`, or as soon as
+                they complete. Defaults to True.
+            chunksize (int, optional): The number of runs sent to a worker at once. Larger chunks lower the
+                cost of inter-process communication for fast configs. Defaults to 1.
+
+        Yields:
+            Tuple[Dict[str, Any], Dict[str, Any]]: The instantiated config and the flattened snapshot of each run.
+        """
+        return map_in_pool(self, values_iter, workers, final_vars, exclude_vars, ordered, chunksize)
+
+    def iter_grid(
+        self, choices: Dict[str, Sequence[Any]] = {}, values: Dict[str, Any] = {}
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily enumerate every valid combination of select, multi_select and bool values.
+
+        Conditional parameters, e.g. those in only some branches of a select, are discovered by
+        running the configuration, so each combination only contains the parameters that exist
+        in it. Other parameters keep their defaults unless `choices` lists values for them.
+
+        Args:
+            choices (Dict[str, Sequence[Any]], optional): Values to enumerate for parameters by name,
+                e.g. `{"lr": [0.1, 0.01]}`. They override the choices of select, multi_select and
+                bool calls. Nested parameters use dot notation.
+            values (Dict[str, Any], optional): Values of parameters that are not enumerated.
+
+        Yields:
+            Dict[str, Any]: The values of each combination, to pass as `values` to the configuration.
+        """
+        return iter_grid(self, choices, values)
+
+    def count_combinations(
+        self, choices: Dict[str, Sequence[Any]] = {}, values: Dict[str, Any] = {}, continuous: bool = False
+    ) -> Union[int, float]:
+        """
+        Count the combinations of values of the configuration without enumerating them.
+
+        Counts the combinations that `iter_grid` yields for the same `choices` and `values`:
+        select, multi_select and bool calls count their choices, and other calls keep their
+        default. Parameters that cannot change which other parameters exist are multiplied
+        instead of enumerated, so spaces with billions of combinations are counted in a few
+        runs of the configuration.
+
+        Args:
+            choices (Dict[str, Sequence[Any]], optional): Values to count for parameters by name,
+                e.g. `{"lr": [0.1, 0.01]}`. Nested parameters use dot notation.
+            values (Dict[str, Any], optional): Values of parameters that are fixed.
+            continuous (bool, optional): If True, count the whole search space instead: int calls
+                with both `min` and `max` count every integer in between, and a number, text or
+                unbounded int call that is neither fixed nor given choices makes the count
+                `math.inf`. Defaults to False.
+
+        Returns:
+            Union[int, float]: The number of combinations.
+        """
+        return count_combinations(self, choices, values, continuous)
+
+    def sample(
+        self,
+        n: int,
+        method: str = "uniform",
+        seed: Optional[int] = None,
+        log: Collection[str] = (),
+        values: Dict[str, Any] = {},
+    ) -> List[Dict[str, Any]]:
+        """
+        Sample values for the number and int parameters that have both `min` and `max`.
+
+        Requires numpy (`pip install hypster[sampling]`). Other parameters keep their defaults
+        unless they are in `values`.
+
+        Args:
+            n (int): The number of value dicts.
+            method (str, optional): "uniform", "sobol" or "lhs" (Latin hypercube). Defaults to "uniform".
+            seed (Optional[int], optional): Seed of the random number generator. Defaults to None.
+            log (Collection[str], optional): Names of the parameters to sample log-uniformly.
+            values (Dict[str, Any], optional): Values of other parameters, added to every dict.
+
+        Returns:
+            List[Dict[str, Any]]: `n` dicts of values, to pass as `values` to the configuration,
+                e.g. with `batch` or `map`.
+        """
+        from .sampling import sample_values
+
+        return sample_values(self, n, method, seed, log, values)
+
+    def _run(
+        self,
+        final_vars: List[str],
+        exclude_vars: List[str],
+        values: Dict[str, Any],
+        explore_mode: bool,
+        record_history: bool,
+        run_id: Optional[uuid.UUID],
+        run_history: Optional[HistoryDatabase] = None,
+        trace: Optional[TraceFunction] = None,
+        run_records: Optional[List[Union[ParameterRecord, NestedHistoryRecord]]] = None,
     ) -> Dict[str, Any]:
+        """
+        Instantiate the configuration under the given run id.
+
+        Nested configurations are run under the run id of their parent, which links every
+        nested run to the parent run it belongs to, and record into a view of the parent's
+        history instead of their own `run_history`. `trace` is called before each hp call,
+        including the calls of nested configurations under their dotted names.
+
+        The records of the run are collected in the run's own list and added to the history
+        in one call once the run succeeds, so concurrent runs never interleave their records
+        and readers never see a partial run. Pass `run_records` to receive that list.
+        """
+        history = self.run_history if run_history is None else run_history
+        if record_history and run_records is None:
+            run_records = []
         hp = HP(
             final_vars,
             exclude_vars,
             values,
-            run_history=self.run_history,
-            run_id=uuid.uuid4(),
+            run_history=history,
+            run_id=run_id,
             explore_mode=explore_mode,
+            record_history=record_history,
+            pending_records=run_records,
+            trace=trace,
         )
-        result = self._execute_function(hp, self.modified_source)
+        result = self._execute_function(hp)
+        if run_records:
+            history.add_records(run_records)
+            if run_history is None:
+                self._thread_state.last_run_id = run_id
         return result
 
-    def _execute_function(self, hp: HP, modified_source: str) -> Dict[str, Any]:
+    def batch(
+        self,
+        values_list: Iterable[Dict[str, Any]],
+        final_vars: List[str] = [],
+        exclude_vars: List[str] = [],
+        record_history: bool = True,
+    ) -> List[Dict[str, Any]]:
         """
-        Execute the modified source code with the given HP instance.
+        Instantiate the configuration once for each dict of values.
+
+        Equivalent to calling the instance with each dict of values in turn, but the code for
+        `final_vars` is selected once, and the records of all runs are added to `run_history`
+        in a single batch at the end, e.g. in one transaction for a `SQLiteHistory`. If a run
+        raises, the runs that completed before it are still recorded.
+
+        Args:
+            values_list (Iterable[Dict[str, Any]]): The values of each run.
+            final_vars (List[str], optional): Variables to include in the results. Defaults to all variables.
+            exclude_vars (List[str], optional): Variables to exclude from the results.
+            record_history (bool, optional): Whether to record the runs in `run_history`. Defaults to True.
+
+        Returns:
+            List[Dict[str, Any]]: The instantiated config of each dict of values, in order.
+        """
+        code = self._get_code(final_vars)
+        results = []
+        records: List[Union[ParameterRecord, NestedHistoryRecord]] = []
+        try:
+            for values in values_list:
+                run_records = [] if record_history else None
+                hp = HP(
+                    final_vars,
+                    exclude_vars,
+                    values,
+                    run_history=self.run_history,
+                    run_id=uuid.uuid4() if record_history else None,
+                    record_history=record_history,
+                    pending_records=run_records,
+                )
+                results.append(self._execute_function(hp, code))
+                if record_history:
+                    records.extend(run_records)
+        finally:
+            if records:
+                self.run_history.add_records(records)
+                self._thread_state.last_run_id = records[-1].run_id
+        return results
+
+    def _get_code(self, final_vars: List[str]) -> types.CodeType:
+        """
+        Get the code to execute for the requested final_vars.
+
+        When final_vars are given, only the statements they depend on are executed. The whole
+        body is executed when no final_vars are given, when one of them refers to a nested
+        config or is not assigned in the body, and when the body cannot be analyzed.
+        """
+        if not final_vars or self._dependency_graph is None:
+            return self._code
+
+        key = frozenset(final_vars)
+        if key not in self._sliced_code:
+            self._sliced_code[key] = self._compile_slice(key)
+        code = self._sliced_code[key]
+        return self._code if code is None else code
+
+    def _compile_slice(self, final_vars: FrozenSet[str]) -> Optional[types.CodeType]:
+        if any("." in var for var in final_vars):
+            return None
+        indices = self._dependency_graph.slice(final_vars)
+        if indices is None or len(indices) == len(self._dependency_graph.statements):
+            return None
+        logger.debug("Slicing %s to statements %s for final_vars %s", self.name, indices, sorted(final_vars))
+        statements = [self._dependency_graph.statements[i] for i in indices]
+        return compile(ast.Module(body=statements, type_ignores=[]), f"<hypster:{self.name}>", "exec")
+
+    def _execute_function(self, hp: HP, code: Optional[types.CodeType] = None) -> Dict[str, Any]:
+        """
+        Execute the compiled function body with the given HP instance.
 
         Args:
             hp (HP): The HP instance for values management.
-            modified_source (str): The modified source code to execute.
+            code (Optional[types.CodeType], optional): The code to execute. Defaults to the code for
+                the final_vars of `hp`.
 
         Returns:
             Dict[str, Any]: The instantiated config.
@@ -73,13 +376,11 @@ class Hypster:
         exec_namespace = self.namespace.copy()
         exec_namespace["hp"] = hp
 
-        # Execute the modified function body in this namespace
-        body_wo_signature = remove_function_signature(modified_source)
-        function_body = textwrap.dedent(body_wo_signature)
-        exec(function_body, exec_namespace)
+        # Execute the precompiled function body, or the part of it final_vars depend on
+        exec(code if code is not None else self._get_code(hp.final_vars), exec_namespace)
 
         # Process and filter the results
-        return self._process_results(exec_namespace, hp.final_vars, hp.exclude_vars)
+        return self._process_results(exec_namespace, hp.final_vars, hp.exclude_vars, hp.nested_names)
 
     def find_nested_vars(self, vars: List[str], run_history: HistoryDatabase) -> List[str]:
         """Find variables that reference nested configurations.
@@ -105,7 +406,11 @@ class Hypster:
         return nested_vars
 
     def _process_results(
-        self, namespace: Dict[str, Any], final_vars: List[str], exclude_vars: List[str]
+        self,
+        namespace: Dict[str, Any],
+        final_vars: List[str],
+        exclude_vars: List[str],
+        nested_names: Set[str],
     ) -> Dict[str, Any]:
         """
         Process and filter the execution results.
@@ -114,6 +419,7 @@ class Hypster:
             namespace (Dict[str, Any]): The namespace after execution.
             final_vars (List[str]): List of variables to include in the final result.
             exclude_vars (List[str]): List of variables to exclude from the final result.
+            nested_names (Set[str]): Names of the nested configurations created during this run.
 
         Returns:
             Dict[str, Any]: The processed and filtered results.
@@ -128,7 +434,8 @@ class Hypster:
             if k != "hp" and not k.startswith("__") and not isinstance(v, (types.ModuleType, types.FunctionType, type))
         }
 
-        nested_vars = self.find_nested_vars(final_vars, self.run_history)
+        # Variables that reference nested configs (e.g. "nested.param") are handled by the nested call
+        nested_vars = [var for var in final_vars if var.split(".")[0] in nested_names]
         final_vars = [var for var in final_vars if var not in nested_vars]
 
         if not final_vars:
@@ -167,11 +474,45 @@ class Hypster:
             path = f"{self.name}.py"
         save(self, path)
 
-    def get_last_snapshot(self) -> Dict[str, Any]:
-        return self.run_history.get_latest_run_records(flattened=True)
+    def get_last_snapshot(self) -> Snapshot:
+        """
+        Get the values of the last run recorded by the calling thread.
 
-    def get_snapshots(self) -> List[Dict[str, Any]]:
-        return self.run_history.get_run_records(flattened=True)
+        Falls back to the latest run in `run_history` when this thread has not recorded a run,
+        e.g. for runs made by another thread or recorded by a previous process. The snapshot is
+        a dict with a `fingerprint` of the run, see `fingerprint`.
+        """
+        run_id = getattr(self._thread_state, "last_run_id", None)
+        if run_id is None:
+            values = self.run_history.get_latest_run_records(flattened=True)
+        else:
+            values = self.run_history.get_run_records(run_id, flattened=True)
+        return Snapshot(values, self)
+
+    def fingerprint(self, values: Dict[str, Any] = {}) -> str:
+        """
+        Hash the configuration together with the values it is instantiated with.
+
+        The hash covers the source code of the configuration and of the configs it nests by
+        path or by a variable of the namespace, and the values in a canonical form: nested dicts
+        of values are flattened to dot notation, the order of keys does not matter, and floats
+        are represented exactly. Objects in the namespace, such as imported classes, are not
+        covered. The fingerprint of the snapshot of a run, `get_last_snapshot().fingerprint`,
+        covers every value of the run, including defaults.
+
+        Args:
+            values (Dict[str, Any], optional): The values, as passed to the configuration.
+
+        Returns:
+            str: A hex digest that is stable across processes.
+
+        Raises:
+            TypeError: If a value is not a basic type, or a list, tuple, dict or set of those.
+        """
+        return fingerprint(self, values)
+
+    def get_snapshots(self) -> List[Snapshot]:
+        return [Snapshot(values, self) for values in self.run_history.get_run_records(flattened=True)]
 
 
 def save(hypster_instance: Hypster, path: Optional[str] = None):
@@ -199,12 +540,7 @@ def save(hypster_instance: Hypster, path: Optional[str] = None):
     if path is None:
         path = f"{hypster_instance.name}.py"
 
-    result = find_hp_function_body_and_name(hypster_instance.source_code)
-
-    if result is None:
-        raise ValueError("No configuration function found in the module")
-
-    func_name, hp_func_source = result
+    hp_func_source = hypster_instance._analysis.source_code
 
     modified_source = "from hypster import HP\n\n\n" + hp_func_source
     modified_source = modified_source.rstrip("\n")
@@ -215,16 +551,64 @@ def save(hypster_instance: Hypster, path: Optional[str] = None):
         os.makedirs(directory, exist_ok=True)
     with open(path, "w") as f:
         f.write(modified_source)
+    _forget_loaded(path)
 
     logger.info("Configuration saved to %s", path)
 
 
-def load(path: str, inject_names=True) -> Hypster:
+# Configs loaded from files, shared by the whole process: (path, inject_names, lazy_options)
+# -> (mtime in ns, size, Hypster)
+_loaded_configs: Dict[Tuple[str, bool, bool], Tuple[int, int, "Hypster"]] = {}
+
+
+def load_shared(path: Union[str, os.PathLike], inject_names: bool = True, lazy_options: bool = False) -> Hypster:
+    """
+    Load a configuration file once per process and return the same Hypster instance on later calls.
+
+    Instances are keyed by the resolved path and revalidated by the modification time and
+    size of the file, so a file that changed is loaded again. Like an imported module, the
+    module-level code of the file only runs when it is (re)loaded. `hp.nest` uses this for
+    configs given by path, since nested runs never record into the instance's own history.
+
+    Args:
+        path (Union[str, os.PathLike]): The file path to the Python module to be loaded.
+        inject_names (bool, optional): If True, injects names into the namespace. Defaults to True.
+        lazy_options (bool, optional): If True, only the selected value of dict-literal options is evaluated.
+            Defaults to False.
+
+    Returns:
+        Hypster: The shared instance of the configuration in the file.
+    """
+    resolved_path = os.path.realpath(path)
+    stat = os.stat(resolved_path)
+    key = (resolved_path, inject_names, lazy_options)
+    entry = _loaded_configs.get(key)
+    if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+        return entry[2]
+
+    hypster_instance = _load_module(resolved_path, inject_names, lazy_options)
+    _loaded_configs[key] = (stat.st_mtime_ns, stat.st_size, hypster_instance)
+    return hypster_instance
+
+
+def _forget_loaded(path: str) -> None:
+    resolved_path = os.path.realpath(path)
+    for key in [key for key in _loaded_configs if key[0] == resolved_path]:
+        _loaded_configs.pop(key, None)
+
+
+def load(path: str, inject_names=True, lazy_options=False) -> Hypster:
     """
     Loads a Python module from the specified file path, executes it, and retrieves a configuration function.
+
+    The module is executed once per process and revalidated by modification time and size
+    (see `load_shared`). Each call returns a new Hypster instance with its own run history.
+
     Args:
         path (str): The file path to the Python module to be loaded.
         inject_names (bool, optional): If True, injects names into the namespace. Defaults to True.
+        lazy_options (bool, optional): If True, only the selected value of dict-literal options is evaluated.
+            Defaults to False.
 
     Returns:
         Hypster: An instance of the Hypster class containing the configuration function and its context.
@@ -233,6 +617,16 @@ def load(path: str, inject_names=True) -> Hypster:
         ValueError: If no configuration function is found in the module or
                     if the function cannot be retrieved from the namespace.
     """
+    shared = load_shared(path, inject_names, lazy_options)
+    hypster_instance = Hypster(
+        shared.name, shared.source_code, shared.namespace, inject_names, lazy_options=lazy_options
+    )
+    hypster_instance._module = shared._module
+    return hypster_instance
+
+
+def _load_module(path: str, inject_names: bool, lazy_options: bool) -> Hypster:
+    """Read and execute a configuration file, and create a Hypster from its configuration function"""
     with open(path, "r") as f:
         module_source = f.read()
 
@@ -240,16 +634,11 @@ def load(path: str, inject_names=True) -> Hypster:
     namespace = {"HP": HP}
 
     # Execute the entire module
-    exec(module_source, namespace)
-
-    # Find the configuration function
-    result = find_hp_function_body_and_name(module_source)
-
-    if result is None:
-        raise ValueError("No configuration function found in the module")
+    exec(compile_module(module_source, path), namespace)
 
-    # Unpack the function name and body from the result
-    func_name, config_body = result
+    # Find and analyze the configuration function
+    analysis = analyze_config(module_source, inject_names, lazy_options)
+    func_name, config_body = analysis.name, analysis.source_code
 
     # Retrieve the function object from the namespace
     func = namespace.get(func_name)
@@ -257,4 +646,26 @@ def load(path: str, inject_names=True) -> Hypster:
     if func is None:
         raise ValueError(f"Could not find the function {func_name} in the loaded module")
 
-    return Hypster(func_name, config_body, namespace, inject_names)
+    hypster_instance = Hypster(func_name, config_body, namespace, inject_names, lazy_options=lazy_options)
+    hypster_instance._module = (path, module_source)
+    return hypster_instance
+
+
+def _restore_hypster(
+    name: str,
+    source_code: str,
+    namespace: Optional[Dict[str, Any]],
+    module: Optional[Tuple[str, str]],
+    inject_names: bool,
+    lazy_options: bool,
+    analysis_data: bytes,
+) -> Hypster:
+    """Recreate a pickled Hypster instance, reusing its compiled form instead of analyzing it again"""
+    restore_analysis(analysis_data, inject_names, lazy_options)
+    if module is not None:
+        path, module_source = module
+        namespace = {"HP": HP}
+        exec(compile_module(module_source, path), namespace)
+    hypster_instance = Hypster(name, source_code, namespace, inject_names, lazy_options=lazy_options)
+    hypster_instance._module = module
+    return hypster_instance
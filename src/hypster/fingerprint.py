@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+import numbers
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .core import Hypster
+
+logger = logging.getLogger(__name__)
+
+# Bump when a change to the canonical form changes the fingerprints of existing configs
+FINGERPRINT_VERSION = 1
+
+
+class Snapshot(dict):
+    """
+    The flattened values of a run, as returned by `Hypster.get_last_snapshot`.
+
+    A plain dict with a `fingerprint` of the configuration instantiated with these values,
+    which is the same as `config.fingerprint(snapshot)` and is computed when first accessed.
+    """
+
+    def __init__(
+        self, values: Dict[str, Any], config: Optional["Hypster"] = None, source_fingerprint: Optional[str] = None
+    ):
+        super().__init__(values)
+        self._config = config
+        self._source_fingerprint = source_fingerprint
+
+    @property
+    def fingerprint(self) -> str:
+        return combine_fingerprint(self._get_source_fingerprint(), self)
+
+    def _get_source_fingerprint(self) -> str:
+        if self._source_fingerprint is None:
+            self._source_fingerprint = source_fingerprint(self._config)
+        return self._source_fingerprint
+
+    def __reduce__(self):
+        # Pickle the fingerprint of the sources instead of the configuration
+        return (type(self), (dict(self), None, self._get_source_fingerprint()))
+
+
+def _encode_value(value: Any) -> Any:
+    """Encode values that json does not handle natively, or raise TypeError for values without a canonical form"""
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=canonical_json)
+    raise TypeError(f"Cannot fingerprint a value of type {type(value).__name__}: {value!r}")
+
+
+def canonical_json(value: Any) -> str:
+    """
+    Serialize a value deterministically: dict keys are sorted, floats use their shortest
+    round-trip representation, and ints, floats and bools stay distinct (`1`, `1.0`, `true`).
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_encode_value)
+
+
+def resolve_nested_configs(config: "Hypster") -> List[Tuple[Optional[str], "Hypster"]]:
+    """
+    Resolve the configs passed to hp.nest calls, by path or by a variable of the namespace.
+
+    Nested configs passed in any other way, e.g. from a dict of configs, cannot be resolved
+    without running the configuration and are left out.
+    """
+    from .core import Hypster, load_shared
+
+    nested = []
+    for target in config._analysis.nest_targets:
+        if target.path is not None:
+            try:
+                nested.append((target.name, load_shared(target.path)))
+            except OSError as e:
+                logger.debug(f"Cannot resolve nested config {target.path}: {e}")
+        elif isinstance(config.namespace.get(target.variable), Hypster):
+            nested.append((target.name, config.namespace[target.variable]))
+    return nested
+
+
+def source_fingerprint(config: "Hypster", _visiting: FrozenSet[int] = frozenset()) -> str:
+    """
+    Hash the source of a configuration together with the sources of the configs it nests.
+
+    Configs loaded from a file also hash the whole file, since its module-level code, e.g. a
+    constant read by the config function, can change the results without changing the function.
+    """
+    parts = [f"v{FINGERPRINT_VERSION}", config._analysis.source_hash]
+    if config._module is not None:
+        parts.append(hashlib.sha256(config._module[1].encode()).hexdigest())
+    visiting = _visiting | {id(config)}
+    for name, nested_config in resolve_nested_configs(config):
+        if id(nested_config) not in visiting:
+            parts.append(f"{name}={source_fingerprint(nested_config, visiting)}")
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def flatten_values(config: "Hypster", values: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten the dicts of values of nested configs into dot notation, e.g. {"model": {"lr": 1}} to {"model.lr": 1}"""
+    nest_names = {target.name for target in config._analysis.nest_targets}
+    if not any(key in nest_names and isinstance(value, dict) for key, value in values.items()):
+        return {f"{prefix}{key}": value for key, value in values.items()}
+
+    nested_configs = dict(resolve_nested_configs(config))
+    flattened = {}
+    for key, value in values.items():
+        if key not in nest_names or not isinstance(value, dict):
+            flattened[f"{prefix}{key}"] = value
+        elif key in nested_configs:
+            flattened.update(flatten_values(nested_configs[key], value, f"{prefix}{key}."))
+        else:
+            flattened.update({f"{prefix}{key}.{name}": nested_value for name, nested_value in value.items()})
+    return flattened
+
+
+def combine_fingerprint(source_fingerprint: str, values: Dict[str, Any]) -> str:
+    return hashlib.sha256(f"{source_fingerprint}\0{canonical_json(values)}".encode()).hexdigest()
+
+
+def fingerprint(config: "Hypster", values: Dict[str, Any]) -> str:
+    """
+    Hash a configuration together with the values it is instantiated with.
+
+    Args:
+        config (Hypster): The configuration.
+        values (Dict[str, Any]): The values, in dot notation or with dicts for nested configs.
+
+    Returns:
+        str: A hex digest that is stable across processes and Python versions.
+
+    Raises:
+        TypeError: If a value is not a basic type, list, tuple, dict or set of those.
+    """
+    return combine_fingerprint(source_fingerprint(config), flatten_values(config, values))
@@ -0,0 +1,239 @@
+import logging
+import math
+from itertools import chain, combinations
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .validators import (
+    BaseValidator,
+    BoolValidator,
+    IntValidator,
+    MultiBoolValidator,
+    MultiIntValidator,
+    MultiSelectValidator,
+    SelectValidator,
+)
+
+if TYPE_CHECKING:
+    from .core import Hypster
+
+logger = logging.getLogger(__name__)
+
+
+class _Branch(BaseException):
+    """
+    Stops a probe run at the first unassigned parameter that has choices.
+
+    Derives from BaseException so that `except Exception` blocks in the config body do not
+    swallow it.
+    """
+
+    def __init__(self, name: str, choices: Optional[Iterable[Any]]):
+        super().__init__(name)
+        self.name = name
+        self.choices = choices
+
+
+def get_choices(parameter_type: str, call: BaseValidator) -> Optional[Iterable[Any]]:
+    """
+    Get the values a grid enumerates for an hp call, or None for calls that keep their default.
+
+    Select calls take each of their options, multi_select calls every subset of their options
+    in option order, and bool calls True and False. The 2**n subsets of a multi_select are
+    generated lazily, as the grid reaches them.
+    """
+    if isinstance(call, MultiSelectValidator):
+        options = list(call.processed_options)
+        subsets = chain.from_iterable(combinations(options, size) for size in range(len(options) + 1))
+        return map(list, subsets)
+    if isinstance(call, SelectValidator):
+        return list(call.processed_options)
+    if isinstance(call, BoolValidator) and not isinstance(call, MultiBoolValidator):
+        return [True, False]
+    return None
+
+
+def _assign(assignment: Dict[str, Any], name: str, choices: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    for choice in choices:
+        yield {**assignment, name: choice}
+
+
+def iter_grid(
+    config: "Hypster", choices: Dict[str, Sequence[Any]] = {}, values: Dict[str, Any] = {}
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily enumerate every valid combination of values of a configuration.
+
+    The search space is discovered by running the configuration: each probe run is stopped at
+    the first hp call that is neither assigned nor fixed and has choices, and the enumeration
+    branches on those choices. Parameters that only exist in some branches of a select are
+    therefore found in exactly the branches they exist in. The enumeration is depth-first and
+    keeps one pending iterator per branching parameter, so memory grows with the number of
+    parameters, not with the number of combinations. Probe runs are not recorded.
+
+    Args:
+        config (Hypster): The configuration to enumerate.
+        choices (Dict[str, Sequence[Any]], optional): Values to enumerate for parameters by name,
+            e.g. a discretization of a number. They override the choices of select, multi_select
+            and bool calls. Nested parameters use dot notation.
+        values (Dict[str, Any], optional): Values of parameters that are not enumerated.
+
+    Yields:
+        Dict[str, Any]: The values of each combination, including `values`, to pass to the configuration.
+    """
+    stack: List[Iterator[Dict[str, Any]]] = [iter([dict(values)])]
+    while stack:
+        assignment = next(stack[-1], None)
+        if assignment is None:
+            stack.pop()
+            continue
+        branch = _probe(config, assignment, choices)
+        if branch is None:
+            yield assignment
+        else:
+            name, branch_choices = branch
+            logger.debug("Branching on %s", name)
+            stack.append(_assign(assignment, name, branch_choices))
+
+
+def _probe(
+    config: "Hypster", assignment: Dict[str, Any], choices: Dict[str, Sequence[Any]]
+) -> Optional[Tuple[str, Iterable[Any]]]:
+    """Run the configuration with an assignment, and return the parameter to branch on next, if any"""
+
+    def trace(name: str, parameter_type: str, call: Union[BaseValidator, "Hypster"]) -> None:
+        if name in assignment or parameter_type == "nest":
+            return
+        call_choices = choices[name] if name in choices else get_choices(parameter_type, call)
+        if call_choices is not None:
+            raise _Branch(name, call_choices)
+
+    try:
+        config._run([], [], assignment, explore_mode=False, record_history=False, run_id=None, trace=trace)
+    except _Branch as branch:
+        return branch.name, branch.choices
+    return None
+
+
+def count_choices(parameter_type: str, call: BaseValidator, continuous: bool = False) -> Union[int, float]:
+    """
+    Count the values that `get_choices` lists for an hp call, without listing them.
+
+    Calls without choices keep their default and count as 1. With `continuous`, they count
+    every integer of int calls with both bounds instead, and `math.inf` for any other call.
+    """
+    if isinstance(call, MultiSelectValidator):
+        return 2 ** len(call.processed_options)
+    if isinstance(call, SelectValidator):
+        return len(call.processed_options)
+    if isinstance(call, BoolValidator) and not isinstance(call, MultiBoolValidator):
+        return 2
+    if not continuous:
+        return 1
+    if _is_bounded_int(call):
+        return call.max_val - call.min_val + 1
+    return math.inf
+
+
+def _is_bounded_int(call: BaseValidator) -> bool:
+    return (
+        isinstance(call, IntValidator)
+        and not isinstance(call, MultiIntValidator)
+        and call.min_val is not None
+        and call.max_val is not None
+    )
+
+
+def count_combinations(
+    config: "Hypster", choices: Dict[str, Sequence[Any]] = {}, values: Dict[str, Any] = {}, continuous: bool = False
+) -> Union[int, float]:
+    """
+    Count the combinations of values of a configuration without enumerating them.
+
+    The count is computed over the tree of branches that `iter_grid` walks, but only
+    parameters that can change the structure of the search space are branched on: the
+    values of free parameters (see `find_free_parameters`) multiply the count of the branch
+    they are found in. Each branch costs one probe run of the configuration, so the time
+    grows with the number of conditional branches, not with the number of combinations.
+
+    By default the count is the number of combinations `iter_grid` yields for the same
+    `choices` and `values`: parameters without choices keep their default. With `continuous`,
+    it is the size of the whole search space instead.
+
+    Args:
+        config (Hypster): The configuration to count.
+        choices (Dict[str, Sequence[Any]], optional): Values to count for parameters by name,
+            as in `iter_grid`. Nested parameters use dot notation.
+        values (Dict[str, Any], optional): Values of parameters that are fixed.
+        continuous (bool, optional): If True, count every integer of int calls with both bounds,
+            and return `math.inf` if a parameter that is neither fixed nor given choices is
+            continuous (number, text, unbounded int, or any multi-value call other than
+            multi_select). Defaults to False.
+
+    Returns:
+        Union[int, float]: The number of combinations.
+    """
+    return _count_branch(config, dict(values), set(), choices, continuous)
+
+
+def _count_branch(
+    config: "Hypster",
+    assignment: Dict[str, Any],
+    counted: Set[str],
+    choices: Dict[str, Sequence[Any]],
+    continuous: bool,
+) -> Union[int, float]:
+    """Count the combinations below an assignment, excluding the free parameters counted above it"""
+    free = set(config._analysis.free_parameters)
+    counted = set(counted)
+    factors: List[Union[int, float]] = []
+
+    def trace(name: str, parameter_type: str, call: Union[BaseValidator, "Hypster"]) -> None:
+        if parameter_type == "nest":
+            # The parameters of a nested config are free if the nest call and the parameters are
+            if name in free:
+                free.update(f"{name}.{nested_name}" for nested_name in call._analysis.free_parameters)
+            return
+        if name in assignment or name in counted:
+            return
+        if name in free:
+            counted.add(name)
+            call_choices = choices.get(name)
+            factors.append(
+                len(call_choices) if call_choices is not None else count_choices(parameter_type, call, continuous)
+            )
+            if factors[-1] == 0:
+                raise _Branch(name, [])
+            if isinstance(call, SelectValidator) and call.default is None:
+                # Any value of a free parameter will do to run past it, but a select may have no default
+                raise _Branch(name, [call_choices[0] if call_choices else next(iter(call.processed_options))])
+            return
+        if name in choices:
+            raise _Branch(name, choices[name])
+        call_choices = get_choices(parameter_type, call)
+        if call_choices is None and not continuous:
+            return
+        if call_choices is None and _is_bounded_int(call):
+            call_choices = range(call.min_val, call.max_val + 1)
+        raise _Branch(name, call_choices)
+
+    try:
+        config._run([], [], assignment, explore_mode=False, record_history=False, run_id=None, trace=trace)
+        branch = None
+    except _Branch as e:
+        branch = e
+
+    # Avoid 0 * inf when a parameter has no choices at all
+    if 0 in factors:
+        return 0
+    count = math.prod(factors)
+    if branch is None:
+        return count
+    if branch.choices is None:
+        return math.inf
+
+    logger.debug("Counting the branches of %s", branch.name)
+    branch_count = sum(
+        _count_branch(config, {**assignment, branch.name: choice}, counted, choices, continuous)
+        for choice in branch.choices
+    )
+    return count * branch_count if branch_count else 0
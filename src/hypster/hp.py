@@ -1,26 +1,24 @@
 import logging
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Union
 from uuid import UUID
 
-from .hp_calls import (
-    BaseHPCall,
-    BasicType,
-    BoolInputCall,
-    IntInputCall,
-    MultiBoolCall,
-    MultiIntCall,
-    MultiNumberCall,
-    MultiSelectCall,
-    MultiTextCall,
-    NestedCall,
-    NumberInputCall,
-    NumericBounds,
-    NumericType,
-    SelectCall,
-    TextInputCall,
+from .hp_calls import BasicType, NestedCall, NumericType
+from .run_history import HistoryDatabase, NestedHistoryRecord, NestedHistoryView, ParameterRecord, ParameterSource
+from .validators import (
+    BaseValidator,
+    BoolValidator,
+    IntValidator,
+    MultiBoolValidator,
+    MultiIntValidator,
+    MultiNumberValidator,
+    MultiSelectValidator,
+    MultiTextValidator,
+    NumberValidator,
+    OptionsValidator,
+    SelectValidator,
+    TextValidator,
 )
-from .run_history import HistoryDatabase, NestedHistoryRecord, ParameterRecord, ParameterSource
 
 if TYPE_CHECKING:
     from .core import Hypster
@@ -28,6 +26,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 MAX_POTENTIAL_VALUES = 5
 
+# Called with the name and parameter type of each hp call, and its validator, or the nested config of nest calls
+TraceFunction = Callable[[str, str, Union[BaseValidator, "Hypster"]], None]
+
 
 class HP:
     def __init__(
@@ -36,8 +37,11 @@ class HP:
         exclude_vars: List[str],
         values: Dict[str, Any],
         run_history: HistoryDatabase,
-        run_id: UUID,
+        run_id: Optional[UUID],
         explore_mode: bool = False,
+        record_history: bool = True,
+        pending_records: Optional[List[Union[ParameterRecord, NestedHistoryRecord]]] = None,
+        trace: Optional[TraceFunction] = None,
     ):
         self.final_vars = final_vars
         self.exclude_vars = exclude_vars
@@ -45,6 +49,12 @@ class HP:
         self.run_history = run_history
         self.run_id = run_id
         self.explore_mode = explore_mode
+        self.record_history = record_history
+        # When given, records are collected here and added to run_history by the caller
+        self.pending_records = pending_records
+        # Called before each hp call runs, see TraceFunction
+        self.trace = trace
+        self.nested_names: Set[str] = set()
         self.source = ParameterSource.UI if explore_mode else ParameterSource.USER
         logger.info(f"Initialized HP with explore_mode: {explore_mode}")
 
@@ -56,9 +66,8 @@ class HP:
         default: Optional[BasicType] = None,
         options_only: bool = False,
     ) -> Any:
-        call = SelectCall(name=name, options=options, default=default, options_only=options_only)
-        options_keys = list(call.processed_options.keys())
-        return self._execute_call(call=call, parameter_type="select", options=options_keys)
+        call = SelectValidator(name, options, default, options_only)
+        return self._execute_call(call=call, parameter_type="select")
 
     def multi_select(
         self,
@@ -68,9 +77,8 @@ class HP:
         default: Optional[List[BasicType]] = [],
         options_only: bool = False,
     ) -> List[Any]:
-        call = MultiSelectCall(name=name, options=options, default=default, options_only=options_only)
-        options_keys = list(call.processed_options.keys())
-        return self._execute_call(call=call, parameter_type="multi_select", options=options_keys)
+        call = MultiSelectValidator(name, options, default, options_only)
+        return self._execute_call(call=call, parameter_type="multi_select")
 
     def number(
         self,
@@ -80,9 +88,8 @@ class HP:
         min: Optional[NumericType] = None,
         max: Optional[NumericType] = None,
     ) -> NumericType:
-        bounds = NumericBounds(min_val=min, max_val=max) if (min is not None or max is not None) else None
-        call = NumberInputCall(name=name, default=default, bounds=bounds)
-        return self._execute_call(call=call, parameter_type="number", numeric_bounds=bounds)
+        call = NumberValidator(name, default, min_val=min, max_val=max)
+        return self._execute_call(call=call, parameter_type="number")
 
     def multi_number(
         self,
@@ -92,9 +99,8 @@ class HP:
         min: Optional[NumericType] = None,
         max: Optional[NumericType] = None,
     ) -> List[NumericType]:
-        bounds = NumericBounds(min_val=min, max_val=max) if (min is not None or max is not None) else None
-        call = MultiNumberCall(name=name, default=default, bounds=bounds)
-        return self._execute_call(call=call, parameter_type="multi_number", numeric_bounds=bounds)
+        call = MultiNumberValidator(name, default, min_val=min, max_val=max)
+        return self._execute_call(call=call, parameter_type="multi_number")
 
     def int(
         self,
@@ -104,9 +110,8 @@ class HP:
         min: Optional[int] = None,
         max: Optional[int] = None,
     ) -> int:
-        bounds = NumericBounds(min_val=min, max_val=max) if (min is not None or max is not None) else None
-        call = IntInputCall(name=name, default=default, bounds=bounds)
-        return self._execute_call(call=call, parameter_type="int", numeric_bounds=bounds)
+        call = IntValidator(name, default, min_val=min, max_val=max)
+        return self._execute_call(call=call, parameter_type="int")
 
     def multi_int(
         self,
@@ -116,24 +121,23 @@ class HP:
         min: Optional[int] = None,
         max: Optional[int] = None,
     ) -> List[int]:
-        bounds = NumericBounds(min_val=min, max_val=max) if (min is not None or max is not None) else None
-        call = MultiIntCall(name=name, default=default, bounds=bounds)
-        return self._execute_call(call=call, parameter_type="multi_int", numeric_bounds=bounds)
+        call = MultiIntValidator(name, default, min_val=min, max_val=max)
+        return self._execute_call(call=call, parameter_type="multi_int")
 
     def text(self, default: str, *, name: Optional[str] = None) -> str:
-        call = TextInputCall(name=name, default=default)
+        call = TextValidator(name, default)
         return self._execute_call(call=call, parameter_type="text")
 
     def multi_text(self, default: List[str] = [], *, name: Optional[str] = None) -> List[str]:
-        call = MultiTextCall(name=name, default=default)
+        call = MultiTextValidator(name, default)
         return self._execute_call(call=call, parameter_type="multi_text")
 
     def bool(self, default: bool, *, name: Optional[str] = None) -> bool:
-        call = BoolInputCall(name=name, default=default)
+        call = BoolValidator(name, default)
         return self._execute_call(call=call, parameter_type="bool")
 
     def multi_bool(self, default: List[bool] = [], *, name: Optional[str] = None) -> List[bool]:
-        call = MultiBoolCall(name=name, default=default)
+        call = MultiBoolValidator(name, default)
         return self._execute_call(call=call, parameter_type="multi_bool")
 
     def nest(
@@ -146,11 +150,16 @@ class HP:
         values: Dict[str, Any] = {},
     ) -> Dict[str, Any]:
         if isinstance(config_func, (str, Path)):
-            from .core import load
+            from .core import load_shared
 
-            config_func = load(str(config_func))
+            # Loaded once per process and revalidated by modification time and size
+            config_func = load_shared(config_func)
 
         call = NestedCall(name=name)
+        if self.trace is not None:
+            self.trace(call.name, "nest", config_func)
+        # The nested run is recorded into a view of this history, not into the nested config's own
+        nested_history = NestedHistoryView(self.run_history, call.name) if self.record_history else None
         result = call.execute(
             config_func,
             final_vars=final_vars,
@@ -160,39 +169,68 @@ class HP:
             values=values,
             original_values=self.values,
             explore_mode=self.explore_mode,
-            run_history=self.run_history,
+            run_history=nested_history,
+            record_history=self.record_history,
+            run_id=self.run_id,
+            trace=self._nested_trace(call.name) if self.trace is not None else None,
         )
+        self.nested_names.add(call.name)
+
+        if not self.record_history:
+            return result
 
         record = NestedHistoryRecord(
             name=name,
             parameter_type="nest",
-            run_history=config_func.run_history,
+            run_history=nested_history,
             run_id=self.run_id,
             source=self.source,
         )
-        self.run_history.add_record(record)
+        self._add_record(record)
         return result
 
+    def _nested_trace(self, prefix: str) -> TraceFunction:
+        """Trace the hp calls of a nested config under their dotted names"""
+
+        def trace(name: str, parameter_type: str, call: Union[BaseValidator, "Hypster"]) -> None:
+            self.trace(f"{prefix}.{name}", parameter_type, call)
+
+        return trace
+
+    def _add_record(self, record: Union[ParameterRecord, NestedHistoryRecord]) -> None:
+        if self.pending_records is not None:
+            self.pending_records.append(record)
+        else:
+            self.run_history.add_record(record)
+
     def _execute_call(
         self,
-        call: BaseHPCall,
+        call: BaseValidator,
         parameter_type: str,
-        options: Optional[List[BasicType]] = None,
-        numeric_bounds: Optional[NumericBounds] = None,
     ) -> Any:
         """Execute HP call and record its result"""
         logger.debug(f"Added {parameter_type}Call: {call.name}")
+        if self.trace is not None:
+            self.trace(call.name, parameter_type, call)
+
+        if not self.record_history:
+            return call.execute(values=self.values, potential_values=[], explore_mode=self.explore_mode)
 
         potential_values = self._get_potential_values(call.name) if self.explore_mode else []
 
         result = call.execute(values=self.values, potential_values=potential_values, explore_mode=self.explore_mode)
 
-        if parameter_type in ("select", "multi_select"):
-            value = call.stored_value.value
-            is_reproducible = call.stored_value.reproducible
+        options = None
+        numeric_bounds = None
+        if isinstance(call, OptionsValidator):
+            value = call.stored_value
+            is_reproducible = call.reproducible
+            options = list(call.processed_options.keys())
         else:
             value = result
             is_reproducible = True
+            if isinstance(call, NumberValidator):
+                numeric_bounds = call.bounds
 
         record = ParameterRecord(
             name=call.name,
@@ -206,7 +244,7 @@ class HP:
             run_id=self.run_id,
             source=self.source,
         )
-        self.run_history.add_record(record)
+        self._add_record(record)
         return result
 
     def _get_potential_values(self, name: str) -> List[Any]:
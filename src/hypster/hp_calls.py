@@ -1,6 +1,8 @@
+import uuid
 from abc import abstractmethod
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+from uuid import UUID
 
 from pydantic import (
     BaseModel,
@@ -29,6 +31,12 @@ T = TypeVar("T", int, str, bool, NumericType)
 class HPCallError(ValueError):
     def __init__(self, name: str, message: str):
         super().__init__(f"{message} for '{name}'")
+        self.name = name
+        self.message = message
+
+    def __reduce__(self):
+        # Keep the error picklable, e.g. to raise it from a worker process
+        return (type(self), (self.name, self.message))
 
 
 class BaseHPCall(BaseModel):
@@ -301,8 +309,16 @@ class NestedCall(BaseModel):
         original_values: Dict[str, Any] = {},
         explore_mode: bool = False,
         run_history: Optional["HistoryDatabase"] = None,
+        record_history: bool = True,
+        run_id: Optional[UUID] = None,
+        trace: Optional[Callable] = None,
     ) -> Dict[str, Any]:
-        """Execute the nest call with nested configuration handling."""
+        """
+        Execute the nest call with nested configuration handling.
+
+        The nested run is recorded into `run_history` when it is given, and into the nested
+        config's own history otherwise.
+        """
         if len(original_final_vars) > 0:
             nested_final_vars = self._process_final_vars(original_final_vars)
         else:
@@ -316,19 +332,18 @@ class NestedCall(BaseModel):
         nested_values = values.copy()
         nested_values.update(self._extract_nested_dict(original_values))
 
-        # Extract and add historical records with prefix before executing
-        if run_history:
-            nested_records = run_history.get_param_records(self.name)
-            for record in nested_records.values():
-                for run_records in record.run_history.get_run_records().values():
-                    for nested_record in run_records.values():
-                        config_func.run_history.add_record(nested_record)
+        if record_history and run_id is None:
+            run_id = uuid.uuid4()
 
-        result = config_func(
+        result = config_func._run(
             final_vars=nested_final_vars,
             exclude_vars=nested_exclude_vars,
             values=nested_values,
             explore_mode=explore_mode,
+            record_history=record_history,
+            run_id=run_id,
+            run_history=run_history,
+            trace=trace,
         )
 
         return result
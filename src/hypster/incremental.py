@@ -0,0 +1,113 @@
+import logging
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union
+
+from .hp import HP
+from .result_cache import ExportedRecords, export_records, import_records
+from .run_history import NestedHistoryRecord, ParameterRecord
+
+if TYPE_CHECKING:
+    from .core import Hypster
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalRun:
+    """
+    Instantiate a configuration again after one of its parameters changed, re-running only
+    the statements affected by the change.
+
+    Each run executes the body statement by statement and keeps a checkpoint: the variables
+    the run left behind and the records of each statement. When a parameter changes, the
+    statement of its hp call, the statements that depend on it and the statements that bind
+    or mutate the same variables run again on top of the checkpoint. The other statements keep
+    their variables and records, e.g. a model loaded above the changed parameter is not loaded
+    again. Like slicing with final_vars, this relies on the dependency graph of the body, in
+    which mutating an object also binds every variable that may refer to it, e.g. `model` in
+    `trainer.fit()` after `trainer = Trainer(model)`, so the objects are created again first.
+
+    The whole body runs when there is no checkpoint, when the changed parameter is unknown,
+    and when the body cannot be analyzed. A run that raises discards the checkpoint.
+    """
+
+    def __init__(self, config: "Hypster", explore_mode: bool = True):
+        self.config = config
+        self.explore_mode = explore_mode
+        self._namespace: Optional[Dict[str, Any]] = None
+        # The records of each top-level statement in the last run, and the statement of each hp call
+        self._statement_records: List[ExportedRecords] = []
+        self._param_statements: Dict[str, int] = {}
+        # The statements executed by the last run, for inspection and tests
+        self.executed_statements: List[int] = []
+
+    def run(self, values: Dict[str, Any], changed: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Instantiate the configuration and record the run in its run history.
+
+        Args:
+            values (Dict[str, Any]): Values that override the defaults of the hp calls.
+            changed (Optional[str], optional): The name of the only top-level parameter whose value
+                changed since the last run. Defaults to running the whole body.
+
+        Returns:
+            Dict[str, Any]: The instantiated config.
+        """
+        statement_code = self.config._analysis.statement_code
+        if statement_code is None:
+            self.executed_statements = []
+            return self.config(values=values, explore_mode=self.explore_mode)
+
+        affected = self._affected_statements(changed)
+        if affected is None:
+            affected = set(range(len(statement_code)))
+            namespace = self.config.namespace.copy()
+        else:
+            namespace = self._reset_variables(affected)
+        self._namespace = None
+
+        run_id = uuid.uuid4()
+        history = self.config.run_history
+        records: List[Union[ParameterRecord, NestedHistoryRecord]] = []
+        statement_records: List[ExportedRecords] = []
+        param_statements = {name: index for name, index in self._param_statements.items() if index not in affected}
+        current_statement = 0
+
+        def trace(name: str, parameter_type: str, call: Any) -> None:
+            param_statements[name] = current_statement
+
+        hp = HP([], [], values, history, run_id, self.explore_mode, pending_records=records, trace=trace)
+        namespace["hp"] = hp
+        for current_statement, code in enumerate(statement_code):
+            if current_statement not in affected:
+                statement_records.append(self._statement_records[current_statement])
+                records.extend(import_records(self._statement_records[current_statement], history, run_id))
+                continue
+            start = len(records)
+            exec(code, namespace)
+            statement_records.append(export_records(records[start:], run_id))
+
+        if records:
+            history.add_records(records)
+            self.config._thread_state.last_run_id = run_id
+        self._namespace = namespace
+        self._statement_records = statement_records
+        self._param_statements = param_statements
+        self.executed_statements = sorted(affected)
+        logger.debug(f"Ran statements {self.executed_statements} of '{self.config.name}'")
+        return self.config._process_results(namespace, [], [], hp.nested_names)
+
+    def _affected_statements(self, changed: Optional[str]) -> Optional[Set[int]]:
+        if self._namespace is None or changed not in self._param_statements:
+            return None
+        return self.config._dependency_graph.affected(self._param_statements[changed])
+
+    def _reset_variables(self, affected: Set[int]) -> Dict[str, Any]:
+        """Copy the checkpoint without the variables that the affected statements bind or mutate"""
+        namespace = self._namespace.copy()
+        graph = self.config._dependency_graph
+        for name in set().union(*(graph.defs[index] for index in affected)):
+            if name in self.config.namespace:
+                namespace[name] = self.config.namespace[name]
+            else:
+                namespace.pop(name, None)
+        return namespace
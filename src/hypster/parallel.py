@@ -0,0 +1,104 @@
+import logging
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .run_history import InMemoryHistory, NestedHistoryRecord, ParameterRecord
+
+if TYPE_CHECKING:
+    from .core import Hypster
+
+logger = logging.getLogger(__name__)
+
+# Tasks submitted per worker ahead of the results that were consumed
+TASKS_PER_WORKER = 2
+
+# The configuration instantiated by this worker process, set once by _init_worker
+_worker_config: Optional["Hypster"] = None
+
+
+def _init_worker(config: "Hypster") -> None:
+    global _worker_config
+    _worker_config = config
+
+
+def _run_in_worker(
+    values_chunk: List[Dict[str, Any]], final_vars: List[str], exclude_vars: List[str]
+) -> List[Tuple[Dict[str, Any], Dict[str, Any], List[Union[ParameterRecord, NestedHistoryRecord]]]]:
+    config = _worker_config
+    outputs = []
+    for values in values_chunk:
+        # Each run records into a new history, so the worker's memory does not grow with the runs
+        config.run_history = InMemoryHistory()
+        result = config(final_vars=final_vars, exclude_vars=exclude_vars, values=values)
+        records = list(config.run_history.get_latest_run_records().values())
+        snapshot = config.run_history.get_latest_run_records(flattened=True)
+        outputs.append((result, snapshot, records))
+    return outputs
+
+
+def map_in_pool(
+    config: "Hypster",
+    values_iter: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    final_vars: List[str] = [],
+    exclude_vars: List[str] = [],
+    ordered: bool = True,
+    chunksize: int = 1,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Instantiate a configuration for each dict of values in a pool of worker processes.
+
+    The configuration is pickled once per worker. Values are submitted lazily, a few tasks per
+    worker ahead of the consumer, so `values_iter` can be a long or unbounded iterator. The
+    records of each run are added to the run history of `config` as its result is yielded.
+
+    Args:
+        config (Hypster): The configuration to instantiate.
+        values_iter (Iterable[Dict[str, Any]]): The values of each run.
+        workers (Optional[int], optional): The number of worker processes. Defaults to the number of CPUs.
+        final_vars (List[str], optional): Variables to include in the results. Defaults to all variables.
+        exclude_vars (List[str], optional): Variables to exclude from the results.
+        ordered (bool, optional): Whether to yield results in the order of `values_iter`, or as soon as
+            they complete. Defaults to True.
+        chunksize (int, optional): The number of runs sent to a worker at once. Larger chunks lower the
+            cost of inter-process communication for fast configs. Defaults to 1.
+
+    Yields:
+        Tuple[Dict[str, Any], Dict[str, Any]]: The instantiated config and the flattened snapshot of each run.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * TASKS_PER_WORKER
+    values_iter = iter(values_iter)
+    pending: Deque[Future] = deque()
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,))
+
+    def submit() -> None:
+        while len(pending) < max_pending:
+            values_chunk = list(islice(values_iter, chunksize))
+            if not values_chunk:
+                return
+            pending.append(executor.submit(_run_in_worker, values_chunk, final_vars, exclude_vars))
+
+    try:
+        submit()
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(iter(done))
+                pending.remove(future)
+            outputs = future.result()
+            submit()
+            for result, snapshot, records in outputs:
+                if records:
+                    config.run_history.add_records(records)
+                    config._thread_state.last_run_id = records[0].run_id
+                yield result, snapshot
+    finally:
+        # Stop quickly when the consumer stops early or a run raises
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,296 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Protocol, Tuple, Union
+
+from .fingerprint import canonical_json, fingerprint
+from .run_history import HistoryDatabase, InMemoryHistory, NestedHistoryRecord, NestedHistoryView, ParameterRecord
+
+if TYPE_CHECKING:
+    from .core import Hypster
+
+logger = logging.getLogger(__name__)
+
+# The records of a run without their run ids and histories: parameter records, and
+# (name, source, records) for the runs of nested configs
+ExportedRecords = List[Union[ParameterRecord, Tuple[str, Any, "ExportedRecords"]]]
+
+
+class Serializer(Protocol):
+    """Anything with pickle's `dumps` and `loads`, e.g. the `pickle` module itself or `cloudpickle`"""
+
+    def dumps(self, obj: Any) -> bytes: ...
+
+    def loads(self, data: bytes) -> Any: ...
+
+
+class ResultCache:
+    """
+    Cache of instantiated configurations, keyed by the fingerprint of the configuration and its values.
+
+    Results are kept in an in-memory LRU of `max_entries` entries, and, when `directory` is given,
+    also serialized to files in that directory, so other processes with the same configuration
+    and values reuse them. The least recently used files are deleted once they take more than
+    `max_bytes` bytes.
+
+    Results from the in-memory LRU are the same objects on every hit, so artifacts such as
+    tokenizers and indexes are built once and shared. Do not mutate them.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, os.PathLike]] = None,
+        max_entries: int = 128,
+        max_bytes: Optional[int] = None,
+        serializer: Serializer = pickle,
+    ):
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.directory = os.fspath(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.serializer = serializer
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], ExportedRecords]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], ExportedRecords]]:
+        """Return the cached result and records of the run for a key, or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        entry = self._read_file(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, result: Dict[str, Any], records: ExportedRecords) -> None:
+        """
+        Cache a result and the records of its run.
+
+        Raises:
+            Exception: Whatever the serializer raises if the result cannot be serialized. The
+                entry is not cached in that case.
+        """
+        data = self.serializer.dumps((result, records)) if self.directory is not None else None
+        self._remember(key, (result, records))
+        if data is not None:
+            self._write_file(key, data)
+
+    def clear(self) -> None:
+        """Remove every entry, in memory and on disk"""
+        with self._lock:
+            self._memory.clear()
+        for path, _, _ in self._list_files():
+            _remove(path)
+
+    def _remember(self, key: str, entry: Tuple[Dict[str, Any], ExportedRecords]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.result")
+
+    def _read_file(self, key: str) -> Optional[Tuple[Dict[str, Any], ExportedRecords]]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Reading refreshes the file, so eviction deletes the least recently used files first
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.debug(f"Ignoring unreadable result cache file {path}: {e}")
+            return None
+        try:
+            return self.serializer.loads(data)
+        except Exception as e:
+            logger.warning(f"Ignoring result cache file {path} that cannot be deserialized: {e}")
+            _remove(path)
+            return None
+
+    def _write_file(self, key: str, data: bytes) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug(f"Could not write result cache file for {key}: {e}")
+            return
+        if self.max_bytes is not None:
+            self._evict_files()
+
+    def _list_files(self) -> List[Tuple[str, float, int]]:
+        """The (path, access time, size) of every cached file"""
+        if self.directory is None:
+            return []
+        files = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".result"):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        files.append((entry.path, stat.st_mtime, stat.st_size))
+        except FileNotFoundError:
+            pass
+        return files
+
+    def _evict_files(self) -> None:
+        files = sorted(self._list_files(), key=lambda file: file[1])
+        total = sum(size for _, _, size in files)
+        for path, _, size in files:
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def cache_key(config: "Hypster", final_vars: List[str], exclude_vars: List[str], values: Dict[str, Any]) -> str:
+    """The key of a call: the fingerprint of the configuration and values, and the variables returned"""
+    variables = canonical_json([sorted(final_vars), sorted(exclude_vars)])
+    return hashlib.sha256(f"{fingerprint(config, values)}\0{variables}".encode()).hexdigest()
+
+
+def export_records(records: List[Union[ParameterRecord, NestedHistoryRecord]], run_id: uuid.UUID) -> ExportedRecords:
+    """Copy the records of a run, including the runs of nested configs, without their histories"""
+    exported: ExportedRecords = []
+    for record in records:
+        if isinstance(record, NestedHistoryRecord):
+            nested_records = list(record.run_history.get_run_records(run_id).values())
+            exported.append((record.name, record.source, export_records(nested_records, run_id)))
+        else:
+            exported.append(record)
+    return exported
+
+
+def import_records(
+    exported: ExportedRecords, history: HistoryDatabase, run_id: uuid.UUID
+) -> List[Union[ParameterRecord, NestedHistoryRecord]]:
+    """Recreate exported records under a new run id, recording nested runs into views of `history`"""
+    records: List[Union[ParameterRecord, NestedHistoryRecord]] = []
+    for record in exported:
+        if isinstance(record, ParameterRecord):
+            records.append(record.model_copy(update={"run_id": run_id}))
+            continue
+        name, source, nested_exported = record
+        nested_history = NestedHistoryView(history, name)
+        nested_history.add_records(import_records(nested_exported, nested_history, run_id))
+        records.append(
+            NestedHistoryRecord(
+                name=name, parameter_type="nest", run_history=nested_history, run_id=run_id, source=source
+            )
+        )
+    return records
+
+
+def run_cached(
+    config: "Hypster",
+    cache: ResultCache,
+    final_vars: List[str],
+    exclude_vars: List[str],
+    values: Dict[str, Any],
+    record_history: bool,
+) -> Dict[str, Any]:
+    """
+    Instantiate a configuration, or return its cached result for the same fingerprint.
+
+    Variables in `config.uncached_vars` are never cached: on a hit, they are computed by running
+    only the statements they depend on. Hits are recorded in the run history like any other run.
+    """
+    try:
+        key = cache_key(config, final_vars, exclude_vars, values)
+    except TypeError as e:
+        logger.debug(f"Not caching the result of '{config.name}': {e}")
+        return config._run(final_vars, exclude_vars, values, False, record_history, uuid.uuid4())
+
+    entry = cache.get(key)
+    if entry is None:
+        return _run_and_cache(config, cache, key, final_vars, exclude_vars, values, record_history)
+
+    cached_result, exported = entry
+    result = dict(cached_result)
+    uncached_vars = [
+        var
+        for var in config.uncached_vars
+        if (not final_vars or var in final_vars) and var not in exclude_vars and var not in result
+    ]
+    if uncached_vars:
+        result.update(config._run(uncached_vars, [], values, False, False, None))
+
+    if record_history:
+        run_id = uuid.uuid4()
+        config.run_history.add_records(import_records(exported, config.run_history, run_id))
+        config._thread_state.last_run_id = run_id
+    logger.debug(f"Result cache hit for '{config.name}'")
+    return result
+
+
+def _run_and_cache(
+    config: "Hypster",
+    cache: ResultCache,
+    key: str,
+    final_vars: List[str],
+    exclude_vars: List[str],
+    values: Dict[str, Any],
+    record_history: bool,
+) -> Dict[str, Any]:
+    run_id = uuid.uuid4()
+    run_records: List[Union[ParameterRecord, NestedHistoryRecord]] = []
+    # Without history, the records are still collected for later hits that record them
+    run_history = None if record_history else InMemoryHistory()
+    result = config._run(
+        final_vars, exclude_vars, values, False, True, run_id, run_history=run_history, run_records=run_records
+    )
+
+    cached_result = {k: v for k, v in result.items() if k not in config.uncached_vars}
+    try:
+        cache.put(key, cached_result, export_records(run_records, run_id))
+    except Exception as e:
+        unserializable = _find_unserializable(cache.serializer, cached_result)
+        logger.warning(
+            f"Not caching the result of '{config.name}': {unserializable or 'the result'} cannot be serialized "
+            f"({e}). Add such variables to uncached_vars to cache the rest of the result."
+        )
+    return result
+
+
+def _find_unserializable(serializer: Serializer, result: Dict[str, Any]) -> List[str]:
+    unserializable = []
+    for name, value in result.items():
+        try:
+            serializer.dumps(value)
+        except Exception:
+            unserializable.append(name)
+    return unserializable
@@ -1,7 +1,12 @@
+import functools
+import threading
+import time
 from abc import ABC, abstractmethod
 from collections import OrderedDict, defaultdict
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from itertools import groupby
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -49,6 +54,11 @@ class HistoryDatabase(ABC):
     def add_record(self, record: Union[ParameterRecord, NestedHistoryRecord]) -> None:
         pass
 
+    def add_records(self, records: List[Union[ParameterRecord, NestedHistoryRecord]]) -> None:
+        """Add several records at once, e.g. all records of a batch of runs"""
+        for record in records:
+            self.add_record(record)
+
     @abstractmethod
     def get_run_records(
         self, run_id: str, flattened: bool = False
@@ -69,79 +79,167 @@ class HistoryDatabase(ABC):
     def get_latest_param_record(self, param_name: str) -> Optional[Union[ParameterRecord, NestedHistoryRecord]]:
         pass
 
+    def remove_run(self, run_id: str) -> None:
+        """Remove a run, including the nested runs recorded under the same run id"""
+        raise NotImplementedError(f"{type(self).__name__} does not support removing runs")
 
-class InMemoryHistory(HistoryDatabase):
-    """In-memory implementation of parameter history storage"""
+    def check_reproducibility(self, record: ParameterRecord) -> None:
+        if isinstance(record.is_reproducible, bool):
+            if not record.is_reproducible:
+                print(
+                    f"Value {record.value} of parameter {record.name} was not originally of type: "
+                    "boolean, string, int or float type."
+                    "This means that putting this value in the config as-is will likely lead to an error."
+                )
+        elif isinstance(record.is_reproducible, List):
+            not_reproducible_values = []
+            for value, is_reproducible in zip(record.value, record.is_reproducible):
+                if not is_reproducible:
+                    not_reproducible_values.append(value)
+            if not_reproducible_values:
+                print(
+                    f"Values {not_reproducible_values} of parameter {record.name} were not originally of type: "
+                    "boolean, string, int or float type."
+                    "This means that putting these values in the config as-is will likely lead to an error."
+                )
 
-    def __init__(self):
-        self._records: Dict[str, OrderedDict[str, Union[ParameterRecord, NestedHistoryRecord]]] = defaultdict(
-            OrderedDict
-        )
-        self._run_ids: List[str] = []
 
-    def add_record(self, record: Union[ParameterRecord, NestedHistoryRecord]) -> None:
-        if record.run_id not in self._run_ids:
-            self._run_ids.append(record.run_id)
-        if record.run_id not in self._records:
-            self._records[record.run_id] = OrderedDict()
-        self._records[record.run_id][record.name] = record
+def synchronized(method: Callable) -> Callable:
+    """Run a method of a history while holding its lock"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
+
+class InMemoryHistory(HistoryDatabase):
+    """
+    In-memory implementation of parameter history storage.
+
+    Runs are kept in insertion order and every record is also indexed by parameter name,
+    so run membership checks and parameter lookups do not scan the whole history.
+    All methods hold a reentrant lock, so the history can be shared between threads.
+    """
+
+    def __init__(self, lock: Optional[threading.RLock] = None):
+        self._lock = lock if lock is not None else threading.RLock()
+        self._records: Dict[str, OrderedDict[str, Union[ParameterRecord, NestedHistoryRecord]]] = {}
+        # Insertion position of each run, used to keep the parameter index in run order
+        self._run_positions: Dict[str, int] = {}
+        self._next_position = 0
+        self._param_index: Dict[str, Dict[str, Union[ParameterRecord, NestedHistoryRecord]]] = defaultdict(dict)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks cannot be pickled, e.g. when records are sent back from a worker process
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @synchronized
+    def add_record(self, record: Union[ParameterRecord, NestedHistoryRecord]) -> None:
+        run_records = self._records.get(record.run_id)
+        if run_records is None:
+            run_records = self._records[record.run_id] = OrderedDict()
+            self._run_positions[record.run_id] = self._next_position
+            self._next_position += 1
+        run_records[record.name] = record
+        self._index_record(record)
+
+    @synchronized
+    def add_records(self, records: List[Union[ParameterRecord, NestedHistoryRecord]]) -> None:
+        # The records of a run are consecutive, so each run is looked up once
+        for run_id, run_group in groupby(records, key=attrgetter("run_id")):
+            run_records = self._records.get(run_id)
+            if run_records is not None:
+                for record in run_group:
+                    run_records[record.name] = record
+                    self._index_record(record)
+                continue
+
+            # A new run is the latest one, so its records go at the end of the parameter index
+            run_records = self._records[run_id] = OrderedDict()
+            self._run_positions[run_id] = self._next_position
+            self._next_position += 1
+            param_index = self._param_index
+            for record in run_group:
+                run_records[record.name] = record
+                param_index[record.name][run_id] = record
+
+    def _index_record(self, record: Union[ParameterRecord, NestedHistoryRecord]) -> None:
+        param_runs = self._param_index[record.name]
+        if record.run_id in param_runs or not param_runs:
+            param_runs[record.run_id] = record
+            return
+
+        last_run_id = next(reversed(param_runs))
+        param_runs[record.run_id] = record
+        if self._run_positions[last_run_id] > self._run_positions[record.run_id]:
+            # A record was added to an older run, restore run order (rare)
+            ordered = sorted(param_runs.items(), key=lambda item: self._run_positions[item[0]])
+            self._param_index[record.name] = dict(ordered)
+
+    @synchronized
     def get_run_records(self, run_id: Optional[str] = None, flattened: bool = False) -> List[Dict[str, Any]]:
-        if run_id is None:  # get all records
-            records = self._records
-        else:
+        if run_id is not None:
             records = self._records.get(run_id, {})
+            return self._flatten_records(records) if flattened else records
 
         if not flattened:
-            return records
+            # A copy, so callers can iterate it while other threads record runs
+            return dict(self._records)
         else:
             flattened_records = []
             for run_id, run_records in self._records.items():
                 flattened_records.append(self._flatten_records(run_records))
             return flattened_records
 
+    @synchronized
     def get_latest_run_records(self, flattened: bool = False) -> Dict[str, Any]:
-        if not self._run_ids:
+        if not self._records:
             return {}
-        run_id = self._run_ids[-1]
-        records = self._records.get(run_id, {})
+        records = self._records[next(reversed(self._records))]
         if not flattened:
             return records
         else:
             return self._flatten_records(records)
 
+    @synchronized
     def get_param_records(
         self, param_name: str, run_ids: Optional[List[str]] = None
     ) -> Dict[str, Union[ParameterRecord, NestedHistoryRecord]]:
+        param_runs = self._param_index.get(param_name, {})
         if run_ids is None:
-            run_ids = self._run_ids
-        return {run_id: self._records[run_id][param_name] for run_id in run_ids if param_name in self._records[run_id]}
+            return dict(param_runs)
+        return {run_id: param_runs[run_id] for run_id in run_ids if run_id in param_runs}
 
+    @synchronized
     def get_latest_param_record(self, param_name: str) -> Optional[Union[ParameterRecord, NestedHistoryRecord]]:
-        for run_id in reversed(self._run_ids):
-            if param_name in self._records[run_id]:
-                return self._records[run_id][param_name]
-        return None
-
-    def check_reproducibility(self, record: ParameterRecord) -> None:
-        if isinstance(record.is_reproducible, bool):
-            if not record.is_reproducible:
-                print(
-                    f"Value {record.value} of parameter {record.name} was not originally of type: "
-                    "boolean, string, int or float type."
-                    "This means that putting this value in the config as-is will likely lead to an error."
-                )
-        elif isinstance(record.is_reproducible, List):
-            not_reproducible_values = []
-            for value, is_reproducible in zip(record.value, record.is_reproducible):
-                if not is_reproducible:
-                    not_reproducible_values.append(value)
-            if not_reproducible_values:
-                print(
-                    f"Values {not_reproducible_values} of parameter {record.name} were not originally of type: "
-                    "boolean, string, int or float type."
-                    "This means that putting these values in the config as-is will likely lead to an error."
-                )
+        param_runs = self._param_index.get(param_name)
+        if not param_runs:
+            return None
+        return param_runs[next(reversed(param_runs))]
+
+    @synchronized
+    def remove_run(self, run_id: str) -> None:
+        run_records = self._records.pop(run_id, None)
+        if run_records is None:
+            return
+        self._run_positions.pop(run_id)
+
+        for name, record in run_records.items():
+            param_runs = self._param_index[name]
+            param_runs.pop(run_id, None)
+            if not param_runs:
+                del self._param_index[name]
+            if isinstance(record, NestedHistoryRecord):
+                record.run_history.remove_run(run_id)
 
     def _flatten_records(self, records: Dict[str, Union[ParameterRecord, NestedHistoryRecord]]) -> Dict[str, Any]:
         """Convert nested records to flat dictionary of values"""
@@ -151,6 +249,172 @@ class InMemoryHistory(HistoryDatabase):
                 flattened[name] = record.value
                 self.check_reproducibility(record)
             elif isinstance(record, NestedHistoryRecord):
-                nested_records = record.run_history.get_latest_run_records(flattened=True)
+                # Nested runs are recorded under the run id of their parent run
+                nested_records = self._flatten_records(record.run_history.get_run_records(record.run_id))
                 flattened.update({f"{name}.{k}": v for k, v in nested_records.items()})
         return flattened
+
+
+class NestedHistoryView(InMemoryHistory):
+    """
+    History of a config nested under the name `name`, as seen from the history of its parent.
+
+    Runs recorded through the view are kept in the view itself. Earlier runs are read through
+    the nested records of `parent`, so nesting a config never copies its history and the cost
+    of recording a nested run does not depend on how many runs came before it.
+    """
+
+    def __init__(self, parent: HistoryDatabase, name: str):
+        # Share the lock of an in-memory parent, since the view and the parent read each other
+        super().__init__(getattr(parent, "_lock", None))
+        self.parent = parent
+        self.name = name
+
+    def _nested_histories(self, run_ids: Optional[List[str]] = None) -> Dict[str, HistoryDatabase]:
+        """Histories of the runs recorded through the nested records of the parent"""
+        records = self.parent.get_param_records(self.name, run_ids)
+        return {
+            run_id: record.run_history
+            for run_id, record in records.items()
+            if isinstance(record, NestedHistoryRecord) and record.run_history is not self
+        }
+
+    @synchronized
+    def get_run_records(self, run_id: Optional[str] = None, flattened: bool = False) -> List[Dict[str, Any]]:
+        if run_id is not None:
+            if run_id in self._records:
+                records = self._records[run_id]
+            else:
+                nested_history = self._nested_histories([run_id]).get(run_id)
+                records = nested_history.get_run_records(run_id) if nested_history is not None else {}
+            return self._flatten_records(records) if flattened else records
+
+        records = {run_id: history.get_run_records(run_id) for run_id, history in self._nested_histories().items()}
+        records.update(self._records)
+        if not flattened:
+            return records
+        return [self._flatten_records(run_records) for run_records in records.values()]
+
+    @synchronized
+    def get_latest_run_records(self, flattened: bool = False) -> Dict[str, Any]:
+        if self._records:
+            return super().get_latest_run_records(flattened)
+        latest_record = self.parent.get_latest_param_record(self.name)
+        if not isinstance(latest_record, NestedHistoryRecord) or latest_record.run_history is self:
+            return {}
+        records = latest_record.run_history.get_run_records(latest_record.run_id)
+        return self._flatten_records(records) if flattened else records
+
+    @synchronized
+    def get_param_records(
+        self, param_name: str, run_ids: Optional[List[str]] = None
+    ) -> Dict[str, Union[ParameterRecord, NestedHistoryRecord]]:
+        param_records = {}
+        for run_id, history in self._nested_histories(run_ids).items():
+            record = history.get_run_records(run_id).get(param_name)
+            if record is not None:
+                param_records[run_id] = record
+        param_records.update(super().get_param_records(param_name, run_ids))
+        return param_records
+
+    @synchronized
+    def get_latest_param_record(self, param_name: str) -> Optional[Union[ParameterRecord, NestedHistoryRecord]]:
+        record = super().get_latest_param_record(param_name)
+        if record is not None:
+            return record
+        for run_id, history in reversed(self._nested_histories().items()):
+            record = history.get_run_records(run_id).get(param_name)
+            if record is not None:
+                return record
+        return None
+
+
+class BoundedHistory(InMemoryHistory):
+    """
+    In-memory history that keeps a bounded number of runs.
+
+    Runs are evicted once there are more than `max_runs` of them, or once they are older than
+    `max_age` seconds. With the "fifo" policy the oldest recorded run is evicted first and ages
+    count from when the run was recorded; with the "lru" policy the least recently used run is
+    evicted first and reading or extending a run refreshes it. Evicting a run also removes the
+    nested runs recorded under it.
+    """
+
+    POLICIES = ("fifo", "lru")
+
+    def __init__(self, max_runs: Optional[int] = None, max_age: Optional[float] = None, policy: str = "fifo"):
+        if max_runs is None and max_age is None:
+            raise ValueError("Either max_runs or max_age must be set")
+        if max_runs is not None and max_runs < 1:
+            raise ValueError("max_runs must be at least 1")
+        if max_age is not None and max_age <= 0:
+            raise ValueError("max_age must be positive")
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy must be one of {self.POLICIES}, got '{policy}'")
+
+        super().__init__()
+        self.max_runs = max_runs
+        self.max_age = max_age
+        self.policy = policy
+        # Eviction order: least recently recorded (fifo) or used (lru) run first, with its timestamp
+        self._eviction_order: OrderedDict[str, float] = OrderedDict()
+
+    @synchronized
+    def add_record(self, record: Union[ParameterRecord, NestedHistoryRecord]) -> None:
+        is_new_run = record.run_id not in self._records
+        super().add_record(record)
+        if is_new_run:
+            self._eviction_order[record.run_id] = time.monotonic()
+            self._evict()
+        else:
+            self._touch(record.run_id)
+
+    @synchronized
+    def add_records(self, records: List[Union[ParameterRecord, NestedHistoryRecord]]) -> None:
+        # Evict as the records of each run are added, like add_record
+        HistoryDatabase.add_records(self, records)
+
+    @synchronized
+    def get_run_records(self, run_id: Optional[str] = None, flattened: bool = False) -> List[Dict[str, Any]]:
+        self._evict()
+        if run_id is not None:
+            self._touch(run_id)
+        return super().get_run_records(run_id, flattened)
+
+    @synchronized
+    def get_latest_run_records(self, flattened: bool = False) -> Dict[str, Any]:
+        self._evict()
+        if self._records:
+            self._touch(next(reversed(self._records)))
+        return super().get_latest_run_records(flattened)
+
+    @synchronized
+    def get_param_records(
+        self, param_name: str, run_ids: Optional[List[str]] = None
+    ) -> Dict[str, Union[ParameterRecord, NestedHistoryRecord]]:
+        self._evict()
+        return super().get_param_records(param_name, run_ids)
+
+    @synchronized
+    def get_latest_param_record(self, param_name: str) -> Optional[Union[ParameterRecord, NestedHistoryRecord]]:
+        self._evict()
+        return super().get_latest_param_record(param_name)
+
+    @synchronized
+    def remove_run(self, run_id: str) -> None:
+        self._eviction_order.pop(run_id, None)
+        super().remove_run(run_id)
+
+    def _touch(self, run_id: str) -> None:
+        if self.policy == "lru" and run_id in self._eviction_order:
+            self._eviction_order[run_id] = time.monotonic()
+            self._eviction_order.move_to_end(run_id)
+
+    def _evict(self) -> None:
+        while self.max_runs is not None and len(self._eviction_order) > self.max_runs:
+            self.remove_run(next(iter(self._eviction_order)))
+
+        if self.max_age is not None:
+            cutoff = time.monotonic() - self.max_age
+            while self._eviction_order and next(iter(self._eviction_order.values())) < cutoff:
+                self.remove_run(next(iter(self._eviction_order)))
@@ -0,0 +1,222 @@
+import math
+from functools import lru_cache
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Callable, Collection, Dict, List, NamedTuple, Optional, Union
+
+from .validators import BaseValidator, IntValidator, MultiNumberValidator, NumberValidator
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("numpy is required for sampling. Please install with: `pip install hypster[sampling]`")
+
+if TYPE_CHECKING:
+    from .core import Hypster
+
+# Sobol points are generated with this many bits, which also bounds the number of points to 2**SOBOL_BITS
+SOBOL_BITS = 30
+
+# Primitive polynomials and initial direction numbers of Sobol dimensions 2 to 40, from
+# S. Joe and F. Y. Kuo, "Constructing Sobol sequences with better two-dimensional projections" (2008)
+SOBOL_DIRECTIONS = (
+    (3, (1,)),
+    (7, (1, 3)),
+    (11, (1, 3, 1)),
+    (13, (1, 1, 1)),
+    (19, (1, 1, 3, 3)),
+    (25, (1, 3, 5, 13)),
+    (37, (1, 1, 5, 5, 17)),
+    (41, (1, 1, 5, 5, 5)),
+    (47, (1, 1, 7, 11, 19)),
+    (55, (1, 1, 5, 1, 1)),
+    (59, (1, 1, 1, 3, 11)),
+    (61, (1, 3, 5, 5, 31)),
+    (67, (1, 3, 3, 9, 7, 49)),
+    (91, (1, 1, 1, 15, 21, 21)),
+    (97, (1, 3, 1, 13, 27, 49)),
+    (103, (1, 1, 1, 15, 7, 5)),
+    (109, (1, 3, 1, 15, 13, 25)),
+    (115, (1, 1, 5, 5, 19, 61)),
+    (131, (1, 3, 7, 11, 23, 15, 103)),
+    (137, (1, 3, 7, 13, 13, 15, 69)),
+    (143, (1, 1, 3, 13, 7, 35, 63)),
+    (145, (1, 3, 5, 9, 1, 25, 53)),
+    (157, (1, 3, 1, 13, 9, 35, 107)),
+    (167, (1, 3, 1, 5, 27, 61, 31)),
+    (171, (1, 1, 5, 11, 19, 41, 61)),
+    (185, (1, 3, 5, 3, 3, 13, 69)),
+    (191, (1, 1, 7, 13, 1, 19, 1)),
+    (193, (1, 3, 7, 5, 13, 19, 59)),
+    (203, (1, 1, 3, 9, 25, 29, 41)),
+    (211, (1, 3, 5, 13, 23, 1, 55)),
+    (213, (1, 3, 7, 3, 13, 59, 17)),
+    (229, (1, 3, 1, 3, 5, 53, 69)),
+    (239, (1, 1, 5, 5, 23, 33, 13)),
+    (241, (1, 1, 7, 7, 1, 61, 123)),
+    (247, (1, 1, 7, 9, 13, 61, 49)),
+    (253, (1, 3, 3, 5, 3, 55, 33)),
+    (285, (1, 3, 1, 15, 31, 13, 49, 245)),
+    (299, (1, 3, 5, 15, 31, 59, 63, 97)),
+    (301, (1, 3, 1, 11, 11, 11, 77, 249)),
+)
+MAX_SOBOL_DIMENSIONS = len(SOBOL_DIRECTIONS) + 1
+
+
+class NumericParameter(NamedTuple):
+    """A number or int call with both `min` and `max`, found by `find_numeric_parameters`"""
+
+    name: str
+    min_val: Union[int, float]
+    max_val: Union[int, float]
+    is_int: bool
+
+
+def uniform(n: int, d: int, rng: "np.random.Generator") -> "np.ndarray":
+    """Sample `n` independent points uniformly from the unit hypercube of dimension `d`"""
+    return rng.random((n, d))
+
+
+def latin_hypercube(n: int, d: int, rng: "np.random.Generator") -> "np.ndarray":
+    """
+    Sample `n` points from the unit hypercube, with exactly one point in each of the `n`
+    equal-width strata of every dimension.
+    """
+    strata = rng.permuted(np.tile(np.arange(n), (d, 1)), axis=1).T
+    return (strata + rng.random((n, d))) / n
+
+
+def sobol(n: int, d: int, rng: "np.random.Generator") -> "np.ndarray":
+    """
+    Generate the first `n` points of the Sobol sequence of dimension `d`, in Gray code order.
+
+    The points are scrambled with a random digital shift, which keeps their balance
+    properties: when `n` is a power of 2, each of the `n` equal-width strata of every
+    dimension contains exactly one point.
+    """
+    if d > MAX_SOBOL_DIMENSIONS:
+        raise ValueError(f"Sobol sampling supports up to {MAX_SOBOL_DIMENSIONS} parameters, got {d}")
+    if n > 2**SOBOL_BITS:
+        raise ValueError(f"Sobol sampling supports up to 2**{SOBOL_BITS} points, got {n}")
+
+    # Point i is point i - 1 with the direction numbers of the lowest set bit of i flipped
+    index = np.arange(1, n, dtype=np.uint64)
+    lowest_bit = np.log2(index & (~index + np.uint64(1))).astype(np.intp)
+    points = np.zeros((n, d), dtype=np.uint64)
+    np.bitwise_xor.accumulate(_sobol_direction_numbers(d)[lowest_bit], axis=0, out=points[1:])
+    points ^= rng.integers(0, 2**SOBOL_BITS, size=d, dtype=np.uint64)
+    return points / 2.0**SOBOL_BITS
+
+
+@lru_cache(maxsize=None)
+def _sobol_direction_numbers(d: int) -> "np.ndarray":
+    """The direction numbers of the first `d` dimensions, as an array of shape (SOBOL_BITS, d)"""
+    columns = [[1] * SOBOL_BITS]
+    for poly, initial in SOBOL_DIRECTIONS[: d - 1]:
+        degree = len(initial)
+        coefficients = (poly >> 1) & ((1 << (degree - 1)) - 1)
+        m = list(initial)
+        for k in range(degree, SOBOL_BITS):
+            value = m[k - degree] ^ (m[k - degree] << degree)
+            for j in range(1, degree):
+                if (coefficients >> (degree - 1 - j)) & 1:
+                    value ^= m[k - j] << j
+            m.append(value)
+        columns.append(m)
+    directions = [[value << (SOBOL_BITS - 1 - k) for k, value in enumerate(m)] for m in columns]
+    return np.array(directions, dtype=np.uint64).T
+
+
+SAMPLERS: Dict[str, Callable[[int, int, "np.random.Generator"], "np.ndarray"]] = {
+    "uniform": uniform,
+    "sobol": sobol,
+    "lhs": latin_hypercube,
+}
+
+
+def find_numeric_parameters(config: "Hypster", values: Dict[str, Any] = {}) -> List[NumericParameter]:
+    """
+    Find the number and int calls with both `min` and `max` that run with the given values.
+
+    The configuration is run once with `values` and the defaults of every other parameter.
+    The run is not recorded. Parameters in `values` are left out.
+    """
+    parameters: Dict[str, NumericParameter] = {}
+
+    def trace(name: str, parameter_type: str, call: Union[BaseValidator, "Hypster"]) -> None:
+        if (
+            isinstance(call, NumberValidator)
+            and not isinstance(call, MultiNumberValidator)
+            and call.min_val is not None
+            and call.max_val is not None
+            and name not in values
+        ):
+            parameters[name] = NumericParameter(name, call.min_val, call.max_val, isinstance(call, IntValidator))
+
+    config._run([], [], values, explore_mode=False, record_history=False, run_id=None, trace=trace)
+    return list(parameters.values())
+
+
+def sample_values(
+    config: "Hypster",
+    n: int,
+    method: str = "uniform",
+    seed: Optional[int] = None,
+    log: Collection[str] = (),
+    values: Dict[str, Any] = {},
+) -> List[Dict[str, Any]]:
+    """
+    Sample values for the bounded number and int parameters of a configuration.
+
+    Points are sampled from the unit hypercube in one vectorized call and mapped onto the
+    bounds of each parameter: uniformly, or log-uniformly for the parameters in `log`. Int
+    parameters take every integer from `min` to `max` with equal probability. Parameters
+    without both bounds, and other parameter types, keep their defaults unless they are in
+    `values`.
+
+    Args:
+        config (Hypster): The configuration to sample values for.
+        n (int): The number of value dicts.
+        method (str, optional): "uniform" for independent samples, "sobol" for a scrambled Sobol
+            sequence, or "lhs" for Latin hypercube sampling. Defaults to "uniform".
+        seed (Optional[int], optional): Seed of the random number generator. Defaults to None.
+        log (Collection[str], optional): Names of the parameters to sample on a log scale.
+        values (Dict[str, Any], optional): Values of other parameters, added to every dict.
+
+    Returns:
+        List[Dict[str, Any]]: `n` dicts of values, to pass as `values` to the configuration.
+
+    Raises:
+        ValueError: If the method is unknown, a name in `log` is not a sampled parameter, or a
+            parameter sampled on a log scale has a `min` that is not positive.
+    """
+    if method not in SAMPLERS:
+        raise ValueError(f"Unknown sampling method '{method}', expected one of {list(SAMPLERS)}")
+    parameters = find_numeric_parameters(config, values)
+    unknown = set(log) - {parameter.name for parameter in parameters}
+    if unknown:
+        raise ValueError(f"No number or int call with min and max to sample on a log scale: {sorted(unknown)}")
+
+    unit = SAMPLERS[method](n, len(parameters), np.random.default_rng(seed))
+    columns = [_scale(unit[:, i], parameter, parameter.name in log) for i, parameter in enumerate(parameters)]
+
+    # Fixed values are repeated as constant columns, so each dict is built in a single call
+    names = list(values) + [parameter.name for parameter in parameters]
+    constants = [repeat(value, n) for value in values.values()]
+    return [dict(zip(names, row)) for row in zip(*constants, *columns)] if names else [{} for _ in range(n)]
+
+
+def _scale(unit: "np.ndarray", parameter: NumericParameter, log: bool) -> List[Union[int, float]]:
+    """Map samples from [0, 1) onto the bounds of a parameter, as a list of Python numbers"""
+    low = parameter.min_val
+    # Ints are sampled from [min, max + 1) and rounded down
+    high = parameter.max_val + 1 if parameter.is_int else parameter.max_val
+    if log:
+        if low <= 0:
+            raise ValueError(f"Log-uniform sampling requires a positive min for '{parameter.name}', got {low}")
+        column = np.exp(math.log(low) + unit * (math.log(high) - math.log(low)))
+    else:
+        column = low + unit * (high - low)
+    if parameter.is_int:
+        return np.minimum(np.floor(column), parameter.max_val).astype(np.int64).tolist()
+    # Rounding can push values just outside the bounds
+    return np.clip(column, low, high).tolist()
@@ -0,0 +1,324 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from uuid import UUID
+
+from .run_history import HistoryDatabase, NestedHistoryRecord, ParameterRecord
+
+# Rows are stored with the dotted path of the nested config they belong to ("" for the top level,
+# "nested." / "outer.inner." for nested configs), so one table holds a config and all of its nested
+# configs and a flattened run is a single range query.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    run_seq INTEGER NOT NULL REFERENCES runs (seq),
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    parameter_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    data TEXT,
+    UNIQUE (run_seq, scope, name)
+);
+CREATE INDEX IF NOT EXISTS records_by_name ON records (scope, name, run_seq);
+CREATE INDEX IF NOT EXISTS records_by_scope ON records (scope, run_seq);
+"""
+
+INSERT_RUN = "INSERT OR IGNORE INTO runs (run_id, created_at) VALUES (?, ?)"
+UPSERT_RECORD = """
+INSERT INTO records (run_seq, scope, name, parameter_type, source, data)
+VALUES ((SELECT seq FROM runs WHERE run_id = ?), ?, ?, ?, ?, ?)
+ON CONFLICT (run_seq, scope, name) DO UPDATE SET
+    parameter_type = excluded.parameter_type, source = excluded.source, data = excluded.data
+"""
+RECORD_COLUMNS = "runs.run_id, records.scope, records.name, records.parameter_type, records.source, records.data"
+
+# SQLite limits the number of bound parameters per statement
+MAX_QUERY_PARAMS = 500
+
+Row = Tuple[str, str, str, str, str, Optional[str]]
+
+
+class _SQLiteStore:
+    """Connection, lock and write buffer shared by a SQLiteHistory and its nested views"""
+
+    def __init__(self, path: str, batch_size: int, timeout: float):
+        self.path = path
+        self.batch_size = batch_size
+        self.lock = threading.RLock()
+        self.pending: List[Row] = []
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def write(self, rows: List[Row]) -> None:
+        with self.lock:
+            self.pending.extend(rows)
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self.pending or self.connection is None:
+                return
+            rows, self.pending = self.pending, []
+            now = time.time()
+            new_runs = dict.fromkeys(row[0] for row in rows)
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.connection.executemany(INSERT_RUN, [(run_id, now) for run_id in new_runs])
+                self.connection.executemany(UPSERT_RECORD, rows)
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self.lock:
+            self.flush()
+            return self.connection.execute(sql, params).fetchall()
+
+    def execute_write(self, statements: List[Tuple[str, Tuple]]) -> None:
+        with self.lock:
+            self.flush()
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    self.connection.execute(sql, params)
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def close(self) -> None:
+        with self.lock:
+            if self.connection is None:
+                return
+            self.flush()
+            self.connection.close()
+            self.connection = None
+
+
+def _flush_at_exit(store_ref: "weakref.ref[_SQLiteStore]") -> None:
+    store = store_ref()
+    if store is not None:
+        store.close()
+
+
+class SQLiteHistory(HistoryDatabase):
+    """
+    Parameter history stored in a SQLite database.
+
+    The history survives process restarts and can be shared between processes on the same
+    machine: the database runs in WAL mode, so readers do not block the writer. Records are
+    buffered and written in batches of `batch_size`; the buffer is also flushed before every
+    read, on `flush()` and `close()`, and when the interpreter exits.
+
+    Nested configs are stored in the same database, so flattening a run and looking up the
+    records of a parameter are indexed queries regardless of how many runs are stored.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, timeout: float = 30.0):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._store = _SQLiteStore(str(path), batch_size, timeout)
+        self._scope = ""
+        atexit.register(_flush_at_exit, weakref.ref(self._store))
+
+    @classmethod
+    def _view(cls, store: _SQLiteStore, scope: str) -> "SQLiteHistory":
+        """History of a nested config, backed by the rows stored under `scope`"""
+        view = cls.__new__(cls)
+        view._store = store
+        view._scope = scope
+        return view
+
+    @property
+    def path(self) -> str:
+        return self._store.path
+
+    def flush(self) -> None:
+        """Write buffered records to the database"""
+        self._store.flush()
+
+    def close(self) -> None:
+        """Flush buffered records and close the connection"""
+        self._store.close()
+
+    def __enter__(self) -> "SQLiteHistory":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def add_record(self, record: Union[ParameterRecord, NestedHistoryRecord]) -> None:
+        self._store.write(list(self._record_rows(record, self._scope)))
+
+    def add_records(self, records: List[Union[ParameterRecord, NestedHistoryRecord]]) -> None:
+        self._store.write([row for record in records for row in self._record_rows(record, self._scope)])
+
+    def _record_rows(self, record: Union[ParameterRecord, NestedHistoryRecord], scope: str) -> Iterator[Row]:
+        run_id = str(record.run_id)
+        if isinstance(record, NestedHistoryRecord):
+            yield (run_id, scope, record.name, record.parameter_type, record.source.value, None)
+            # Nested runs are recorded under the run id of their parent run
+            nested_scope = f"{scope}{record.name}."
+            for nested_record in record.run_history.get_run_records(record.run_id).values():
+                yield from self._record_rows(nested_record, nested_scope)
+            return
+
+        data = {
+            "single_value": record.single_value,
+            "default": record.default,
+            "value": record.value,
+            "is_reproducible": record.is_reproducible,
+            "options": record.options,
+            "numeric_bounds": record.numeric_bounds.model_dump() if record.numeric_bounds else None,
+        }
+        yield (run_id, scope, record.name, record.parameter_type, record.source.value, json.dumps(data))
+
+    def _to_record(self, row: Row) -> Union[ParameterRecord, NestedHistoryRecord]:
+        run_id, scope, name, parameter_type, source, data = row
+        if data is None:
+            return NestedHistoryRecord(
+                name=name,
+                parameter_type=parameter_type,
+                run_id=run_id,
+                source=source,
+                run_history=self._view(self._store, f"{scope}{name}."),
+            )
+        return ParameterRecord(
+            name=name, parameter_type=parameter_type, run_id=run_id, source=source, **json.loads(data)
+        )
+
+    def _subtree_condition(self) -> Tuple[str, Tuple]:
+        """SQL condition matching the rows of this config and of all its nested configs"""
+        if not self._scope:
+            return "1", ()
+        # Scopes end with "." and "/" is the next character, so this is a prefix match on the index
+        return "records.scope >= ? AND records.scope < ?", (self._scope, self._scope[:-1] + "/")
+
+    def get_run_records(self, run_id: Optional[str] = None, flattened: bool = False) -> List[Dict[str, Any]]:
+        if flattened:
+            condition, params = self._subtree_condition()
+            if run_id is not None:
+                condition, params = f"{condition} AND runs.run_id = ?", (*params, str(run_id))
+            rows = self._store.query(
+                f"SELECT {RECORD_COLUMNS} FROM records JOIN runs ON runs.seq = records.run_seq "
+                f"WHERE {condition} ORDER BY records.run_seq, records.id",
+                params,
+            )
+            if run_id is not None:
+                return self._flatten_rows(rows)
+            runs: Dict[str, List[Row]] = {}
+            for row in rows:
+                runs.setdefault(row[0], []).append(row)
+            return [self._flatten_rows(run_rows) for run_rows in runs.values()]
+
+        if run_id is None:  # get all records
+            rows = self._store.query(
+                f"SELECT {RECORD_COLUMNS} FROM records JOIN runs ON runs.seq = records.run_seq "
+                "WHERE records.scope = ? ORDER BY records.run_seq, records.id",
+                (self._scope,),
+            )
+            records: Dict[UUID, OrderedDict] = {}
+            for row in rows:
+                record = self._to_record(row)
+                records.setdefault(record.run_id, OrderedDict())[record.name] = record
+            return records
+
+        rows = self._store.query(
+            f"SELECT {RECORD_COLUMNS} FROM records JOIN runs ON runs.seq = records.run_seq "
+            "WHERE runs.run_id = ? AND records.scope = ? ORDER BY records.id",
+            (str(run_id), self._scope),
+        )
+        return OrderedDict((row[2], self._to_record(row)) for row in rows)
+
+    def get_latest_run_records(self, flattened: bool = False) -> Dict[str, Any]:
+        latest = self._store.query(
+            "SELECT run_seq FROM records WHERE scope = ? ORDER BY run_seq DESC LIMIT 1", (self._scope,)
+        )
+        if not latest:
+            return {}
+        run_seq = latest[0][0]
+
+        if not flattened:
+            rows = self._store.query(
+                f"SELECT {RECORD_COLUMNS} FROM records JOIN runs ON runs.seq = records.run_seq "
+                "WHERE records.run_seq = ? AND records.scope = ? ORDER BY records.id",
+                (run_seq, self._scope),
+            )
+            return OrderedDict((row[2], self._to_record(row)) for row in rows)
+
+        condition, params = self._subtree_condition()
+        rows = self._store.query(
+            f"SELECT {RECORD_COLUMNS} FROM records JOIN runs ON runs.seq = records.run_seq "
+            f"WHERE records.run_seq = ? AND {condition} ORDER BY records.id",
+            (run_seq, *params),
+        )
+        return self._flatten_rows(rows)
+
+    def _flatten_rows(self, rows: List[Row]) -> Dict[str, Any]:
+        """Convert the rows of a run to a flat dictionary of dotted names and values"""
+        flattened = {}
+        prefix_length = len(self._scope)
+        for row in rows:
+            data = row[5]
+            if data is None:
+                continue
+            values = json.loads(data)
+            is_reproducible = values["is_reproducible"]
+            if is_reproducible is not True and not (isinstance(is_reproducible, list) and all(is_reproducible)):
+                self.check_reproducibility(self._to_record(row))
+            flattened[row[1][prefix_length:] + row[2]] = values["value"]
+        return flattened
+
+    def get_param_records(
+        self, param_name: str, run_ids: Optional[List[str]] = None
+    ) -> Dict[str, Union[ParameterRecord, NestedHistoryRecord]]:
+        query = (
+            f"SELECT {RECORD_COLUMNS} FROM records JOIN runs ON runs.seq = records.run_seq "
+            "WHERE records.scope = ? AND records.name = ?"
+        )
+        if run_ids is None:
+            rows = self._store.query(f"{query} ORDER BY records.run_seq", (self._scope, param_name))
+            return {record.run_id: record for record in map(self._to_record, rows)}
+
+        run_ids = [str(run_id) for run_id in run_ids]
+        found = {}
+        for i in range(0, len(run_ids), MAX_QUERY_PARAMS):
+            chunk = run_ids[i : i + MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._store.query(
+                f"{query} AND records.run_seq IN (SELECT seq FROM runs WHERE run_id IN ({placeholders}))",
+                (self._scope, param_name, *chunk),
+            )
+            found.update((row[0], row) for row in rows)
+        records = (self._to_record(found[run_id]) for run_id in run_ids if run_id in found)
+        return {record.run_id: record for record in records}
+
+    def get_latest_param_record(self, param_name: str) -> Optional[Union[ParameterRecord, NestedHistoryRecord]]:
+        rows = self._store.query(
+            f"SELECT {RECORD_COLUMNS} FROM records JOIN runs ON runs.seq = records.run_seq "
+            "WHERE records.scope = ? AND records.name = ? ORDER BY records.run_seq DESC LIMIT 1",
+            (self._scope, param_name),
+        )
+        return self._to_record(rows[0]) if rows else None
+
+    def remove_run(self, run_id: str) -> None:
+        condition, params = self._subtree_condition()
+        run_seq = "(SELECT seq FROM runs WHERE run_id = ?)"
+        statements = [(f"DELETE FROM records WHERE run_seq = {run_seq} AND {condition}", (str(run_id), *params))]
+        if not self._scope:
+            statements.append(("DELETE FROM runs WHERE run_id = ?", (str(run_id),)))
+        self._store.execute_write(statements)
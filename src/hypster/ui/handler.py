@@ -1,11 +1,14 @@
 import logging
-from collections import OrderedDict
-from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Generic, List, NamedTuple, Optional, TypeVar, Union
 
 from pydantic import BaseModel
 
 from ..core import Hypster
 from ..hp_calls import BasicType, NumericBounds
+from ..incremental import IncrementalRun
 from ..run_history import NestedHistoryRecord, ParameterRecord, ParameterSource
 
 logger = logging.getLogger(__name__)
@@ -80,6 +83,39 @@ class NestedComponent(ComponentBase):
     children: Dict[str, Union["NestedComponent", ComponentBase]]
 
 
+class ComponentDiff(NamedTuple):
+    """The components an update added, removed or changed, and the components after the update"""
+
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+    components: "OrderedDict[str, ComponentBase]"
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def merge_diffs(first: ComponentDiff, second: ComponentDiff) -> ComponentDiff:
+    """Combine the diffs of two consecutive updates into the diff of both"""
+    before = set(first.components).difference(first.added).union(first.removed)
+    after = second.components
+    touched = set(first.changed).union(second.changed, second.added)
+    added = [name for name in after if name not in before]
+    removed = [name for name in first.removed + second.removed if name in before and name not in after]
+    changed = [name for name in after if name in before and name in touched]
+    return ComponentDiff(added, removed, changed, after)
+
+
+class PendingUpdate(NamedTuple):
+    """A component change waiting for the background worker"""
+
+    component_id: str
+    new_value: Any
+    generation: int
+    future: Future
+
+
 class UIHandler:
     """Generic UI handler that manages component state and updates."""
 
@@ -103,15 +139,27 @@ class UIHandler:
         self.initial_values: Dict[str, Any] = initial_values or {}
         self.components: OrderedDict[str, ComponentBase] = OrderedDict()
         self.latest_results = None
+        # Bumped after each run, once latest_results is set, so readers can tell when results changed
+        self.results_version = 0
+        # Re-runs only the statements affected by a changed component
+        self._incremental_run = IncrementalRun(config_func, explore_mode=True)
+        # Updates submitted with submit_update run one at a time in a background thread
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending_updates: Deque[PendingUpdate] = deque()
+        self._generation = 0
+        # The diff of updates that finished after being superseded, delivered with the next update
+        self._undelivered_diff: Optional[ComponentDiff] = None
+        self._update_lock = threading.Lock()
         self._initialize_components()
 
     def _initialize_components(self) -> None:
         """Initialize components from initial config run."""
         try:
-            self.latest_results = self.config_func(values=self.initial_values, explore_mode=True)
+            self.latest_results = self._incremental_run.run(self.initial_values)
         except Exception as e:
             logger.error(f"Error running config: {e}")
             self.latest_results = None
+        self.results_version += 1
         latest_records = self.config_func.run_history.get_latest_run_records()
         self.components.clear()
 
@@ -184,30 +232,120 @@ class UIHandler:
         if component.parameter_type == "nest":
             self._remove_components(component.children, latest_records[component_id])
 
-    def update_components(self, component_id: str, new_value: Any) -> List[str]:
-        """Update component and get affected components."""
+    def update_components(self, component_id: str, new_value: Any) -> ComponentDiff:
+        """Update component and get the components that were added, removed or changed."""
         values = self._get_new_values_dict(self.components, component_id, new_value)
 
         logger.debug(f"Values: {values}")
 
         # Run config with new values and get latest records
         try:
-            self.latest_results = self.config_func(values=values, explore_mode=True)
+            self.latest_results = self._incremental_run.run(values, changed=component_id)
         except Exception as e:
             logger.warning(f"Error running config: {e}")
             self.latest_results = None
+        self.results_version += 1
         latest_records = self.config_func.run_history.get_latest_run_records()
 
-        # Update or create components after the changed component
-        affected_components = []
-        for name, record in latest_records.items():
-            logger.debug(f"Processing component {name}, with record {record}")
-            self.components[name] = self._create_component(name, record)
-            affected_components.append(name)
+        # Only components whose records changed are created again. The new components replace the
+        # old ones at once, so the UI thread never sees them half updated.
+        diff = self._diff_components(self.components, latest_records)
+        self.components = diff.components
+        logger.debug(f"Added: {diff.added}, removed: {diff.removed}, changed: {diff.changed}")
+        return diff
 
-        affected_values = {name: self.components[name].value for name in affected_components}
-        logger.debug(f"Affected components: {affected_values}")
-        return affected_components, affected_values
+    def _diff_components(
+        self,
+        components: "OrderedDict[str, ComponentBase]",
+        latest_records: Dict[str, Union[ParameterRecord, NestedHistoryRecord]],
+    ) -> ComponentDiff:
+        """Build the components of the latest records, reusing the existing components that did not change"""
+        new_components: OrderedDict[str, ComponentBase] = OrderedDict()
+        added, changed = [], []
+        for name, record in latest_records.items():
+            component = components.get(name)
+            if component is None:
+                new_components[name] = self._create_component(name, record)
+                added.append(name)
+            elif record.parameter_type == "nest" and isinstance(component, NestedComponent):
+                child_diff = self._diff_components(component.children, record.run_history.get_latest_run_records())
+                if child_diff.is_empty and list(child_diff.components) == list(component.children):
+                    new_components[name] = component
+                    continue
+                children = child_diff.components
+                value = {child_name: child.value for child_name, child in children.items()}
+                new_components[name] = NestedComponent(id=name, label=name, value=value, children=children)
+                changed.append(name)
+            elif self._matches_record(component, record):
+                new_components[name] = component
+            else:
+                new_components[name] = self._create_component(name, record)
+                changed.append(name)
+        removed = [name for name in components if name not in new_components]
+        return ComponentDiff(added, removed, changed, new_components)
+
+    def _matches_record(self, component: ComponentBase, record: Union[ParameterRecord, NestedHistoryRecord]) -> bool:
+        if isinstance(record, NestedHistoryRecord) or type(component) is not self.COMPONENT_MAPPING.get(
+            record.parameter_type
+        ):
+            return False
+        if component.value != record.value or component.single_value != record.single_value:
+            return False
+        if isinstance(component, SelectComponent):
+            return component.options == record.options
+        if isinstance(component, NumericComponentBase):
+            return component.bounds == record.numeric_bounds
+        return True
+
+    def submit_update(self, component_id: str, new_value: Any) -> Future:
+        """
+        Update components in a background thread, so the UI stays responsive while the config runs.
+
+        Updates run one at a time, in the order they were submitted. A change to the same component
+        as the last update still waiting replaces it, so scrubbing a slider only runs the config for
+        the latest value. The future resolves to the result of `update_components` for the latest
+        update only, and to None for updates superseded by a newer one, which the UI should ignore.
+        An update that is already running cannot be interrupted, so the components it added, removed
+        or changed are included in the diff of the next update that resolves.
+        """
+        future: Future = Future()
+        superseded = None
+        with self._update_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hypster-ui")
+            self._generation += 1
+            if self._pending_updates and self._pending_updates[-1].component_id == component_id:
+                superseded = self._pending_updates.pop()
+            self._pending_updates.append(PendingUpdate(component_id, new_value, self._generation, future))
+            if superseded is None:
+                self._executor.submit(self._run_next_update)
+        if superseded is not None:
+            superseded.future.set_result(None)
+        return future
+
+    def _run_next_update(self) -> None:
+        with self._update_lock:
+            update = self._pending_updates.popleft()
+        if not update.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.update_components(update.component_id, update.new_value)
+        except BaseException as e:
+            update.future.set_exception(e)
+            return
+        with self._update_lock:
+            is_latest = update.generation == self._generation
+            if self._undelivered_diff is not None:
+                result = merge_diffs(self._undelivered_diff, result)
+            self._undelivered_diff = None if is_latest else result
+        update.future.set_result(result if is_latest else None)
+
+    def close(self) -> None:
+        """Stop the background thread once the submitted updates are done"""
+        with self._update_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
     def get_ordered_components(self) -> List[ComponentBase]:
         """Get components in their definition order."""
@@ -1,8 +1,8 @@
 import asyncio
 import logging
-import time
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Optional, Union
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from ..core import Hypster
 
@@ -18,6 +18,7 @@ except ImportError:
 from .handler import (
     BooleanComponent,
     ComponentBase,
+    ComponentDiff,
     FloatComponent,
     IntComponent,
     NestedComponent,
@@ -29,6 +30,11 @@ from .handler import (
 
 logger = logging.getLogger(__name__)
 
+# Top-level parameters shown per page
+PAGE_SIZE = 50
+# Nested sections with more parameters than this start collapsed
+MAX_EXPANDED_PARAMETERS = 20
+
 
 class IPyComponent(ABC):
     """Base class for IPyWidgets UI components."""
@@ -314,6 +320,33 @@ class IPyMultiValueComponent(IPyComponent):
         self.widget.layout.height = f"{25 + (num_rows * 15)}px"
 
 
+def count_parameters(components: Dict[str, Union[ComponentBase, NestedComponent]]) -> int:
+    """Count the parameters of components, including the parameters of nested configurations."""
+    return sum(
+        count_parameters(component.children) if isinstance(component, NestedComponent) else 1
+        for component in components.values()
+    )
+
+
+def matches_filter(component: Union[ComponentBase, NestedComponent], query: str, prefix: str = "") -> bool:
+    """Check whether the dotted name of a component, or of one of its nested components, contains the query."""
+    name = f"{prefix}{component.id}"
+    if query in name.lower():
+        return True
+    if isinstance(component, NestedComponent):
+        return any(matches_filter(child, query, f"{name}.") for child in component.children.values())
+    return False
+
+
+def set_children(container: widgets.Box, children: List[widgets.Widget]) -> None:
+    """Set the children of a container, unless they are already the same widgets in the same order."""
+    # Assigning children re-renders the whole container in the frontend
+    if len(children) != len(container.children) or any(
+        new is not old for new, old in zip(children, container.children)
+    ):
+        container.children = children
+
+
 def create_ipy_component(component: Union[ComponentBase, NestedComponent], on_change: Callable) -> IPyComponent:
     """Create appropriate IPyComponent based on component type."""
     if isinstance(component, NestedComponent):
@@ -335,40 +368,30 @@ def create_ipy_component(component: Union[ComponentBase, NestedComponent], on_ch
 
 
 class IPynestComponent(IPyComponent):
-    """Widget for handling nested/nested configurations."""
+    """Collapsible section for nested configurations, whose child widgets are created when it is expanded."""
 
     def __init__(self, component: NestedComponent, on_change: Callable):
         self.child_components: Dict[str, IPyComponent] = {}
+        self.expanded = count_parameters(component.children) <= MAX_EXPANDED_PARAMETERS
         super().__init__(component, on_change)
 
     def _create_widget(self) -> widgets.Widget:
-        # Create a container with a border
-        container = widgets.VBox(
-            layout=widgets.Layout(
-                border="0.2px solid #ccc",
-                padding="10px",
-                margin="5px 0",
-                background_color="transparent",
-                width="auto",
-                min_width="300px",
-            )
+        self.body = widgets.VBox(layout=widgets.Layout(background_color="transparent"))
+        section = widgets.Accordion(
+            children=[self.body],
+            selected_index=0 if self.expanded else None,
+            layout=widgets.Layout(margin="5px 0", width="auto", min_width="300px"),
         )
+        section.set_title(0, self.component.label)
+        section.observe(self._handle_toggle, names="selected_index")
+        if self.expanded:
+            self._render_children()
+        return section
 
-        # Add label with larger font
-        label = widgets.HTML(
-            f"<span style='font-size: 1.2em; \
-                font-weight: bold; margin-bottom: 8px; display: block;'>{self.component.label}</span>"
-        )
-
-        # Create container for children
-        child_widgets = []
-        for name, child in self.component.children.items():
-            child_component = self._create_child_component(name, child)
-            self.child_components[name] = child_component
-            child_widgets.append(child_component.render())
-
-        container.children = [label] + child_widgets
-        return container
+    def _handle_toggle(self, change: Dict[str, Any]) -> None:
+        self.expanded = change["new"] is not None
+        if self.expanded:
+            self._render_children()
 
     def _create_child_component(self, name: str, child: Union[ComponentBase, NestedComponent]) -> IPyComponent:
         """Create a child component with nested path handling."""
@@ -379,29 +402,52 @@ class IPynestComponent(IPyComponent):
 
         return create_ipy_component(child, nested_change_handler)
 
-    def _update_widget(self) -> None:
-        # Preserve the label
-        existing_children = self.widget.children
-        label = existing_children[0]
-
+    def _render_children(self) -> None:
         child_widgets = []
         for name, child in self.component.children.items():
             if name not in self.child_components:
                 self.child_components[name] = self._create_child_component(name, child)
-            else:
+            elif self.child_components[name].component is not child:
+                # Children that did not change are the same objects as before
                 self.child_components[name].update(child)
             child_widgets.append(self.child_components[name].render())
+        set_children(self.body, child_widgets)
 
-        self.widget.children = [label] + child_widgets
+    def _update_widget(self) -> None:
+        for name in list(self.child_components):
+            child = self.component.children.get(name)
+            # Collapsed sections drop the widgets of changed children instead of updating them
+            if child is None or (not self.expanded and self.child_components[name].component is not child):
+                self.child_components.pop(name)
+        if self.expanded:
+            self._render_children()
 
 
 class IPyWidgetsUI:
-    """IPyWidgets-based UI implementation."""
+    """
+    IPyWidgets-based UI implementation.
+
+    Widgets are only created for the parameters on the current page, after filtering by name,
+    and for the nested sections that are expanded. Configs with more than `page_size`
+    parameters get a filter box and page buttons.
+    """
 
-    def __init__(self, ui_handler: UIHandler):
+    def __init__(self, ui_handler: UIHandler, page_size: int = PAGE_SIZE):
         self.ui_handler = ui_handler
         self.ui_components: Dict[str, IPyComponent] = {}
-        self.container = widgets.VBox([], layout=widgets.Layout(background_color="transparent"))
+        self.page_size = page_size
+        self.page = 0
+        self._visible_ids: List[str] = []
+        self.components_box = widgets.VBox([], layout=widgets.Layout(background_color="transparent"))
+        self.filter_text = widgets.Text(placeholder="Filter parameters", layout=widgets.Layout(width="300px"))
+        self.filter_text.observe(lambda change: self._set_page(0), names="value")
+        self.previous_button = widgets.Button(icon="chevron-left", layout=widgets.Layout(width="40px"))
+        self.previous_button.on_click(lambda button: self._set_page(self.page - 1))
+        self.next_button = widgets.Button(icon="chevron-right", layout=widgets.Layout(width="40px"))
+        self.next_button.on_click(lambda button: self._set_page(self.page + 1))
+        self.page_label = widgets.Label()
+        self.controls = widgets.HBox([self.filter_text, self.previous_button, self.page_label, self.next_button])
+        self.container = widgets.VBox([self.components_box], layout=widgets.Layout(background_color="transparent"))
         self._update_timer: Optional[asyncio.Future] = None
         self.update_delay = 0.1
         logger.debug("Initialized IPyWidgetsUI")
@@ -443,21 +489,71 @@ class IPyWidgetsUI:
             return
 
         logger.debug(f"Handling change for {component_id}: {new_value}")
-        # Unpack the tuple returned by update_components
-        affected_components, affected_values = self.ui_handler.update_components(component_id, new_value)
+        # The config runs in the handler's background thread, so the kernel stays responsive
+        future = self.ui_handler.submit_update(component_id, new_value)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside of an event loop, e.g. in scripts and tests, wait for the update
+            self._apply_update(future.result())
+            return
+        asyncio.ensure_future(self._apply_when_done(future))
+
+    async def _apply_when_done(self, future: Future) -> None:
+        try:
+            update = await asyncio.wrap_future(future)
+        except Exception as e:
+            logger.warning(f"Error updating components: {e}")
+            return
+        self._apply_update(update)
 
-        for comp_id in affected_components:
-            if comp_id in self.ui_components:
+    def _apply_update(self, diff: Optional[ComponentDiff]) -> None:
+        # Superseded updates resolve to None, their changes are part of the next diff
+        if diff is None:
+            return
+
+        # Only the widgets of removed and changed components are touched. Hidden widgets that changed
+        # are dropped and created again when they are shown, added widgets are created when shown.
+        for comp_id in diff.removed:
+            logger.debug(f"Removing UI component: {comp_id}")
+            self.ui_components.pop(comp_id, None)
+        for comp_id in diff.changed:
+            if comp_id not in self.ui_components:
+                continue
+            if comp_id in self._visible_ids:
                 logger.debug(f"Updating UI component: {comp_id}")
-                self.ui_components[comp_id].update(self.ui_handler.components[comp_id])
+                self.ui_components[comp_id].update(diff.components[comp_id])
             else:
+                self.ui_components.pop(comp_id)
+        self._render(diff.components)
+
+    def _set_page(self, page: int) -> None:
+        self.page = page
+        self._render(self.ui_handler.components)
+
+    def _render(self, components: Dict[str, Union[ComponentBase, NestedComponent]]) -> None:
+        """Show the components on the current page, creating the widgets that do not exist yet."""
+        query = self.filter_text.value.strip().lower()
+        matching_ids = [comp_id for comp_id, component in components.items() if matches_filter(component, query)]
+        num_pages = max(1, -(-len(matching_ids) // self.page_size))
+        self.page = min(max(self.page, 0), num_pages - 1)
+        start = self.page * self.page_size
+        self._visible_ids = matching_ids[start : start + self.page_size]
+
+        for comp_id in self._visible_ids:
+            if comp_id not in self.ui_components:
                 logger.debug(f"Creating new UI component: {comp_id}")
-                self.ui_components[comp_id] = self._create_ui_component(self.ui_handler.components[comp_id])
+                self.ui_components[comp_id] = self._create_ui_component(components[comp_id])
+        set_children(self.components_box, [self.ui_components[comp_id].render() for comp_id in self._visible_ids])
 
-        widgets_list = [
-            self.ui_components[comp_id].render() for comp_id in affected_components if comp_id in self.ui_components
-        ]
-        self.container.children = widgets_list
+        if matching_ids:
+            self.page_label.value = f"{start + 1}-{start + len(self._visible_ids)} of {len(matching_ids)}"
+        else:
+            self.page_label.value = "No matching parameters"
+        self.previous_button.disabled = self.page == 0
+        self.next_button.disabled = self.page == num_pages - 1
+        show_controls = bool(query) or count_parameters(components) > self.page_size
+        set_children(self.container, [self.controls, self.components_box] if show_controls else [self.components_box])
 
     def _create_ui_component(self, component: Union[ComponentBase, NestedComponent]) -> IPyComponent:
         return create_ipy_component(component, self._handle_change)
@@ -468,29 +564,19 @@ class IPyWidgetsUI:
             return
 
         logger.debug("Updating display")
-        ordered_components = self.ui_handler.get_ordered_components()
-        logger.debug(f"Ordered components: {[comp.id for comp in ordered_components]}")
+        components = self.ui_handler.components
+        logger.debug(f"Ordered components: {list(components)}")
 
-        if not ordered_components:
+        if not components:
             logger.warning("No components found in UI handler")
             return
 
-        current_component_ids = {comp.id for comp in ordered_components}
-
         for comp_id in list(self.ui_components.keys()):
-            if comp_id not in current_component_ids:
+            if comp_id not in components:
                 logger.debug(f"Removing obsolete component: {comp_id}")
                 self.ui_components.pop(comp_id)
 
-        widgets_list = []
-        for component in ordered_components:
-            logger.debug(f"Processing component: {component.id} ({component.parameter_type})")
-            if component.id not in self.ui_components:
-                logger.debug(f"Creating new UI component for: {component.id}")
-                self.ui_components[component.id] = self._create_ui_component(component)
-            widgets_list.append(self.ui_components[component.id].render())
-
-        self.container.children = widgets_list
+        self._render(components)
 
     def display(self) -> None:
         self._update_display()
@@ -502,26 +588,48 @@ class IPyWidgetsUI:
 
 
 class ResultsProxy(dict):
+    """
+    Dict of the latest results of the UI, refreshed when the handler completes a run.
+
+    Reads compare the handler's `results_version` with the version the proxy last read, so they
+    never run the config and only copy the results once per run. Runs that fail keep the
+    previous results.
+    """
+
     def __init__(self, initial_results, handler: UIHandler):
         self._handler = handler
-        self._last_update = None
+        self._version = handler.results_version
         self._cached_results = initial_results or {}
         super().__init__(self._cached_results)
 
     def _update_if_needed(self):
-        current_time = time.time()
-        if self._last_update is None or (current_time - self._last_update) > 0.1:
-            latest = self._handler.get_latest_results()
-            if latest is not None:
-                self._cached_results = latest
-                self._last_update = current_time
-                super().clear()
-                super().update(self._cached_results)
+        version = self._handler.results_version
+        if version == self._version:
+            return
+        # Read the version before the results, so results newer than the version are read again later
+        self._version = version
+        latest = self._handler.get_latest_results()
+        if latest is not None:
+            self._cached_results = latest
+            super().clear()
+            super().update(self._cached_results)
 
     def __getitem__(self, key):
         self._update_if_needed()
         return self._cached_results[key]
 
+    def __contains__(self, key):
+        self._update_if_needed()
+        return key in self._cached_results
+
+    def __iter__(self):
+        self._update_if_needed()
+        return iter(self._cached_results)
+
+    def __len__(self):
+        self._update_if_needed()
+        return len(self._cached_results)
+
     def get(self, key, default=None):
         self._update_if_needed()
         return self._cached_results.get(key, default)
@@ -547,10 +655,17 @@ class ResultsProxy(dict):
         return self._cached_results.values()
 
 
-def interactive_config(config_func: Hypster, initial_values: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Create an interactive config UI that automatically updates the results."""
+def interactive_config(
+    config_func: Hypster, initial_values: Optional[Dict[str, Any]] = None, page_size: int = PAGE_SIZE
+) -> Dict[str, Any]:
+    """
+    Create an interactive config UI that automatically updates the results.
+
+    Configs with more than `page_size` parameters are shown one page at a time, with a box to
+    filter parameters by name.
+    """
     handler = create_ui_handler(config_func=config_func, initial_values=initial_values)
-    ui = IPyWidgetsUI(ui_handler=handler)
+    ui = IPyWidgetsUI(ui_handler=handler, page_size=page_size)
 
     # Store the original results object
     results = handler.get_latest_results()
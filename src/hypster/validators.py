@@ -0,0 +1,367 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .hp_calls import BasicType, HPCallError, NumericBounds, NumericType
+
+BASIC_TYPES = (str, int, float, bool)
+
+
+def is_basic(value: Any) -> bool:
+    return isinstance(value, BASIC_TYPES)
+
+
+def is_strict_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_strict_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_strict_str(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def is_strict_bool(value: Any) -> bool:
+    return isinstance(value, bool)
+
+
+class LazyOption:
+    """
+    Option value that is only evaluated when it is selected.
+
+    Configs created with `lazy_options=True` wrap the values of dict-literal options in
+    `LazyOption`s, so that `hp.select` builds the selected option only.
+    """
+
+    __slots__ = ("thunk", "value", "evaluated")
+
+    def __init__(self, thunk: Callable[[], Any]):
+        self.thunk = thunk
+        self.value = None
+        self.evaluated = False
+
+    def __call__(self) -> Any:
+        if not self.evaluated:
+            self.value = self.thunk()
+            self.evaluated = True
+            self.thunk = None
+        return self.value
+
+
+class BaseValidator:
+    """
+    Plain-Python counterpart of `BaseHPCall`.
+
+    Validators check the arguments of an hp call when they are created and validate values
+    with the same `HPCallError` messages as the pydantic models in `hp_calls`, without
+    building a pydantic model for every call.
+    """
+
+    __slots__ = ("name",)
+
+    single_value = True
+
+    def __init__(self, name: Optional[str]):
+        if not isinstance(name, str):
+            raise HPCallError(str(name), "Expected a string name, please provide one explicitly")
+        self.name = name
+
+    def execute(self, values: Dict[str, Any], potential_values: List[Any], explore_mode: bool) -> Any:
+        """Execute the HP call."""
+        if self.name in values:
+            return self.process_value(values[self.name])
+
+        if explore_mode:
+            for value in potential_values:
+                try:
+                    return self.process_value(value)
+                except ValueError:
+                    continue
+
+        return self.get_fallback_value(explore_mode)
+
+    def process_value(self, value: Any) -> Any:
+        """Process and validate input value."""
+        raise NotImplementedError
+
+    def get_fallback_value(self, explore_mode: bool) -> Any:
+        """Get fallback value when no input is provided."""
+        raise NotImplementedError
+
+
+class OptionsValidator(BaseValidator):
+    """Plain-Python counterpart of `BaseOptionsHPCall`."""
+
+    __slots__ = ("processed_options", "options_only", "default", "stored_value", "reproducible")
+
+    def __init__(self, name: Optional[str], options: Any, default: Any, options_only: bool):
+        super().__init__(name)
+        self.processed_options = self._process_options(options)
+        self.options_only = options_only
+        self.default = self._validate_default(default)
+        self.stored_value = None
+        self.reproducible = None
+
+    def _process_options(self, options: Any) -> Dict[BasicType, Any]:
+        """Validate options and convert them to a dictionary if they are a list"""
+        if isinstance(options, dict):
+            if not all(is_basic(key) for key in options):
+                raise HPCallError(self.name, "Option keys must be of type str, int, float or bool")
+            return options
+        if isinstance(options, (list, tuple)):
+            if not all(is_basic(item) for item in options):
+                raise HPCallError(self.name, "Options must be of type str, int, float or bool")
+            return {item: item for item in options}
+        raise HPCallError(self.name, "Options must be a list or a dictionary")
+
+    def _validate_default(self, default: Any) -> Any:
+        raise NotImplementedError
+
+    def validate_and_transform_value(self, value: Any) -> Tuple[Any, bool]:
+        """Validate value and return transformed value with reproducibility flag"""
+        is_reproducible = isinstance(value, BASIC_TYPES)
+
+        if value in self.processed_options.keys() or value in self.processed_options.values():
+            option = self.processed_options[value]
+            if type(option) is LazyOption:
+                option = option()
+            return option, is_reproducible
+
+        if self.options_only:
+            raise HPCallError(self.name, f"Value '{value}' must be one of the options")
+
+        return value, is_reproducible
+
+    def get_fallback_value(self, explore_mode: bool) -> Any:
+        """Get fallback value when no input is provided"""
+        if self.default is not None:
+            return self.process_value(self.default)
+
+        if explore_mode:
+            value = next(iter(self.processed_options.keys()))
+            return self.process_value(value)
+        raise HPCallError(self.name, "No default or value defined")
+
+
+class SelectValidator(OptionsValidator):
+    """Plain-Python counterpart of `SelectCall`."""
+
+    __slots__ = ()
+
+    def _validate_default(self, default: Any) -> Optional[BasicType]:
+        if default is None:
+            return None
+        if not is_basic(default):
+            raise HPCallError(self.name, "Default value must be of type str, int, float or bool")
+        if default not in self.processed_options:
+            raise HPCallError(self.name, f"Default value '{default}' must be one of the options")
+        return default
+
+    def process_value(self, value: Any) -> Any:
+        if isinstance(value, list):
+            raise HPCallError(self.name, "Expected single value, got a list")
+
+        processed_value, is_reproducible = self.validate_and_transform_value(value)
+        self.stored_value = value if is_reproducible else str(value)
+        self.reproducible = is_reproducible
+        return processed_value
+
+
+class MultiSelectValidator(OptionsValidator):
+    """Plain-Python counterpart of `MultiSelectCall`."""
+
+    __slots__ = ()
+
+    single_value = False
+
+    def _validate_default(self, default: Any) -> List[BasicType]:
+        if isinstance(default, tuple):
+            default = list(default)
+        if not isinstance(default, list) or not all(is_basic(value) for value in default):
+            raise HPCallError(self.name, "Default value must be a list of str, int, float or bool")
+        for value in default:
+            if value not in self.processed_options:
+                raise HPCallError(self.name, f"Default value '{value}' must be one of the options")
+        return default
+
+    def process_value(self, value: Any) -> List[Any]:
+        if not isinstance(value, list):
+            raise HPCallError(self.name, "Expected a list of values, got a single value")
+
+        results = []
+        stored_values = []
+        reproducible = []
+
+        for item in value:
+            processed_value, is_reproducible = self.validate_and_transform_value(item)
+            results.append(processed_value)
+            stored_values.append(item if is_reproducible else str(item))
+            reproducible.append(is_reproducible)
+
+        self.stored_value = stored_values
+        self.reproducible = reproducible
+        return results
+
+
+class ValueValidator(BaseValidator):
+    """Plain-Python counterpart of `ValueHPCall`."""
+
+    __slots__ = ("default",)
+
+    type_description = ""
+
+    def __init__(self, name: Optional[str], default: Any):
+        super().__init__(name)
+        self.default = self._validate_default(default)
+
+    @staticmethod
+    def is_valid_default(value: Any) -> bool:
+        raise NotImplementedError
+
+    def _validate_default(self, default: Any) -> Any:
+        if self.single_value:
+            if not self.is_valid_default(default):
+                raise HPCallError(self.name, f"Default value must be {self.type_description}, got: {default}")
+            return default
+
+        if isinstance(default, tuple):
+            default = list(default)
+        if not isinstance(default, list) or not all(self.is_valid_default(value) for value in default):
+            raise HPCallError(self.name, f"Default value must be a list of {self.type_description}, got: {default}")
+        return default
+
+    def validate_single_value(self, value: Any) -> None:
+        raise NotImplementedError
+
+    def process_value(self, value: Any) -> Any:
+        if self.single_value:
+            if isinstance(value, list):
+                raise HPCallError(self.name, "Expected single value, got a list")
+            self.validate_single_value(value)
+            return value
+
+        if not isinstance(value, list):
+            raise HPCallError(self.name, "Expected a list of values, got a single value")
+        for v in value:
+            self.validate_single_value(v)
+        return value
+
+    def get_fallback_value(self, explore_mode: bool) -> Any:
+        return self.process_value(self.default)
+
+
+class NumberValidator(ValueValidator):
+    """Plain-Python counterpart of `NumberInputCall`."""
+
+    __slots__ = ("min_val", "max_val")
+
+    type_description = "a number"
+    is_valid_default = staticmethod(is_strict_number)
+    allow_float = True
+
+    def __init__(
+        self,
+        name: Optional[str],
+        default: Any,
+        min_val: Optional[NumericType] = None,
+        max_val: Optional[NumericType] = None,
+    ):
+        super().__init__(name, default)
+        for bound in (min_val, max_val):
+            if bound is not None and not is_strict_number(bound):
+                raise HPCallError(self.name, f"Bounds must be numbers, got: {bound}")
+        if min_val is not None and max_val is not None and max_val < min_val:
+            raise HPCallError(self.name, "max_val must be greater than min_val")
+        self.min_val = min_val
+        self.max_val = max_val
+
+    @property
+    def bounds(self) -> Optional[NumericBounds]:
+        """The bounds as the public `NumericBounds` model, or None if no bounds were given."""
+        if self.min_val is None and self.max_val is None:
+            return None
+        return NumericBounds(min_val=self.min_val, max_val=self.max_val)
+
+    def validate_single_value(self, value: Any) -> None:
+        if not isinstance(value, (int, float)):
+            raise HPCallError(self.name, f"Expected a number, got a non-number value: {value}")
+
+        if not self.allow_float and isinstance(value, float):
+            raise HPCallError(self.name, f"Float values are not allowed: {value}")
+
+        if self.min_val is not None and value < self.min_val:
+            raise HPCallError(self.name, f"Value must be >= {self.min_val}")
+        if self.max_val is not None and value > self.max_val:
+            raise HPCallError(self.name, f"Value must be <= {self.max_val}")
+
+
+class MultiNumberValidator(NumberValidator):
+    """Plain-Python counterpart of `MultiNumberCall`."""
+
+    __slots__ = ()
+
+    single_value = False
+    type_description = "numbers"
+
+
+class IntValidator(NumberValidator):
+    """Plain-Python counterpart of `IntInputCall`."""
+
+    __slots__ = ()
+
+    type_description = "an integer"
+    is_valid_default = staticmethod(is_strict_int)
+    allow_float = False
+
+
+class MultiIntValidator(IntValidator):
+    """Plain-Python counterpart of `MultiIntCall`."""
+
+    __slots__ = ()
+
+    single_value = False
+    type_description = "integers"
+
+
+class TextValidator(ValueValidator):
+    """Plain-Python counterpart of `TextInputCall`."""
+
+    __slots__ = ()
+
+    type_description = "a string"
+    is_valid_default = staticmethod(is_strict_str)
+
+    def validate_single_value(self, value: Any) -> None:
+        if not isinstance(value, str):
+            raise HPCallError(self.name, f"Expected a string, got a non-string value: {value}")
+
+
+class MultiTextValidator(TextValidator):
+    """Plain-Python counterpart of `MultiTextCall`."""
+
+    __slots__ = ()
+
+    single_value = False
+    type_description = "strings"
+
+
+class BoolValidator(ValueValidator):
+    """Plain-Python counterpart of `BoolInputCall`."""
+
+    __slots__ = ()
+
+    type_description = "a boolean"
+    is_valid_default = staticmethod(is_strict_bool)
+
+    def validate_single_value(self, value: Any) -> None:
+        if not isinstance(value, bool):
+            raise HPCallError(self.name, f"Expected a boolean, got a non-boolean value: {value}")
+
+
+class MultiBoolValidator(BoolValidator):
+    """Plain-Python counterpart of `MultiBoolCall`."""
+
+    __slots__ = ()
+
+    single_value = False
+    type_description = "booleans"
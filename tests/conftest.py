@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def analysis_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk analysis cache of each test in its own directory"""
+    cache_dir = tmp_path / "hypster_cache"
+    monkeypatch.setenv("HYPSTER_CACHE_DIR", str(cache_dir))
+    return cache_dir
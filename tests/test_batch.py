@@ -0,0 +1,73 @@
+import pytest
+
+from hypster import HP, config
+from hypster.run_history import BoundedHistory
+from hypster.sqlite_history import SQLiteHistory
+
+
+def test_batch_matches_calls_in_a_loop():
+    @config
+    def inner_config(hp: HP):
+        size = hp.int(10)
+
+    @config
+    def batch_config(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        lr = hp.number(0.001)
+        nested = hp.nest(_inner_config)
+
+    batch_config.namespace["_inner_config"] = inner_config
+    values_list = [{"model": "rnn"}, {"lr": 0.1, "nested.size": 20}, {}]
+
+    results = batch_config.batch(values_list, exclude_vars=["model"])
+    assert results == [
+        {"lr": 0.001, "nested": {"size": 10}},
+        {"lr": 0.1, "nested": {"size": 20}},
+        {"lr": 0.001, "nested": {"size": 10}},
+    ]
+    assert batch_config.get_snapshots() == [
+        {"model": "rnn", "lr": 0.001, "nested.size": 10},
+        {"model": "cnn", "lr": 0.1, "nested.size": 20},
+        {"model": "cnn", "lr": 0.001, "nested.size": 10},
+    ]
+
+    # Later runs, in a loop or in a batch, are recorded after the batch. The last batch only
+    # runs the statements "lr" depends on
+    batch_config(values={"model": "rnn"})
+    batch_config.batch([{"lr": 0.5}], final_vars=["lr"])
+    assert [snapshot["lr"] for snapshot in batch_config.get_snapshots()] == [0.001, 0.1, 0.001, 0.001, 0.5]
+    assert [record.value for record in batch_config.run_history.get_param_records("model").values()] == [
+        "rnn",
+        "cnn",
+        "cnn",
+        "rnn",
+    ]
+
+
+def test_batch_records_completed_runs_when_a_run_fails():
+    @config
+    def batch_config(hp: HP):
+        lr = hp.number(0.001, min=0)
+
+    with pytest.raises(Exception):
+        batch_config.batch([{"lr": 0.1}, {"lr": -1}, {"lr": 0.2}])
+    assert batch_config.get_snapshots() == [{"lr": 0.1}]
+
+    assert batch_config.batch([{"lr": 0.3}], record_history=False) == [{"lr": 0.3}]
+    assert batch_config.get_snapshots() == [{"lr": 0.1}]
+
+
+@pytest.mark.parametrize("history_type", ["bounded", "sqlite"])
+def test_batch_with_other_histories(history_type, tmp_path):
+    if history_type == "bounded":
+        history = BoundedHistory(max_runs=2)
+    else:
+        history = SQLiteHistory(tmp_path / "history.db", batch_size=1)
+
+    @config(run_history=history)
+    def batch_config(hp: HP):
+        lr = hp.number(0.001)
+
+    batch_config.batch([{"lr": 0.1}, {"lr": 0.2}, {"lr": 0.3}])
+    expected = [{"lr": 0.2}, {"lr": 0.3}] if history_type == "bounded" else [{"lr": 0.1}, {"lr": 0.2}, {"lr": 0.3}]
+    assert batch_config.get_snapshots() == expected
@@ -0,0 +1,236 @@
+import builtins
+import marshal
+
+import pytest
+
+from hypster import HP, config
+
+
+def test_body_is_compiled_once(monkeypatch):
+    @config
+    def config_func(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        lr = hp.number(0.001)
+
+    compiled_code = config_func._code
+
+    def fail_compile(*args, **kwargs):
+        raise AssertionError("config body should not be recompiled on call")
+
+    monkeypatch.setattr(builtins, "compile", fail_compile)
+
+    assert config_func() == {"model": "cnn", "lr": 0.001}
+    assert config_func(values={"model": "rnn"}) == {"model": "rnn", "lr": 0.001}
+    assert config_func._code is compiled_code
+
+
+def test_compiled_body_runs_in_fresh_namespace():
+    @config
+    def config_func(hp: HP):
+        use_extra = hp.bool(False)
+        if use_extra:
+            extra = hp.int(1)
+
+    assert "extra" in config_func(values={"use_extra": True})
+    assert "extra" not in config_func(values={"use_extra": False})
+
+
+def test_record_history_false_skips_recording():
+    @config
+    def config_func(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        lr = hp.number(0.001, min=0.0, max=1.0)
+
+    config_func(values={"model": "rnn"})
+    snapshot = config_func.get_last_snapshot()
+
+    result = config_func(values={"model": "cnn", "lr": 0.5}, record_history=False)
+    assert result == {"model": "cnn", "lr": 0.5}
+    assert config_func.get_last_snapshot() == snapshot
+    assert len(config_func.get_snapshots()) == 1
+
+
+def test_record_history_false_still_validates():
+    @config
+    def config_func(hp: HP):
+        lr = hp.number(0.001, min=0.0, max=1.0)
+        model = hp.select(["cnn", "rnn"], default="cnn", options_only=True)
+
+    with pytest.raises(Exception):
+        config_func(values={"lr": 2.0}, record_history=False)
+
+    with pytest.raises(Exception):
+        config_func(values={"model": "mlp"}, record_history=False)
+
+
+def test_record_history_false_with_nesting():
+    @config
+    def nested_config(hp: HP):
+        optimizer = hp.select(["adam", "sgd"], default="adam")
+        lr = hp.number(0.001)
+
+    nested_config.save("tests/helper_configs/fast_path_nested_config.py")
+
+    @config
+    def main_config(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        nested = hp.nest("tests/helper_configs/fast_path_nested_config.py")
+
+    result = main_config(final_vars=["nested.optimizer"], values={"nested.optimizer": "sgd"}, record_history=False)
+    assert result == main_config(final_vars=["nested.optimizer"], values={"nested.optimizer": "sgd"})
+    assert result["nested"] == {"optimizer": "sgd"}
+    assert len(main_config.get_snapshots()) == 1
+
+
+def test_config_source_is_analyzed_once(monkeypatch):
+    import ast
+
+    from hypster import load
+
+    parse_calls = []
+    original_parse = ast.parse
+
+    def counting_parse(*args, **kwargs):
+        parse_calls.append(args)
+        return original_parse(*args, **kwargs)
+
+    monkeypatch.setattr(ast, "parse", counting_parse)
+
+    @config
+    def analyzed_config(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        lr = hp.number(0.001)
+
+    assert len(parse_calls) == 1
+    assert analyzed_config() == {"model": "cnn", "lr": 0.001}
+
+    analyzed_config.save("tests/helper_configs/analyzed_config.py")
+    loaded = load("tests/helper_configs/analyzed_config.py")
+    loaded_again = load("tests/helper_configs/analyzed_config.py")
+    assert len(parse_calls) == 2
+    assert loaded._analysis is loaded_again._analysis is analyzed_config._analysis
+    assert loaded(values={"model": "rnn"}) == {"model": "rnn", "lr": 0.001}
+
+
+def test_new_process_loads_analysis_from_disk(monkeypatch, analysis_cache_dir):
+    import ast
+
+    from hypster import load
+    from hypster.ast_analyzer import _analysis_cache
+
+    @config
+    def cached_config(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        lr = hp.number(0.001)
+
+    cached_config.save("tests/helper_configs/cached_config.py")
+    load("tests/helper_configs/cached_config.py")
+    assert list(analysis_cache_dir.glob("*/*.bin"))
+
+    # A new process starts with an empty in-memory cache and must not parse or compile anything
+    _analysis_cache.clear()
+    original_parse, original_compile = ast.parse, builtins.compile
+    monkeypatch.setattr(ast, "parse", lambda *args, **kwargs: pytest.fail("source was parsed"))
+    monkeypatch.setattr(builtins, "compile", lambda *args, **kwargs: pytest.fail("source was compiled"))
+    loaded = load("tests/helper_configs/cached_config.py")
+    assert loaded(values={"model": "rnn"}) == {"model": "rnn", "lr": 0.001}
+    assert [call.implicit_name for call in loaded.hp_calls] == ["model", "lr"]
+    assert "name='model'" in loaded.modified_source
+
+    # The syntax tree is rebuilt from the cached source when final_vars need slicing
+    monkeypatch.setattr(ast, "parse", original_parse)
+    monkeypatch.setattr(builtins, "compile", original_compile)
+    assert loaded(final_vars=["lr"]) == {"lr": 0.001}
+
+
+def test_unreadable_or_disabled_disk_cache(monkeypatch, analysis_cache_dir):
+    from hypster import load
+    from hypster.ast_analyzer import _analysis_cache
+
+    @config
+    def cached_config(hp: HP):
+        lr = hp.number(0.001)
+
+    cached_config.save("tests/helper_configs/cached_config.py")
+    load("tests/helper_configs/cached_config.py")
+    for path in analysis_cache_dir.glob("*/*.bin"):
+        path.write_bytes(b"not marshal data")
+
+    _analysis_cache.clear()
+    assert load("tests/helper_configs/cached_config.py")() == {"lr": 0.001}
+
+    # Valid marshal data of the wrong shape is ignored as well
+    for data in [(1, 2), ("name", "source", None, (1,), None), ("name", "source", None, (), "code")]:
+        for path in analysis_cache_dir.glob("*/*.bin"):
+            path.write_bytes(marshal.dumps(data))
+        _analysis_cache.clear()
+        assert load("tests/helper_configs/cached_config.py")() == {"lr": 0.001}
+
+    monkeypatch.setenv("HYPSTER_CACHE_DIR", "")
+    _analysis_cache.clear()
+    assert load("tests/helper_configs/cached_config.py")() == {"lr": 0.001}
+
+
+def test_disk_cache_deletes_least_recently_used_files(monkeypatch, analysis_cache_dir):
+    import os
+
+    from hypster import ast_analyzer
+    from hypster.ast_analyzer import _analysis_cache, _analysis_file_name, source_hash
+    from hypster.core import Hypster
+
+    monkeypatch.setattr(ast_analyzer, "MAX_DISK_CACHE_FILES", 3)
+    sources = [f"def config_{i}(hp: HP):\n    lr = hp.number(0.{i})" for i in range(4)]
+    for i, source in enumerate(sources[:3]):
+        Hypster(f"config_{i}", source, {"HP": HP})
+    (version_dir,) = analysis_cache_dir.iterdir()
+    paths = [version_dir / _analysis_file_name((source_hash(source), True, False)) for source in sources]
+    for i, path in enumerate(paths[:3]):
+        os.utime(path, (i, i))
+
+    # Reading the oldest file from disk makes it the most recently used
+    _analysis_cache.clear()
+    Hypster("config_0", sources[0], {"HP": HP})
+    Hypster("config_3", sources[3], {"HP": HP})
+    assert sorted(version_dir.iterdir()) == sorted([paths[0], paths[2], paths[3]])
+
+
+def test_nested_paths_are_loaded_once_per_process(monkeypatch, tmp_path):
+    import os
+
+    from hypster import core, load
+
+    loaded_paths = []
+    original_load_module = core._load_module
+
+    def counting_load_module(path, *args):
+        loaded_paths.append(path)
+        return original_load_module(path, *args)
+
+    monkeypatch.setattr(core, "_load_module", counting_load_module)
+
+    path = tmp_path / "registry_config.py"
+    path.write_text("from hypster import HP\n\n\ndef registry_config(hp: HP):\n    lr = hp.number(0.1)\n")
+
+    @config
+    def parent_config(hp: HP):
+        first = hp.nest(_nested_path, name="first")
+        second = hp.nest(_nested_path, name="second")
+
+    parent_config.namespace["_nested_path"] = str(path)
+    assert parent_config() == {"first": {"lr": 0.1}, "second": {"lr": 0.1}}
+    assert parent_config(values={"first.lr": 0.2})["first"] == {"lr": 0.2}
+    assert len(loaded_paths) == 1
+    assert core.load_shared(path) is core.load_shared(str(path))
+
+    # load() reuses the loaded module but returns an instance with its own history
+    loaded = load(str(path))
+    assert loaded is not load(str(path))
+    assert loaded.namespace is core.load_shared(path).namespace
+    assert len(loaded_paths) == 1
+
+    # A changed file is loaded again
+    path.write_text(path.read_text().replace("0.1", "0.25"))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert parent_config()["first"] == {"lr": 0.25}
+    assert len(loaded_paths) == 2
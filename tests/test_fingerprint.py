@@ -0,0 +1,76 @@
+import pickle
+
+import pytest
+
+from hypster import HP, config
+from hypster.core import Hypster, load
+
+
+@config
+def inner_config(hp: HP):
+    activation = hp.select(["relu", "tanh"], default="relu")
+    dropout = hp.number(0.1)
+
+
+@config
+def outer_config(hp: HP):
+    model = hp.select(["cnn", "rnn"], default="cnn")
+    lr = hp.number(0.01)
+    head = hp.nest(_inner_config)
+
+
+outer_config.namespace["_inner_config"] = inner_config
+
+
+def test_fingerprint_is_canonical():
+    fingerprint = outer_config.fingerprint({"model": "rnn", "lr": 0.1, "head.activation": "tanh"})
+    assert len(fingerprint) == 64
+    assert outer_config.fingerprint({"head.activation": "tanh", "lr": 0.1, "model": "rnn"}) == fingerprint
+    assert outer_config.fingerprint({"head": {"activation": "tanh"}, "lr": 0.1, "model": "rnn"}) == fingerprint
+    assert outer_config.fingerprint({"model": "rnn", "lr": 0.1, "head.activation": "relu"}) != fingerprint
+    # Ints, floats and bools are not confused
+    assert len({outer_config.fingerprint({"lr": value}) for value in (1, 1.0, True, "1")}) == 4
+    assert outer_config.fingerprint({"lr": 0.1 + 0.2}) != outer_config.fingerprint({"lr": 0.3})
+
+    with pytest.raises(TypeError, match="Cannot fingerprint a value of type object"):
+        outer_config.fingerprint({"lr": object()})
+
+
+def test_fingerprint_covers_nested_sources():
+    fingerprint = outer_config.fingerprint({"lr": 0.1})
+    restored = pickle.loads(pickle.dumps(outer_config))
+    assert restored.fingerprint({"lr": 0.1}) == fingerprint
+
+    other_inner = Hypster(
+        "inner_config", 'def inner_config(hp: HP):\n    activation = hp.select(["relu"], default="relu")\n', {"HP": HP}
+    )
+    changed = Hypster(
+        outer_config.name, outer_config.source_code, {**outer_config.namespace, "_inner_config": other_inner}
+    )
+    assert changed.fingerprint({"lr": 0.1}) != fingerprint
+    assert changed.fingerprint({"lr": 0.1}) != inner_config.fingerprint({"lr": 0.1})
+
+
+def test_fingerprint_covers_module_code_of_loaded_configs(tmp_path):
+    inner_path = tmp_path / "inner.py"
+    outer_path = tmp_path / "outer.py"
+    inner_path.write_text("_SCALE = 10\n\n\ndef inner(hp: HP):\n    scale = hp.number(0.1) * _SCALE\n")
+    outer_path.write_text(f"def outer(hp: HP):\n    head = hp.nest({str(inner_path)!r})\n")
+    inner_fingerprint = load(str(inner_path)).fingerprint({})
+    outer_fingerprint = load(str(outer_path)).fingerprint({})
+
+    inner_path.write_text("_SCALE = 1000\n\n\ndef inner(hp: HP):\n    scale = hp.number(0.1) * _SCALE\n")
+    assert load(str(inner_path)).fingerprint({}) != inner_fingerprint
+    assert load(str(outer_path)).fingerprint({}) != outer_fingerprint
+
+
+def test_snapshot_fingerprint():
+    outer_config(values={"model": "rnn", "head": {"dropout": 0.5}})
+    snapshot = outer_config.get_last_snapshot()
+    assert snapshot == {"model": "rnn", "lr": 0.01, "head.activation": "relu", "head.dropout": 0.5}
+    assert snapshot.fingerprint == outer_config.fingerprint(snapshot)
+    assert snapshot.fingerprint == outer_config.fingerprint(
+        {"model": "rnn", "lr": 0.01, "head": {"activation": "relu", "dropout": 0.5}}
+    )
+    assert pickle.loads(pickle.dumps(snapshot)).fingerprint == snapshot.fingerprint
+    assert outer_config.get_snapshots()[-1].fingerprint == snapshot.fingerprint
@@ -0,0 +1,162 @@
+import math
+from itertools import islice
+
+from hypster import HP, config
+from hypster.core import Hypster
+
+
+def test_grid_enumerates_conditional_parameters():
+    @config
+    def grid_config(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        if model == "cnn":
+            kernel = hp.select([3, 5], default=3)
+        else:
+            cell = hp.select({"lstm": "LSTM", "gru": "GRU"})
+            bidirectional = hp.bool(False)
+        lr = hp.number(0.01)
+
+    assert list(grid_config.iter_grid()) == [
+        {"model": "cnn", "kernel": 3},
+        {"model": "cnn", "kernel": 5},
+        {"model": "rnn", "cell": "lstm", "bidirectional": True},
+        {"model": "rnn", "cell": "lstm", "bidirectional": False},
+        {"model": "rnn", "cell": "gru", "bidirectional": True},
+        {"model": "rnn", "cell": "gru", "bidirectional": False},
+    ]
+    # Probe runs are not recorded
+    assert grid_config.get_snapshots() == []
+
+    grid = list(grid_config.iter_grid(choices={"lr": [0.1, 0.01], "kernel": [7]}, values={"model": "cnn"}))
+    assert grid == [
+        {"model": "cnn", "kernel": 7, "lr": 0.1},
+        {"model": "cnn", "kernel": 7, "lr": 0.01},
+    ]
+    assert grid_config(values=grid[0]) == {"model": "cnn", "kernel": 7, "lr": 0.1}
+
+
+def test_grid_multi_select_and_nested_parameters():
+    @config
+    def inner_config(hp: HP):
+        activation = hp.select(["relu", "tanh"], default="relu")
+
+    @config
+    def grid_config(hp: HP):
+        augmentations = hp.multi_select(["flip", "crop"], default=[])
+        nested = hp.nest(_inner_config)
+        try:
+            size = hp.int(1)
+        except Exception:
+            size = None
+
+    grid_config.namespace["_inner_config"] = inner_config
+    grid = list(grid_config.iter_grid(choices={"size": [1, 2]}))
+    assert len(grid) == 4 * 2 * 2
+    assert grid[:3] == [
+        {"augmentations": [], "nested.activation": "relu", "size": 1},
+        {"augmentations": [], "nested.activation": "relu", "size": 2},
+        {"augmentations": [], "nested.activation": "tanh", "size": 1},
+    ]
+    assert grid[-1] == {"augmentations": ["flip", "crop"], "nested.activation": "tanh", "size": 2}
+
+
+def test_grid_is_lazy():
+    @config
+    def huge_config(hp: HP):
+        values = [hp.select(list(range(10)), default=0, name=f"param_{i}") for i in range(30)]
+
+    first = list(islice(huge_config.iter_grid(), 3))
+    assert [grid["param_29"] for grid in first] == [0, 1, 2]
+    assert all(grid["param_0"] == 0 for grid in first)
+
+
+def test_multi_select_subsets_are_enumerated_lazily():
+    @config
+    def huge_config(hp: HP):
+        augmentations = hp.multi_select(list(range(40)), default=[])
+
+    first = list(islice(huge_config.iter_grid(), 4))
+    assert [grid["augmentations"] for grid in first] == [[], [0], [1], [2]]
+
+
+def test_count_combinations_matches_grid():
+    @config
+    def inner_config(hp: HP):
+        activation = hp.select(["relu", "tanh", "gelu"], default="relu")
+        layers = hp.int(2, min=1, max=4)
+
+    @config
+    def count_config(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        if model == "cnn":
+            kernel = hp.select([3, 5], default=3)
+            head = hp.nest(_inner_config)
+        else:
+            cell = hp.select({"lstm": "LSTM", "gru": "GRU"})
+            bidirectional = hp.bool(False)
+        augmentations = hp.multi_select(["flip", "crop", "noise"], default=[])
+        lr = hp.number(0.01)
+
+    count_config.namespace["_inner_config"] = inner_config
+    assert count_config._analysis.free_parameters == {"kernel", "head", "cell", "bidirectional", "augmentations", "lr"}
+
+    # Parameters without choices keep their default, as in the grid
+    assert count_config.count_combinations() == (2 * 3 + 2 * 2) * 8
+    assert count_config.count_combinations() == len(list(count_config.iter_grid()))
+    # Counting the whole space, lr is continuous unless it is fixed or given choices
+    assert count_config.count_combinations(continuous=True) == math.inf
+    assert count_config.count_combinations(values={"lr": 0.1}, continuous=True) == (2 * 3 * 4 + 2 * 2) * 8
+    choices = {"lr": [0.1, 0.01], "head.layers": [1, 2, 3, 4]}
+    assert count_config.count_combinations(choices=choices) == (2 * 3 * 4 + 2 * 2) * 8 * 2
+    assert count_config.count_combinations(choices=choices) == len(list(count_config.iter_grid(choices=choices)))
+    assert count_config.count_combinations(values={"model": "rnn", "lr": 0.1}) == 4 * 8
+    assert count_config.count_combinations(choices={"cell": []}, values={"model": "rnn", "lr": 0.1}) == 0
+
+
+def test_count_combinations_branches_on_structural_parameters():
+    @config
+    def count_config(hp: HP):
+        depth = hp.int(2, min=1, max=3)
+        layers = [hp.select([16, 32], default=16, name=f"width_{i}") for i in range(depth)]
+        use_dropout = hp.bool(False)
+        dropout = hp.select([0.1, 0.5], default=0.1, name="dropout") if use_dropout else 0.0
+        schedule = hp.select(["constant", "cosine"], default="constant")
+        warmup = hp.int(0, min=0, max=9)
+        steps = hp.int(100, min=100, max=100 + warmup)
+
+    assert count_config._analysis.free_parameters == {"schedule", "steps"}
+    assert count_config.count_combinations() == 4 * (1 + 2) * 2
+    assert count_config.count_combinations() == len(list(count_config.iter_grid()))
+    widths = 2 + 4 + 8
+    assert count_config.count_combinations(continuous=True) == widths * (1 + 2) * 2 * sum(range(1, 11))
+    choices = {"depth": [1, 2, 3], "warmup": [0, 5]}
+    assert count_config.count_combinations(choices=choices) == widths * (1 + 2) * 2 * 2
+    assert count_config.count_combinations(choices=choices) == len(list(count_config.iter_grid(choices=choices)))
+
+
+def test_count_combinations_branches_on_parameters_passed_to_calls():
+    def fill(target, value):
+        target["kind"] = value
+        return len(target)
+
+    source = """def count_config(hp: HP):
+    settings = {}
+    kind = hp.select(["x", "y"], default="x")
+    size = fill(settings, kind)
+    if settings["kind"] == "y":
+        extra = hp.bool(True)
+"""
+    count_config = Hypster("count_config", source, {"HP": HP, "fill": fill})
+
+    assert "kind" not in count_config._analysis.free_parameters
+    assert count_config.count_combinations() == len(list(count_config.iter_grid())) == 3
+
+
+def test_count_combinations_does_not_enumerate():
+    lines = ["def huge_config(hp: HP):", "    model = hp.select(['small', 'large'], default='small')"]
+    lines.append("    if model == 'large':")
+    lines += [f"        param_{i} = hp.select(list(range(10)), default=0)" for i in range(30)]
+    lines.append("    augmentations = hp.multi_select(list(range(40)), default=[])")
+    huge_config = Hypster("huge_config", "\n".join(lines), {"HP": HP})
+
+    assert huge_config.count_combinations() == (1 + 10**30) * 2**40
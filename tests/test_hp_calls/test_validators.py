@@ -0,0 +1,105 @@
+import pytest
+
+from hypster import HP, config
+from hypster.hp_calls import (
+    HPCallError,
+    IntInputCall,
+    MultiSelectCall,
+    MultiTextCall,
+    NumberInputCall,
+    NumericBounds,
+    SelectCall,
+)
+from hypster.run_history import ParameterRecord
+from hypster.validators import (
+    IntValidator,
+    MultiSelectValidator,
+    MultiTextValidator,
+    NumberValidator,
+    SelectValidator,
+)
+
+
+def error_message(func, *args):
+    with pytest.raises(ValueError) as exc_info:
+        func(*args)
+    return str(exc_info.value)
+
+
+@pytest.mark.parametrize("value", ["d", ["a"], 3])
+def test_select_matches_pydantic_messages(value):
+    validator = SelectValidator("param", ["a", "b"], "a", True)
+    model = SelectCall(name="param", options=["a", "b"], default="a", options_only=True)
+    assert error_message(validator.process_value, value) == error_message(model.process_value, value)
+
+
+def test_multi_select_matches_pydantic_values():
+    options = {"x": 1, "y": object()}
+    validator = MultiSelectValidator("param", options, ["x"], False)
+    model = MultiSelectCall(name="param", options=options, default=["x"])
+
+    assert validator.process_value(["x", "y", "z"]) == model.process_value(["x", "y", "z"])
+    assert validator.stored_value == model.stored_value.value
+    assert validator.reproducible == model.stored_value.reproducible
+
+
+@pytest.mark.parametrize("value", [0, 11, 1.5, "a", [1]])
+def test_int_matches_pydantic_messages(value):
+    validator = IntValidator("param", 5, min_val=1, max_val=10)
+    model = IntInputCall(name="param", default=5, bounds=NumericBounds(min_val=1, max_val=10))
+    assert error_message(validator.process_value, value) == error_message(model.process_value, value)
+
+
+@pytest.mark.parametrize("value", [-0.5, 2.0, "a"])
+def test_number_matches_pydantic_messages(value):
+    validator = NumberValidator("param", 0.5, min_val=0.0, max_val=1.0)
+    model = NumberInputCall(name="param", default=0.5, bounds=NumericBounds(min_val=0.0, max_val=1.0))
+    assert error_message(validator.process_value, value) == error_message(model.process_value, value)
+
+
+@pytest.mark.parametrize("value", ["a", [1], ["a", 2]])
+def test_multi_text_matches_pydantic_messages(value):
+    validator = MultiTextValidator("param", ["a"])
+    model = MultiTextCall(name="param", default=["a"])
+    assert error_message(validator.process_value, value) == error_message(model.process_value, value)
+
+
+@pytest.mark.parametrize(
+    "create",
+    [
+        lambda: SelectValidator(None, ["a"], None, False),
+        lambda: SelectValidator("param", 123, None, False),
+        lambda: SelectValidator("param", [None], None, False),
+        lambda: SelectValidator("param", ["a"], "b", False),
+        lambda: MultiSelectValidator("param", ["a"], "a", False),
+        lambda: IntValidator("param", 1.5),
+        lambda: IntValidator("param", True),
+        lambda: NumberValidator("param", "1"),
+        lambda: NumberValidator("param", 1, min_val=5, max_val=1),
+        lambda: MultiTextValidator("param", ["a", 1]),
+    ],
+)
+def test_invalid_arguments_raise_hp_call_error(create):
+    with pytest.raises(HPCallError):
+        create()
+
+
+def test_validators_use_slots():
+    validator = SelectValidator("param", ["a"], "a", False)
+    assert not hasattr(validator, "__dict__")
+
+
+def test_records_keep_public_schema():
+    @config
+    def config_func(hp: HP):
+        model = hp.select({"cnn": "CNN", "rnn": "RNN"}, default="cnn")
+        lr = hp.number(0.001, min=0.0, max=1.0)
+
+    config_func()
+    records = config_func.run_history.get_latest_run_records()
+
+    assert isinstance(records["model"], ParameterRecord)
+    assert records["model"].value == "cnn"
+    assert records["model"].options == ["cnn", "rnn"]
+    assert records["lr"].numeric_bounds == NumericBounds(min_val=0.0, max_val=1.0)
+    assert ParameterRecord.model_validate(records["lr"].model_dump()) == records["lr"]
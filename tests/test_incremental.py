@@ -0,0 +1,170 @@
+import textwrap
+
+import pytest
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.incremental import IncrementalRun
+
+
+class Builder:
+    """Records which expensive objects a config builds"""
+
+    def __init__(self):
+        self.built = []
+
+    def __call__(self, name):
+        self.built.append(name)
+        return name
+
+
+def make_config(source, builder):
+    source = textwrap.dedent(source)
+    name = source.split("(")[0].split()[-1]
+    return Hypster(name, source, {"HP": HP, "build": builder})
+
+
+def test_only_affected_statements_run_again():
+    builder = Builder()
+    config_func = make_config(
+        """
+        def config_func(hp: HP):
+            model_name = hp.select(["cnn", "rnn"], default="cnn")
+            model = build(model_name)
+            layers = []
+            num_layers = hp.int(2)
+            for i in range(num_layers):
+                layers.append(i)
+            lr = hp.number(0.001)
+            optimizer = build(f"adam-{lr}")
+        """,
+        builder,
+    )
+    run = IncrementalRun(config_func)
+
+    assert run.run({})["layers"] == [0, 1]
+    assert builder.built == ["cnn", "adam-0.001"]
+
+    result = run.run({"model_name": "cnn", "num_layers": 3}, changed="num_layers")
+    assert result["layers"] == [0, 1, 2]
+    assert (result["model"], result["optimizer"]) == ("cnn", "adam-0.001")
+    # The list is created again instead of appended to twice, and nothing is built again
+    assert run.executed_statements == [2, 3, 4]
+    assert builder.built == ["cnn", "adam-0.001"]
+
+    run.run({"model_name": "cnn", "num_layers": 3, "lr": 0.1}, changed="lr")
+    assert builder.built == ["cnn", "adam-0.001", "adam-0.1"]
+    # Every run is recorded in full, including the parameters that did not run again
+    assert config_func.get_last_snapshot() == {"model_name": "cnn", "num_layers": 3, "lr": 0.1}
+
+    run.run({"model_name": "rnn"}, changed="model_name")
+    assert builder.built == ["cnn", "adam-0.001", "adam-0.1", "rnn"]
+    assert config_func.get_last_snapshot() == {"model_name": "rnn", "num_layers": 3, "lr": 0.1}
+
+
+def test_conditional_bindings_and_nested_configs():
+    builder = Builder()
+    inner = Hypster("inner", "def inner(hp: HP):\n    size = hp.int(8)\n", {"HP": HP})
+    config_func = make_config(
+        """
+        def config_func(hp: HP):
+            model = build("model")
+            head = hp.nest(_inner)
+            use_bias = hp.bool(True)
+            bias = 0
+            if use_bias:
+                bias = build("bias")
+        """,
+        builder,
+    )
+    config_func.namespace["_inner"] = inner
+    run = IncrementalRun(config_func)
+
+    assert run.run({})["bias"] == "bias"
+    assert run.run({"use_bias": False}, changed="use_bias")["bias"] == 0
+    assert run.run({"use_bias": False, "head": {"size": 4}}, changed="head")["head"] == {"size": 4}
+    assert run.executed_statements == [1]
+    assert builder.built == ["model", "bias"]
+    assert config_func.get_last_snapshot() == {"head.size": 4, "use_bias": False}
+
+
+def test_failed_runs_and_unknown_parameters_run_in_full():
+    builder = Builder()
+    config_func = make_config(
+        """
+        def config_func(hp: HP):
+            model = build("model")
+            size = hp.int(8)
+            check = 1 // (size - 1)
+        """,
+        builder,
+    )
+    run = IncrementalRun(config_func)
+    run.run({})
+
+    with pytest.raises(ZeroDivisionError):
+        run.run({"size": 1}, changed="size")
+    run.run({"size": 2}, changed="size")
+    assert run.executed_statements == [0, 1, 2]
+    run.run({"size": 3}, changed="missing")
+    assert builder.built == ["model", "model", "model"]
+
+
+class Model:
+    def __init__(self):
+        self.n_layers = 0
+
+
+class Trainer:
+    def __init__(self, model):
+        self.model = model
+
+    def configure(self):
+        self.model.n_layers += 1
+
+
+def test_mutations_through_aliases_run_again_from_a_fresh_object():
+    source = textwrap.dedent(
+        """
+        def config_func(hp: HP):
+            model = Model()
+            trainer = Trainer(model)
+            epochs = hp.int(1)
+            for _ in range(epochs):
+                trainer.configure()
+            n_layers = model.n_layers
+        """
+    )
+    run = IncrementalRun(Hypster("config_func", source, {"HP": HP, "Model": Model, "Trainer": Trainer}))
+
+    assert run.run({})["n_layers"] == 1
+    assert run.run({"epochs": 2}, changed="epochs")["n_layers"] == 2
+    assert run.executed_statements == [0, 1, 2, 3, 4]
+
+
+class Optimizer:
+    def __init__(self):
+        self.groups = []
+
+
+class Scheduler:
+    def __init__(self, optimizer, lr):
+        optimizer.groups.append(lr)
+
+
+def test_objects_passed_to_calls_are_created_again():
+    source = textwrap.dedent(
+        """
+        def config_func(hp: HP):
+            optimizer = Optimizer()
+            lr = hp.number(0.1)
+            scheduler = Scheduler(optimizer, lr)
+        """
+    )
+    config_func = Hypster("config_func", source, {"HP": HP, "Optimizer": Optimizer, "Scheduler": Scheduler})
+    run = IncrementalRun(config_func)
+    run.run({})
+
+    for lr in (0.2, 0.3):
+        result = run.run({"lr": lr}, changed="lr")
+        assert result["optimizer"].groups == config_func(values={"lr": lr})["optimizer"].groups == [lr]
@@ -0,0 +1,75 @@
+import pytest
+
+pytest.importorskip("ipywidgets")
+
+from hypster import HP  # noqa: E402
+from hypster.core import Hypster  # noqa: E402
+from hypster.ui.handler import UIHandler  # noqa: E402
+from hypster.ui.ipywidgets import IPynestComponent, IPyWidgetsUI, ResultsProxy  # noqa: E402
+
+
+def make_config(name, num_params):
+    lines = [f"def {name}(hp: HP):"] + [f"    param_{i} = hp.int({i})" for i in range(num_params)]
+    return "\n".join(lines)
+
+
+def test_large_configs_create_widgets_per_page():
+    inner = Hypster("inner", make_config("inner", 30), {"HP": HP})
+    source = make_config("outer", 120) + "\n    head = hp.nest(_inner)\n"
+    ui = IPyWidgetsUI(UIHandler(Hypster("outer", source, {"HP": HP, "_inner": inner})), page_size=50)
+    ui._update_display()
+
+    assert len(ui.ui_components) == 50
+    assert ui.container.children == (ui.controls, ui.components_box)
+    assert ui.page_label.value == "1-50 of 121"
+    ui.next_button.click()
+    ui.next_button.click()
+    assert ui.page_label.value == "101-121 of 121"
+    assert ui.next_button.disabled
+    assert len(ui.ui_components) == 121
+
+    # Nested sections with many parameters start collapsed and create their widgets when expanded
+    head = ui.ui_components["head"]
+    assert isinstance(head, IPynestComponent)
+    assert head.child_components == {}
+    head.widget.selected_index = 0
+    assert len(head.child_components) == 30
+
+    # Nested sections match the names of their parameters
+    ui.filter_text.value = "param_11"
+    assert ui._visible_ids == ["param_11"] + [f"param_{i}" for i in range(110, 120)] + ["head"]
+    assert ui.page_label.value == "1-12 of 12"
+
+
+def test_updates_patch_visible_widgets():
+    ui = IPyWidgetsUI(UIHandler(Hypster("config", make_config("config", 10), {"HP": HP})), page_size=4)
+    ui._update_display()
+    assert len(ui.ui_components) == 4
+    first_widget = ui.ui_components["param_0"].widget
+
+    ui._handle_change_impl("param_0", 5)
+    assert ui.ui_components["param_0"].widget is first_widget
+    assert first_widget.value == 5
+    ui._set_page(1)
+    ui._handle_change_impl("param_0", 6)
+    # Hidden widgets that changed are created again when shown
+    assert "param_0" not in ui.ui_components
+    ui._set_page(0)
+    assert ui.ui_components["param_0"].widget.value == 6
+    ui.ui_handler.close()
+
+
+def test_results_proxy_follows_completed_runs():
+    source = "def config(hp: HP):\n    size = hp.int(8)\n    check = 1 // size\n"
+    handler = UIHandler(Hypster("config", source, {"HP": HP}))
+    results = ResultsProxy(handler.get_latest_results(), handler)
+    assert results["size"] == 8
+
+    handler.update_components("size", 4)
+    assert results["size"] == 4
+    assert dict(results) == {"size": 4, "check": 0}
+    assert len(results) == 2 and "check" in results
+    # Failed runs keep the previous results
+    handler.update_components("size", 0)
+    assert results["size"] == 4
+    assert len(handler.config_func.run_history.get_run_records()) == 2
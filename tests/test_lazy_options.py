@@ -0,0 +1,72 @@
+import pytest
+
+from hypster import HP, config
+from hypster.hp_calls import HPCallError
+
+
+def test_lazy_select_builds_selected_option_only():
+    @config(lazy_options=True)
+    def lazy_config(hp: HP):
+        built = []
+
+        def build(name):
+            built.append(name)
+            return name.upper()
+
+        model = hp.select({"a": build("a"), "b": build("b"), "c": "c"}, default="a")
+
+    assert lazy_config() == {"built": ["a"], "model": "A"}
+    assert lazy_config(values={"model": "b"}) == {"built": ["b"], "model": "B"}
+    assert lazy_config(values={"model": "c"}) == {"built": [], "model": "c"}
+    assert lazy_config(values={"model": "custom"}) == {"built": [], "model": "custom"}
+    assert lazy_config.get_last_snapshot() == {"model": "custom"}
+
+
+def test_options_are_eager_by_default():
+    @config
+    def eager_config(hp: HP):
+        built = []
+
+        def build(name):
+            built.append(name)
+            return name.upper()
+
+        model = hp.select({"a": build("a"), "b": build("b")}, default="a")
+
+    assert eager_config() == {"built": ["a", "b"], "model": "A"}
+
+
+def test_lazy_multi_select():
+    @config(lazy_options=True)
+    def lazy_config(hp: HP):
+        built = []
+
+        def build(name):
+            built.append(name)
+            return name.upper()
+
+        models = hp.multi_select(options={"a": build("a"), "b": build("b"), "c": build("c")}, default=["a"])
+
+    assert lazy_config(values={"models": ["c", "a"]}) == {"built": ["c", "a"], "models": ["C", "A"]}
+    assert lazy_config(record_history=False) == {"built": ["a"], "models": ["A"]}
+
+
+def test_lazy_options_keep_hp_call_order():
+    @config(lazy_options=True)
+    def lazy_config(hp: HP):
+        model = hp.select({"small": dict(size=hp.int(1, name="small_size")), "large": dict(size=2)}, default="large")
+
+    # Values that contain hp calls stay eager so the calls run in source order
+    assert lazy_config() == {"model": {"size": 2}}
+    assert list(lazy_config.get_last_snapshot()) == ["small_size", "model"]
+    assert "__hypster_lazy_option__(lambda: dict(size=2))" in lazy_config.modified_source
+    assert "lambda: dict(size=hp.int" not in lazy_config.modified_source
+
+
+def test_lazy_options_validation():
+    @config(lazy_options=True)
+    def lazy_config(hp: HP):
+        model = hp.select({"a": str(1), "b": str(2)}, default="a", options_only=True)
+
+    with pytest.raises(HPCallError):
+        lazy_config(values={"model": "c"})
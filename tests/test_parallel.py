@@ -0,0 +1,88 @@
+import pickle
+
+import pytest
+
+from hypster import HP, config, load
+
+
+def test_pickled_config_reuses_its_compiled_form(monkeypatch):
+    import ast
+
+    from hypster.ast_analyzer import _analysis_cache
+
+    @config(lazy_options=True)
+    def pickled_config(hp: HP):
+        model = hp.select({"cnn": dict(kind="cnn"), "rnn": dict(kind="rnn")}, default="cnn")
+        lr = hp.number(0.001)
+
+    pickled_config()
+    data = pickle.dumps(pickled_config)
+
+    # Unpickling in a new process must not analyze the source again
+    _analysis_cache.clear()
+    monkeypatch.setattr(ast, "parse", lambda *args, **kwargs: pytest.fail("source was parsed"))
+    restored = pickle.loads(data)
+    assert restored(values={"model": "rnn"}) == {"model": {"kind": "rnn"}, "lr": 0.001}
+    # The run history is not pickled
+    assert len(restored.get_snapshots()) == 1
+
+
+def test_pickled_config_loaded_from_file():
+    @config
+    def file_config(hp: HP):
+        lr = hp.number(0.001)
+        scaled = _SCALE * lr
+
+    file_config.save("tests/helper_configs/pickled_file_config.py")
+    with open("tests/helper_configs/pickled_file_config.py") as f:
+        source = f.read()
+    with open("tests/helper_configs/pickled_file_config.py", "w") as f:
+        f.write(source.replace("from hypster import HP\n", "from hypster import HP\n\n_SCALE = 10\n"))
+
+    restored = pickle.loads(pickle.dumps(load("tests/helper_configs/pickled_file_config.py")))
+    assert restored(values={"lr": 0.5}) == {"lr": 0.5, "scaled": 5.0}
+
+
+def test_map_streams_results_and_merges_history():
+    @config
+    def inner_config(hp: HP):
+        size = hp.int(10)
+
+    @config
+    def mapped_config(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        lr = hp.number(0.001)
+        nested = hp.nest(_inner_config)
+
+    mapped_config.namespace["_inner_config"] = inner_config
+    values_list = [{"model": "rnn"}, {"lr": 0.1, "nested.size": 20}, {}]
+
+    outputs = list(mapped_config.map(values_list, workers=2))
+    assert [result for result, _ in outputs] == [
+        {"model": "rnn", "lr": 0.001, "nested": {"size": 10}},
+        {"model": "cnn", "lr": 0.1, "nested": {"size": 20}},
+        {"model": "cnn", "lr": 0.001, "nested": {"size": 10}},
+    ]
+    expected_snapshots = [
+        {"model": "rnn", "lr": 0.001, "nested.size": 10},
+        {"model": "cnn", "lr": 0.1, "nested.size": 20},
+        {"model": "cnn", "lr": 0.001, "nested.size": 10},
+    ]
+    assert [snapshot for _, snapshot in outputs] == expected_snapshots
+    assert mapped_config.get_snapshots() == expected_snapshots
+
+    outputs = list(mapped_config.map(iter(values_list), workers=2, final_vars=["lr"], ordered=False, chunksize=2))
+    assert sorted(result["lr"] for result, _ in outputs) == [0.001, 0.001, 0.1]
+    assert len(mapped_config.get_snapshots()) == 6
+
+
+def test_map_raises_errors_of_runs():
+    @config
+    def mapped_config(hp: HP):
+        lr = hp.number(0.001, min=0)
+
+    results = mapped_config.map([{"lr": 0.1}, {"lr": -1}], workers=1)
+    assert next(results)[0] == {"lr": 0.1}
+    with pytest.raises(Exception, match="lr"):
+        next(results)
+    assert mapped_config.get_snapshots() == [{"lr": 0.1}]
@@ -0,0 +1,113 @@
+import logging
+import os
+import textwrap
+import threading
+
+from hypster import HP
+from hypster.core import Hypster
+from hypster.result_cache import ResultCache
+
+
+class Builder:
+    """Records which expensive objects a config builds"""
+
+    def __init__(self):
+        self.built = []
+
+    def __call__(self, name):
+        self.built.append(name)
+        return name
+
+
+SOURCE = textwrap.dedent(
+    """
+    def config_func(hp: HP):
+        model_name = hp.select(["cnn", "rnn"], default="cnn")
+        model = build(model_name)
+        lock = make_lock()
+    """
+)
+
+
+def make_config(builder, **kwargs):
+    namespace = {"HP": HP, "build": builder, "make_lock": threading.Lock}
+    return Hypster("config_func", SOURCE, namespace, **kwargs)
+
+
+def test_results_are_cached_by_fingerprint(tmp_path):
+    builder = Builder()
+    cache = ResultCache(tmp_path)
+    config_func = make_config(builder, result_cache=cache, uncached_vars=["lock"])
+
+    result = config_func(values={"model_name": "rnn"})
+    assert result["model"] == "rnn"
+    assert config_func(values={"model_name": "rnn"})["model"] == "rnn"
+    assert config_func(final_vars=["model"], values={"model_name": "rnn"}) == {"model": "rnn"}
+    assert builder.built == ["rnn", "rnn"]
+    # Uncached variables are computed again on every call
+    hit = config_func(values={"model_name": "rnn"})
+    assert isinstance(hit["lock"], type(result["lock"])) and hit["lock"] is not result["lock"]
+
+    # Hits are recorded in the run history like any other run
+    assert config_func.get_last_snapshot() == {"model_name": "rnn"}
+    assert len(config_func.get_snapshots()) == 4
+
+    # Other instances with the same source and values read the results from disk
+    other_builder = Builder()
+    other = make_config(other_builder, result_cache=ResultCache(tmp_path), uncached_vars=["lock"])
+    assert other(values={"model_name": "rnn"})["model"] == "rnn"
+    assert other(values={"model_name": "cnn"})["model"] == "cnn"
+    assert other_builder.built == ["cnn"]
+    assert other.get_last_snapshot() == {"model_name": "cnn"}
+
+
+def test_unpicklable_results_are_not_cached(tmp_path, caplog):
+    builder = Builder()
+    config_func = make_config(builder, result_cache=ResultCache(tmp_path))
+
+    with caplog.at_level(logging.WARNING, logger="hypster.result_cache"):
+        config_func()
+        config_func()
+    assert builder.built == ["cnn", "cnn"]
+    assert "['lock'] cannot be serialized" in caplog.text
+    assert os.listdir(tmp_path) == []
+
+
+def test_disk_entries_are_evicted_by_size(tmp_path):
+    builder = Builder()
+    # Without in-memory entries, every hit reads its file
+    cache = ResultCache(tmp_path, max_entries=0)
+    config_func = make_config(builder, result_cache=cache, uncached_vars=["lock"])
+
+    config_func(values={"model_name": "rnn"})
+    config_func(values={"model_name": "cnn"})
+    cache.max_bytes = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+    # Reading a file makes it the most recently used, so the "cnn" file is evicted first
+    config_func(values={"model_name": "rnn"})
+    config_func(final_vars=["model"], values={"model_name": "rnn"})
+    assert len(os.listdir(tmp_path)) == 2
+    assert builder.built == ["rnn", "cnn", "rnn"]
+
+    config_func(values={"model_name": "rnn"})
+    config_func(values={"model_name": "cnn"})
+    assert builder.built == ["rnn", "cnn", "rnn", "cnn"]
+
+
+def test_nested_runs_are_replayed_on_hits():
+    inner = Hypster("inner", "def inner(hp: HP):\n    size = hp.int(8)\n", {"HP": HP})
+    outer = Hypster(
+        "outer",
+        "def outer(hp: HP):\n    lr = hp.number(0.1)\n    head = hp.nest(_inner)\n",
+        {"HP": HP, "_inner": inner},
+        result_cache=ResultCache(),
+    )
+
+    assert outer(values={"head.size": 16}) == {"lr": 0.1, "head": {"size": 16}}
+    outer(values={"head.size": 16}, record_history=False)
+    assert outer(values={"head.size": 32}, record_history=False) == {"lr": 0.1, "head": {"size": 32}}
+    assert outer(values={"head.size": 32}) == {"lr": 0.1, "head": {"size": 32}}
+    assert outer.get_last_snapshot() == {"lr": 0.1, "head.size": 32}
+    assert [dict(snapshot) for snapshot in outer.get_snapshots()] == [
+        {"lr": 0.1, "head.size": 16},
+        {"lr": 0.1, "head.size": 32},
+    ]
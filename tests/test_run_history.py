@@ -0,0 +1,217 @@
+import uuid
+
+import pytest
+
+from hypster import HP, config
+from hypster.run_history import BoundedHistory, InMemoryHistory, ParameterRecord, ParameterSource
+
+
+def make_record(name, value, run_id):
+    return ParameterRecord(
+        name=name,
+        parameter_type="int",
+        single_value=True,
+        default=0,
+        value=value,
+        is_reproducible=True,
+        run_id=run_id,
+        source=ParameterSource.USER,
+    )
+
+
+def test_param_records_follow_run_order():
+    history = InMemoryHistory()
+    run_ids = [uuid.uuid4() for _ in range(3)]
+
+    history.add_record(make_record("a", 0, run_ids[0]))
+    history.add_record(make_record("b", 1, run_ids[1]))
+    history.add_record(make_record("a", 2, run_ids[2]))
+    # Add a record to an older run after newer runs were recorded
+    history.add_record(make_record("a", 1, run_ids[1]))
+
+    assert list(history.get_param_records("a")) == run_ids
+    assert [record.value for record in history.get_param_records("a").values()] == [0, 1, 2]
+    assert history.get_latest_param_record("a").value == 2
+    assert history.get_latest_param_record("b").value == 1
+    assert history.get_latest_param_record("missing") is None
+
+
+def test_param_records_filtered_by_run_ids():
+    history = InMemoryHistory()
+    run_ids = [uuid.uuid4() for _ in range(3)]
+    for i, run_id in enumerate(run_ids):
+        history.add_record(make_record("a", i, run_id))
+
+    records = history.get_param_records("a", run_ids=[run_ids[2], uuid.uuid4(), run_ids[0]])
+    assert list(records) == [run_ids[2], run_ids[0]]
+    assert history.get_param_records("missing") == {}
+
+
+def test_latest_run_records():
+    history = InMemoryHistory()
+    assert history.get_latest_run_records() == {}
+
+    first, second = uuid.uuid4(), uuid.uuid4()
+    history.add_record(make_record("a", 0, first))
+    history.add_record(make_record("a", 1, second))
+    history.add_record(make_record("b", 2, second))
+    history.add_record(make_record("b", 3, first))
+
+    assert history.get_latest_run_records(flattened=True) == {"a": 1, "b": 2}
+    assert list(history.get_run_records()) == [first, second]
+
+
+def test_config_history_index():
+    @config
+    def config_func(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        if model == "cnn":
+            filters = hp.int(32)
+
+    config_func(values={"model": "cnn", "filters": 64})
+    config_func(values={"model": "rnn"})
+    config_func(values={"model": "cnn"})
+
+    filters_records = config_func.run_history.get_param_records("filters")
+    assert [record.value for record in filters_records.values()] == [64, 32]
+    assert config_func.run_history.get_latest_param_record("model").value == "cnn"
+
+
+def test_bounded_history_fifo():
+    history = BoundedHistory(max_runs=2)
+    run_ids = [uuid.uuid4() for _ in range(3)]
+    for i, run_id in enumerate(run_ids):
+        history.add_record(make_record("a", i, run_id))
+
+    assert list(history.get_run_records()) == run_ids[1:]
+    assert list(history.get_param_records("a")) == run_ids[1:]
+    assert history.get_latest_param_record("a").value == 2
+
+
+def test_bounded_history_lru():
+    history = BoundedHistory(max_runs=2, policy="lru")
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    history.add_record(make_record("a", 0, first))
+    history.add_record(make_record("a", 1, second))
+
+    # Reading the first run makes the second one the least recently used
+    history.get_run_records(first)
+    history.add_record(make_record("a", 2, third))
+
+    assert list(history.get_run_records()) == [first, third]
+
+
+def test_bounded_history_max_age(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("hypster.run_history.time.monotonic", lambda: now[0])
+
+    history = BoundedHistory(max_age=10)
+    old_run, new_run = uuid.uuid4(), uuid.uuid4()
+    history.add_record(make_record("a", 0, old_run))
+    now[0] = 105.0
+    history.add_record(make_record("a", 1, new_run))
+    now[0] = 112.0
+
+    assert list(history.get_param_records("a")) == [new_run]
+    now[0] = 120.0
+    assert history.get_latest_run_records() == {}
+
+
+def test_bounded_history_invalid_arguments():
+    with pytest.raises(ValueError):
+        BoundedHistory()
+    with pytest.raises(ValueError):
+        BoundedHistory(max_runs=0)
+    with pytest.raises(ValueError):
+        BoundedHistory(max_runs=10, policy="random")
+
+
+def test_bounded_history_eviction_cascades_into_nested_histories():
+    @config
+    def nested_config(hp: HP):
+        optimizer = hp.select(["adam", "sgd"], default="adam")
+
+    nested_config.save("tests/helper_configs/bounded_nested_config.py")
+
+    @config(run_history=BoundedHistory(max_runs=2))
+    def main_config(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        nested = hp.nest("tests/helper_configs/bounded_nested_config.py")
+
+    for optimizer in ["adam", "sgd", "adam", "sgd"]:
+        main_config(values={"nested.optimizer": optimizer})
+
+    retained_run_ids = set(main_config.run_history.get_run_records())
+    assert len(retained_run_ids) == 2
+    for record in main_config.run_history.get_param_records("nested").values():
+        assert set(record.run_history.get_run_records()) <= retained_run_ids
+
+    assert main_config.get_snapshots() == [
+        {"model": "cnn", "nested.optimizer": "adam"},
+        {"model": "cnn", "nested.optimizer": "sgd"},
+    ]
+
+
+def test_nested_history_is_a_view_of_the_parent_history():
+    @config
+    def nested_config(hp: HP):
+        optimizer = hp.select(["adam", "sgd"], default="adam")
+
+    nested_config.save("tests/helper_configs/view_nested_config.py")
+    nested = nested_config.run_history
+
+    @config
+    def main_config(hp: HP):
+        from hypster import load
+
+        nested = hp.nest(load("tests/helper_configs/view_nested_config.py"))
+
+    main_config(values={"nested.optimizer": "adam"})
+    main_config(values={"nested.optimizer": "sgd"})
+    # Explore mode picks up the values of earlier nested runs through the view
+    main_config(explore_mode=True)
+
+    records = list(main_config.run_history.get_param_records("nested").values())
+    assert [len(record.run_history.get_run_records()) for record in records] == [3, 3, 3]
+    assert [record.run_history.get_run_records(record.run_id)["optimizer"].value for record in records] == [
+        "adam",
+        "sgd",
+        "sgd",
+    ]
+    latest_history = records[-1].run_history
+    assert latest_history.get_latest_param_record("optimizer").value == "sgd"
+    assert list(latest_history.get_param_records("optimizer")) == [record.run_id for record in records]
+    # Nothing is copied into the nested config's own history
+    assert nested.get_run_records() == {}
+
+
+def test_deeply_nested_snapshots():
+    @config
+    def inner_config(hp: HP):
+        activation = hp.select(["relu", "tanh"], default="relu")
+
+    inner_config.save("tests/helper_configs/view_inner_config.py")
+
+    @config
+    def middle_config(hp: HP):
+        layers = hp.int(2)
+        inner = hp.nest("tests/helper_configs/view_inner_config.py")
+
+    middle_config.save("tests/helper_configs/view_middle_config.py")
+
+    @config
+    def outer_config(hp: HP):
+        middle = hp.nest("tests/helper_configs/view_middle_config.py")
+
+    outer_config(values={"middle.inner.activation": "tanh"})
+    outer_config(values={"middle.layers": 4})
+
+    assert outer_config.get_snapshots() == [
+        {"middle.layers": 2, "middle.inner.activation": "tanh"},
+        {"middle.layers": 4, "middle.inner.activation": "relu"},
+    ]
+    middle_history = outer_config.run_history.get_latest_param_record("middle").run_history
+    assert middle_history.get_run_records(flattened=True) == [
+        {"layers": 2, "inner.activation": "tanh"},
+        {"layers": 4, "inner.activation": "relu"},
+    ]
@@ -0,0 +1,50 @@
+import pytest
+
+from hypster import HP, config
+
+np = pytest.importorskip("numpy")
+
+
+@config
+def sampled_config(hp: HP):
+    lr = hp.number(0.01, min=1e-5, max=1e-1)
+    layers = hp.int(2, min=1, max=4)
+    dropout = hp.number(0.1, min=0.0, max=0.5)
+    epochs = hp.int(10)
+    model = hp.select(["cnn", "rnn"], default="cnn")
+    if model == "rnn":
+        hidden = hp.int(64, min=16, max=256)
+
+
+@pytest.mark.parametrize("method", ["uniform", "sobol", "lhs"])
+def test_samples_are_within_bounds(method):
+    samples = sampled_config.sample(512, method=method, seed=0, log=["lr"])
+    assert len(samples) == 512
+    assert set(samples[0]) == {"lr", "layers", "dropout"}
+    assert all(1e-5 <= s["lr"] <= 1e-1 and 0.0 <= s["dropout"] <= 0.5 for s in samples)
+    assert {s["layers"] for s in samples} == {1, 2, 3, 4}
+    assert all(type(s["layers"]) is int and type(s["lr"]) is float for s in samples)
+    # Half of the log-uniform samples are below the geometric mean of the bounds
+    assert 200 < sum(s["lr"] < 1e-3 for s in samples) < 312
+    assert sampled_config.sample(512, method=method, seed=0, log=["lr"]) == samples
+
+    result = sampled_config(values=samples[0])
+    assert result["layers"] == samples[0]["layers"]
+
+
+@pytest.mark.parametrize("method", ["sobol", "lhs"])
+def test_quasi_random_samples_are_stratified(method):
+    samples = sampled_config.sample(256, method=method, seed=1, values={"model": "rnn", "layers": 2})
+    assert all(s["model"] == "rnn" and s["layers"] == 2 for s in samples)
+    strata = {int(s["dropout"] / 0.5 * 256) for s in samples}
+    assert len(strata) == 256
+    assert {s["hidden"] for s in samples} <= set(range(16, 257))
+
+
+def test_sample_errors():
+    with pytest.raises(ValueError, match="Unknown sampling method"):
+        sampled_config.sample(10, method="grid")
+    with pytest.raises(ValueError, match="epochs"):
+        sampled_config.sample(10, log=["epochs"])
+    with pytest.raises(ValueError, match="positive min for 'dropout'"):
+        sampled_config.sample(10, log=["dropout"])
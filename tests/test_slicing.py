@@ -0,0 +1,206 @@
+import random
+import textwrap
+
+import pytest
+
+from hypster import HP
+from hypster.core import Hypster
+
+
+class Builder:
+    """Records which expensive objects a config builds"""
+
+    def __init__(self):
+        self.built = []
+
+    def __call__(self, name):
+        self.built.append(name)
+        return name
+
+
+def make_config(source, builder):
+    source = textwrap.dedent(source)
+    name = source.split("(")[0].split()[-1]
+    return Hypster(name, source, {"HP": HP, "build": builder})
+
+
+def test_final_vars_run_only_needed_statements():
+    builder = Builder()
+    config_func = make_config(
+        """
+        def config_func(hp: HP):
+            model_name = hp.select(["cnn", "rnn"], default="cnn")
+            model = build(model_name)
+            lr = hp.number(0.001)
+            optimizer = build(f"adam-{lr}")
+        """,
+        builder,
+    )
+
+    assert config_func(final_vars=["lr"], values={"model_name": "rnn"}) == {"lr": 0.001}
+    assert builder.built == []
+    assert config_func.get_last_snapshot() == {"lr": 0.001}
+
+    assert config_func(final_vars=["model"], values={"model_name": "rnn"}) == {"model": "rnn"}
+    assert builder.built == ["rnn"]
+
+    assert config_func(final_vars=["model", "optimizer"]) == {"model": "cnn", "optimizer": "adam-0.001"}
+    assert builder.built == ["rnn", "cnn", "adam-0.001"]
+    # Slices are compiled once per set of final_vars, needing every statement runs the whole body
+    assert config_func._sliced_code[frozenset(["model", "optimizer"])] is None
+    assert len(config_func._sliced_code) == 3
+
+
+def test_slices_keep_compound_statements_and_mutations():
+    builder = Builder()
+    config_func = make_config(
+        """
+        def config_func(hp: HP):
+            kind = hp.select(["a", "b"], default="a")
+            layers = []
+            if kind == "a":
+                layers.append(build("a"))
+            else:
+                layers.append(build("b"))
+            for i in range(hp.int(2)):
+                layers.append(i)
+            head = build("head")
+        """,
+        builder,
+    )
+
+    assert config_func(final_vars=["layers"], values={"kind": "b"}) == {"layers": ["b", 0, 1]}
+    assert builder.built == ["b"]
+    assert config_func(values={"kind": "b"})["layers"] == ["b", 0, 1]
+
+
+class Model:
+    def __init__(self):
+        self.n_layers = 0
+
+
+class Trainer:
+    def __init__(self, model):
+        self.model = model
+
+    def configure(self):
+        self.model.n_layers += 1
+
+
+@pytest.mark.parametrize(
+    "body, final_var, expected",
+    [
+        ("items = []\nalias = items\nalias.append(hp.int(1))\nsize = len(items)", "items", [1]),
+        ("items = []\nalias = items\nalias.append(hp.int(1))\nsize = len(items)", "size", 1),
+        ("d = {}\nh = d.setdefault('k', [])\nh.append(hp.int(1))", "d", {"k": [1]}),
+        ("model = Model()\ntrainer = Trainer(model)\ntrainer.configure()\nn_layers = model.n_layers", "n_layers", 1),
+    ],
+)
+def test_slices_keep_mutations_through_aliases(body, final_var, expected):
+    source = "def config_func(hp: HP):\n" + textwrap.indent(body, "    ")
+    config_func = Hypster("config_func", source, {"HP": HP, "Model": Model, "Trainer": Trainer})
+
+    assert config_func(final_vars=[final_var]) == {final_var: expected}
+    assert config_func()[final_var] == expected
+
+
+class Optimizer:
+    def __init__(self):
+        self.groups = []
+
+
+class Scheduler:
+    def __init__(self, optimizer):
+        optimizer.groups.append("initial_lr")
+
+
+def add_one(items):
+    items.append(1)
+    return len(items)
+
+
+@pytest.mark.parametrize(
+    "body, final_var, expected",
+    [
+        (
+            "optimizer = Optimizer()\nscheduler = Scheduler(optimizer)\ngroups = optimizer.groups",
+            "groups",
+            ["initial_lr"],
+        ),
+        ("x = []\nn = add_one(x)", "x", [1]),
+        ("x = list(range(5))\n_ = random.Random(0).shuffle(x)", "x", [2, 1, 0, 4, 3]),
+    ],
+)
+def test_slices_keep_mutations_of_call_arguments(body, final_var, expected):
+    source = "def config_func(hp: HP):\n" + textwrap.indent(body, "    ")
+    namespace = {"HP": HP, "Optimizer": Optimizer, "Scheduler": Scheduler, "add_one": add_one, "random": random}
+    config_func = Hypster("config_func", source, namespace)
+
+    assert config_func(final_vars=[final_var]) == {final_var: expected}
+    assert config_func()[final_var] == expected
+
+
+def test_functions_see_later_definitions():
+    builder = Builder()
+    config_func = make_config(
+        """
+        def config_func(hp: HP):
+            def make_model():
+                return build(size)
+
+            size = hp.int(10)
+            model = make_model()
+            other = build("other")
+        """,
+        builder,
+    )
+
+    assert config_func(final_vars=["model"], values={"size": 20}) == {"model": 20}
+    assert builder.built == [20]
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "print(model)",
+        "build.built.sort()",
+        "global other",
+        "exec('other = 1')",
+        "build.last = model",
+        "from os.path import *",
+    ],
+)
+def test_unanalyzable_bodies_run_in_full(statement):
+    builder = Builder()
+    config_func = make_config(
+        f"""
+        def config_func(hp: HP):
+            model = build(hp.select(["cnn", "rnn"], default="cnn"))
+            lr = hp.number(0.001)
+            {statement}
+        """,
+        builder,
+    )
+
+    assert config_func._dependency_graph is None
+    assert config_func(final_vars=["lr"]) == {"lr": 0.001}
+    assert builder.built == ["cnn"]
+
+
+def test_dotted_and_unknown_final_vars_run_in_full():
+    builder = Builder()
+    config_func = make_config(
+        """
+        def config_func(hp: HP):
+            model = build(hp.select(["cnn", "rnn"], default="cnn"))
+            lr = hp.number(0.001)
+        """,
+        builder,
+    )
+
+    with pytest.raises(ValueError, match="missing"):
+        config_func(final_vars=["lr", "missing"])
+    assert builder.built == ["cnn"]
+    with pytest.raises(ValueError, match="model.size"):
+        config_func(final_vars=["lr", "model.size"])
+    assert builder.built == ["cnn", "cnn"]
@@ -0,0 +1,110 @@
+import uuid
+
+from hypster import HP, config
+from hypster.run_history import NestedHistoryRecord, ParameterRecord, ParameterSource
+from hypster.sqlite_history import SQLiteHistory
+
+
+def make_record(name, value, run_id, is_reproducible=True):
+    return ParameterRecord(
+        name=name,
+        parameter_type="int",
+        single_value=True,
+        default=0,
+        value=value,
+        is_reproducible=is_reproducible,
+        run_id=run_id,
+        source=ParameterSource.USER,
+    )
+
+
+def test_sqlite_history_roundtrip(tmp_path):
+    path = tmp_path / "history.db"
+    run_ids = [uuid.uuid4() for _ in range(3)]
+    with SQLiteHistory(path, batch_size=2) as history:
+        for i, run_id in enumerate(run_ids):
+            history.add_record(make_record("a", i, run_id))
+        history.add_record(make_record("b", 10, run_ids[1]))
+        # Overwriting a record keeps its position in the run
+        history.add_record(make_record("a", 5, run_ids[1]))
+
+    history = SQLiteHistory(path)
+    assert list(history.get_run_records()) == run_ids
+    assert list(history.get_run_records(run_ids[1]).items()) == [
+        ("a", make_record("a", 5, run_ids[1])),
+        ("b", make_record("b", 10, run_ids[1])),
+    ]
+    assert [record.value for record in history.get_param_records("a").values()] == [0, 5, 2]
+    assert list(history.get_param_records("a", run_ids=[run_ids[2], uuid.uuid4(), run_ids[0]])) == [
+        run_ids[2],
+        run_ids[0],
+    ]
+    assert history.get_latest_param_record("b").value == 10
+    assert history.get_latest_param_record("missing") is None
+    assert history.get_latest_run_records(flattened=True) == {"a": 2}
+
+    history.remove_run(run_ids[2])
+    assert history.get_latest_run_records(flattened=True) == {"a": 5, "b": 10}
+    history.close()
+
+
+def test_sqlite_history_reads_see_buffered_records(tmp_path):
+    history = SQLiteHistory(tmp_path / "history.db", batch_size=1000)
+    run_id = uuid.uuid4()
+    history.add_record(make_record("a", 1, run_id))
+    assert history.get_latest_param_record("a").value == 1
+    assert SQLiteHistory(tmp_path / "history.db").get_latest_param_record("a").value == 1
+
+
+def test_sqlite_history_flags_non_reproducible_values(tmp_path, capsys):
+    history = SQLiteHistory(tmp_path / "history.db")
+    history.add_record(make_record("a", "<object>", uuid.uuid4(), is_reproducible=False))
+    assert history.get_latest_run_records(flattened=True) == {"a": "<object>"}
+    assert "was not originally of type" in capsys.readouterr().out
+
+
+def test_sqlite_history_stores_nested_configs(tmp_path):
+    @config
+    def inner_config(hp: HP):
+        activation = hp.select(["relu", "tanh"], default="relu")
+
+    inner_config.save("tests/helper_configs/sqlite_inner_config.py")
+
+    @config
+    def outer_config(hp: HP):
+        layers = hp.int(2)
+        inner = hp.nest("tests/helper_configs/sqlite_inner_config.py")
+
+    outer_config.save("tests/helper_configs/sqlite_outer_config.py")
+
+    path = tmp_path / "history.db"
+
+    @config(run_history=SQLiteHistory(path))
+    def main_config(hp: HP):
+        model = hp.select(["cnn", "rnn"], default="cnn")
+        outer = hp.nest("tests/helper_configs/sqlite_outer_config.py")
+        lr = hp.number(0.1)
+
+    main_config(values={"outer.layers": 3})
+    main_config(values={"model": "rnn", "outer.inner.activation": "tanh"})
+
+    expected = [
+        {"model": "cnn", "outer.layers": 3, "outer.inner.activation": "relu", "lr": 0.1},
+        {"model": "rnn", "outer.layers": 2, "outer.inner.activation": "tanh", "lr": 0.1},
+    ]
+    assert main_config.get_snapshots() == expected
+    assert main_config.get_last_snapshot() == expected[-1]
+    main_config.run_history.close()
+
+    # A new process reading the same database sees the nested runs as well
+    history = SQLiteHistory(path)
+    assert history.get_run_records(flattened=True) == expected
+    outer_records = history.get_param_records("outer")
+    assert all(isinstance(record, NestedHistoryRecord) for record in outer_records.values())
+    last_outer = list(outer_records.values())[-1]
+    assert last_outer.run_history.get_latest_run_records(flattened=True) == {
+        "layers": 2,
+        "inner.activation": "tanh",
+    }
+    inner_history = last_outer.run_history.get_latest_param_record("inner").run_history
+    assert [record.value for record in inner_history.get_param_records("activation").values()] == ["relu", "tanh"]
@@ -0,0 +1,96 @@
+import sys
+import threading
+
+import pytest
+
+from hypster import HP, config
+from hypster.run_history import BoundedHistory, InMemoryHistory
+from hypster.sqlite_history import SQLiteHistory
+
+NUM_THREADS = 8
+CALLS_PER_THREAD = 50
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Switch threads far more often than by default, to surface races"""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_in_threads(target):
+    barrier = threading.Barrier(NUM_THREADS)
+    errors = []
+
+    def worker(thread_index):
+        try:
+            barrier.wait()
+            target(thread_index)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(NUM_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+@pytest.mark.parametrize("history_type", ["memory", "bounded", "sqlite"])
+def test_concurrent_calls_record_whole_runs(history_type, tmp_path):
+    if history_type == "memory":
+        history = InMemoryHistory()
+    elif history_type == "bounded":
+        history = BoundedHistory(max_runs=NUM_THREADS * CALLS_PER_THREAD, policy="lru")
+    else:
+        history = SQLiteHistory(tmp_path / "history.db", batch_size=7)
+
+    @config
+    def inner_config(hp: HP):
+        size = hp.int(0)
+
+    @config(run_history=history)
+    def threaded_config(hp: HP):
+        thread = hp.int(0)
+        call = hp.int(0)
+        nested = hp.nest(_inner_config)
+
+    threaded_config.namespace["_inner_config"] = inner_config
+
+    def target(thread_index):
+        for call in range(CALLS_PER_THREAD):
+            values = {"thread": thread_index, "call": call, "nested.size": thread_index * 1000 + call}
+            result = threaded_config(values=values)
+            assert result == {"thread": thread_index, "call": call, "nested": {"size": thread_index * 1000 + call}}
+            # Each thread reads its own last run, even while other threads record theirs
+            assert threaded_config.get_last_snapshot() == values
+            if call % 10 == 0:
+                threaded_config.get_snapshots()
+                threaded_config.run_history.get_param_records("thread")
+
+    run_in_threads(target)
+
+    snapshots = threaded_config.get_snapshots()
+    assert len(snapshots) == NUM_THREADS * CALLS_PER_THREAD
+    for snapshot in snapshots:
+        assert snapshot["nested.size"] == snapshot["thread"] * 1000 + snapshot["call"]
+    for thread_index in range(NUM_THREADS):
+        calls = [snapshot["call"] for snapshot in snapshots if snapshot["thread"] == thread_index]
+        assert calls == list(range(CALLS_PER_THREAD))
+
+
+def test_failed_runs_are_not_recorded():
+    @config
+    def failing_config(hp: HP):
+        lr = hp.number(0.001)
+        size = hp.int(1, min=1)
+
+    failing_config(values={"lr": 0.1})
+    with pytest.raises(Exception):
+        failing_config(values={"lr": 0.2, "size": 0})
+    assert failing_config.get_snapshots() == [{"lr": 0.1, "size": 1}]
+    assert failing_config.get_last_snapshot() == {"lr": 0.1, "size": 1}
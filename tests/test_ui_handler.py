@@ -0,0 +1,120 @@
+import textwrap
+import threading
+
+import pytest
+
+pytest.importorskip("ipywidgets")
+
+from hypster import HP  # noqa: E402
+from hypster.core import Hypster  # noqa: E402
+from hypster.ui.handler import UIHandler  # noqa: E402
+
+
+class BlockingBuilder:
+    """Builds objects, blocking on builds of "block" until released"""
+
+    def __init__(self):
+        self.built = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, name):
+        if name == "block":
+            self.started.set()
+            self.release.wait(5)
+        self.built.append(name)
+        return name
+
+
+def test_updates_run_in_background_and_superseded_updates_are_skipped():
+    builder = BlockingBuilder()
+    source = textwrap.dedent(
+        """
+        def config_func(hp: HP):
+            model_name = hp.select(["cnn", "rnn", "block"], default="cnn")
+            model = build(model_name)
+            size = hp.int(8)
+        """
+    )
+    handler = UIHandler(Hypster("config_func", source, {"HP": HP, "build": builder}))
+
+    blocked = handler.submit_update("model_name", "block")
+    assert builder.started.wait(5)
+    # Changes to the same component wait for the running update and replace each other
+    updates = [handler.submit_update("model_name", name) for name in ("rnn", "cnn", "rnn")]
+    assert [update.done() for update in updates] == [True, True, False]
+    builder.release.set()
+
+    assert blocked.result(5) is None
+    assert [update.result(5) for update in updates[:2]] == [None, None]
+    diff = updates[2].result(5)
+    assert (diff.added, diff.removed, diff.changed) == ([], [], ["model_name"])
+    assert builder.built == ["cnn", "block", "rnn"]
+    assert handler.get_component("model_name").value == "rnn"
+    handler.close()
+
+
+def test_updates_only_recreate_changed_components():
+    source = textwrap.dedent(
+        """
+        def config_func(hp: HP):
+            use_head = hp.bool(False)
+            if use_head:
+                head_size = hp.int(8, min=1, max=hp.int(64))
+            lr = hp.number(0.001)
+            head = hp.nest(_inner)
+        """
+    )
+    inner = Hypster("inner", "def inner(hp: HP):\n    a = hp.int(1)\n    b = hp.int(2)\n", {"HP": HP})
+    handler = UIHandler(Hypster("config_func", source, {"HP": HP, "_inner": inner}))
+    lr_component = handler.get_component("lr")
+    head_component = handler.get_component("head")
+
+    diff = handler.update_components("use_head", True)
+    assert (diff.added, diff.removed, diff.changed) == (["head_size.max", "head_size"], [], ["use_head"])
+    assert list(handler.components) == ["use_head", "head_size.max", "head_size", "lr", "head"]
+    assert handler.get_component("lr") is lr_component
+    assert handler.get_component("head") is head_component
+
+    diff = handler.update_components("head_size.max", 16)
+    assert (diff.added, diff.removed, diff.changed) == ([], [], ["head_size.max", "head_size"])
+    assert handler.get_component("head_size").bounds.max_val == 16
+
+    diff = handler.update_components("head", {"b": 3})
+    assert (diff.added, diff.removed, diff.changed) == ([], [], ["head"])
+    assert handler.get_component("head").children["a"] is head_component.children["a"]
+    assert handler.get_component("head").value == {"a": 1, "b": 3}
+
+    diff = handler.update_components("use_head", False)
+    assert (diff.added, diff.removed, diff.changed) == ([], ["head_size.max", "head_size"], ["use_head"])
+    handler.close()
+
+
+def test_changes_of_superseded_updates_are_delivered_with_the_next_update():
+    builder = BlockingBuilder()
+    source = textwrap.dedent(
+        """
+        def config_func(hp: HP):
+            model_name = hp.select(["cnn", "block"], default="cnn")
+            model = build(model_name)
+            if model_name == "block":
+                size = hp.select([3, 4], default=3)
+                depth = hp.int(2)
+            else:
+                size = hp.select([1, 2], default=1)
+                width = hp.int(2)
+            lr = hp.number(0.1)
+        """
+    )
+    handler = UIHandler(Hypster("config_func", source, {"HP": HP, "build": builder}))
+
+    blocked = handler.submit_update("model_name", "block")
+    assert builder.started.wait(5)
+    update = handler.submit_update("lr", 0.5)
+    builder.release.set()
+
+    assert blocked.result(5) is None
+    diff = update.result(5)
+    assert (diff.added, diff.removed, diff.changed) == (["depth"], ["width"], ["model_name", "size", "lr"])
+    assert diff.components["size"].options == [3, 4]
+    handler.close()